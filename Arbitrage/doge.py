@@ -3,54 +3,38 @@ Simple Dogecoin trader based on treshold values
 """
 
 from APIs.binance import Binance
-import json
+from APIs.exchangeInfo import ExchangeInfo
+from APIs.strategyRunner import StrategyRunner, ThresholdStrategy
 import time
-import pandas as pd
 
-# ENTER YOUR API KEY AND API SECRET BELOW
-b = Binance(apiKey='', apiSecret='')
-
-lowerLimit = 0.395
-upperLimit = 0.400
-
-while True:
-    print('-'*50)
+# orders are rounded to the DOGETRY tick and step sizes and checked before they are sent
+filters = ExchangeInfo(symbols=['DOGETRY'])
 
-    time.sleep(20)
+# ENTER YOUR API KEY AND API SECRET BELOW
+b = Binance(apiKey='', apiSecret='', resultType='dict', filters=filters)
 
-    doge = b.symbolPriceTicker('DOGETRY')
-    doge = json.loads(doge)['price']
-    doge = float(doge)
+# the filters are downloaded with the client, so the downloads count against its rate limits
+filters.start()
 
-    print('doge:', doge)
+# more symbols and strategies (e.g. GridStrategy) can be added to the same runner, they share one price request per tick
+strategies = [ThresholdStrategy('DOGETRY', 'DOGE', 'TRY', lowerLimit=0.395, upperLimit=0.400)]
 
-    balances = b.accountInfo()
-    balances = json.loads(balances)['balances']
+runner = StrategyRunner(b, strategies, interval=20)
 
-    for balance in balances:
-        if balance['asset'] == 'DOGE':
-            dogeBalance = balance['free']
-        elif balance['asset'] == 'TRY':
-            tryBalance = balance['free']
+while True:
+    print('-'*50)
 
-    dogeBalance = float(dogeBalance)
-    tryBalance = float(tryBalance)
+    time.sleep(runner.interval)
 
-    print('doge balance:', dogeBalance)
-    print('try balance:', tryBalance)
-    print('\ntotal money:', dogeBalance*doge + tryBalance)
+    try:
+        results = runner.tick()
+    except Exception as e:
+        print('error occured:', repr(e))
+        continue
 
-    if doge<lowerLimit and tryBalance>10:
-        print('\nBuying...')
-        order = b.newOrder(symbol='DOGETRY', side='BUY', oType='LIMIT', timeInForce='GTC', quantity=(tryBalance/lowerLimit)-5, price=doge)
+    print('balances:', {asset: runner.balances[asset] for asset in ('DOGE', 'TRY')} if runner.balances else 'refreshing')
 
-    elif doge>upperLimit and dogeBalance>100:
-        print('\nSelling...')
-        order = b.newOrder(symbol='DOGETRY', side='SELL', oType='LIMIT', timeInForce='GTC', quantity=dogeBalance-5, price=doge)
-    
-    else:
-        b.cancelAllOrdersOfSymbol('DOGETRY')
-        continue
+    for result in results:
+        print(result['action'], result['params'].get('side', ''), result['error'] or 'Successful', '{:.1f} ms'.format(result['latency']))
 
-    print(order)
-    print('Successful')
\ No newline at end of file
+    print(runner.stats())
@@ -1,53 +1,89 @@
 """
-Simple algorithm that records the USDC/USDT price difference of Binance and BtcTurk
+USDC/USDT arbitrage watcher for Binance and BtcTurk
+
+python usdc_usdt.py                     watches both exchanges, records the ticks and prints the opportunities
+python usdc_usdt.py replay FILE         replays ticks recorded in an xls file (e.g. coinDatav1.xls) or a TickRecorder directory
 """
 
-from APIs.binance import Binance
-from APIs.btcTurk import BtcTurk
-import xlwt
+from APIs.binance import AsyncBinance
+from APIs.btcTurk import AsyncBtcTurk
+from APIs.httpSession import createAsyncSession
+from APIs.tickRecorder import TickRecorder
+from APIs.arbitrageEngine import ArbitrageEngine, xlsQuotes, recordedQuotes
+import asyncio
 import time
-import json
-
-# ENTER YOUR API KEY AND API SECRET BELOW
-binance = Binance(apiKey='', apiSecret='')
-btcturk = BtcTurk(apiKey='', apiSecret='')
+import sys
+import os
 
-wb = xlwt.Workbook()
-ws = wb.add_sheet("USDC_USDT")
-line = 1
+PAIRS = {'USDC_USDT': {'binance': 'USDCUSDT', 'btcturk': 'USDC_USDT'}}
+FIELDS = ['time', 'btcTurk_bid', 'btcTurk_ask', 'binance_bid', 'binance_ask']
 
-counter = 1
+# minimum fee-adjusted spread to report, 0.0005 = 0.05%
+MIN_SPREAD = 0.0005
+POLL_INTERVAL = 2
 
-lines = ['btcTurk_bid', 'btcTurk_ask', 'binance_bid', 'binance_ask', 'time']
-for i in range(len(lines)):
-    ws.write(0, i, lines[i])
+def printOpportunity(opportunity):
+    print('{pair}: buy on {buyExchange} at {buyPrice}, sell on {sellExchange} at {sellPrice}, spread {spread:.4%}'.format(**opportunity))
 
-def unixToDate(unixDate):
-    unixDate = int(unixDate)/1000 #sometimes /1000 is required for proper result
-    t = time.localtime(unixDate)
+async def watch(engine, recorder):
+    # both clients share one connection pool and both exchanges are polled at the same time
+    session = createAsyncSession()
 
-    return '{}-{}-{} {}:{}:{}'.format(t.tm_mday, t.tm_mon, t.tm_year, t.tm_hour, t.tm_min, t.tm_sec)
+    # ENTER YOUR API KEY AND API SECRET BELOW
+    binance = AsyncBinance(apiKey='', apiSecret='', session=session, resultType='dict')
+    btcturk = AsyncBtcTurk(apiKey='', apiSecret='', session=session, resultType='dict')
 
-while True:
     try:
-        btcturkStats = btcturk.ticker('USDC_USDT', timeout=2)
-        binanceStats = binance.symbolOrderBookTicker('USDCUSDT', timeout=2)
+        while True:
+            try:
+                btcturkStats, binanceStats = await asyncio.gather(btcturk.ticker('USDC_USDT', timeout=2), binance.symbolOrderBookTicker('USDCUSDT', timeout=2))
+            except Exception as e:
+                print('request failed:', repr(e))
+                await asyncio.sleep(POLL_INTERVAL)
+                continue
+
+            # the book ticker of Binance has no time, it is stamped when the answer arrives
+            received = int(time.time() * 1000)
+
+            try:
+                btcturkQuote = btcturkStats['data'][0]
+                btcturkTick = [btcturkQuote['timestamp'], float(btcturkQuote['bid']), float(btcturkQuote['ask'])]
+                binanceTick = [float(binanceStats['bidPrice']), float(binanceStats['askPrice']), float(binanceStats['bidQty']), float(binanceStats['askQty'])]
+            except (KeyError, IndexError, TypeError, ValueError):
+                # error payloads of the exchanges, e.g. rate limits or maintenance
+                print('unexpected answer:', btcturkStats, binanceStats)
+            else:
+                engine.update('btcturk', 'USDC_USDT', btcturkTick[1], btcturkTick[2], btcturkTick[0])
+                engine.update('binance', 'USDCUSDT', binanceTick[0], binanceTick[1], received, binanceTick[2], binanceTick[3])
 
-        btcturkStats = json.loads(btcturkStats)['data'][0]
-        binanceStats = json.loads(binanceStats)
+                recorder.record(btcturkTick + binanceTick[:2])
 
-        values = [btcturkStats['bid'], btcturkStats['ask'], binanceStats['bidPrice'], binanceStats['askPrice'], unixToDate(btcturkStats['timestamp'])]
+            await asyncio.sleep(POLL_INTERVAL)
+    finally:
+        await session.close()
 
-        for value in range(len(values)):
-            ws.write(line, value, values[value])
+def replay(path):
+    engine = ArbitrageEngine(PAIRS, minSpread=MIN_SPREAD)
 
-        line += 1
-        wb.save('coinDatav1.xls')
+    if os.path.isdir(path):
+        with TickRecorder(path, FIELDS) as recorder:
+            opportunities = engine.replay(recordedQuotes(recorder, PAIRS['USDC_USDT']))
+    else:
+        opportunities = engine.replay(xlsQuotes(path, PAIRS['USDC_USDT']))
 
-        print(counter)
+    for opportunity in opportunities:
+        printOpportunity(opportunity)
 
-        counter += 1
-    except:
-        print('error occured.')
-        
-    time.sleep(2)
\ No newline at end of file
+    print(engine.stats())
+
+if len(sys.argv) == 3 and sys.argv[1] == 'replay':
+    replay(sys.argv[2])
+else:
+    # ticks are appended to the log in coinData/, export them with recorder.toXls() or recorder.toCsv() when needed
+    recorder = TickRecorder('coinData', FIELDS, flushEvery=1)
+    engine = ArbitrageEngine(PAIRS, minSpread=MIN_SPREAD, onOpportunity=printOpportunity)
+
+    try:
+        asyncio.run(watch(engine, recorder))
+    finally:
+        recorder.close()
@@ -0,0 +1,223 @@
+from time import perf_counter
+try:
+    from .timeUtils import dateToUnix
+except ImportError:
+    from timeUtils import dateToUnix
+
+# taker fee rates of the exchanges, adjust them to the fee tier of your account
+TAKER_FEES = {'binance': 0.001, 'btcturk': 0.0009}
+
+BID, ASK, BID_QTY, ASK_QTY, TIME = range(5)
+
+class ArbitrageEngine:
+    '''
+    Cross-exchange arbitrage detector. Quote updates of many pairs on many exchanges are pushed with update()
+    and only the spreads of the updated pair are recomputed, so an update costs the same however many pairs are watched.
+
+    The spread of buying on one exchange and selling on another is
+    bid(sell exchange) * (1 - fee) / (ask(buy exchange) * (1 + fee)) - 1.
+    Every spread at or above minSpread is emitted as an opportunity.
+
+    Opportunities
+    ---------------
+    {\n
+        "pair": "USDC_USDT",
+        "buyExchange": "btcturk",
+        "sellExchange": "binance",
+        "buyPrice": 0.9984,
+        "sellPrice": 0.9995,
+        "spread": 0.00091,      // Fee-adjusted return of the round trip
+        "quantity": 150.0,      // Smaller of the best ask and best bid quantities, None if unknown
+        "time": 1499865549590,  // Time of the quote which triggered the opportunity
+        "latency": 4.1          // Detection latency in microseconds
+    }
+    '''
+
+    def __init__(self, pairs, fees=TAKER_FEES, minSpread=0.0, onOpportunity=None):
+        '''
+        Parameters
+        ---------------
+        (m)pairs(dict): Pair name -> {exchange: symbol}, e.g. {'USDC_USDT': {'binance': 'USDCUSDT', 'btcturk': 'USDC_USDT'}}\n
+        fees(dict): Exchange -> taker fee rate\n
+        minSpread(float): Minimum fee-adjusted spread of an opportunity, e.g. 0.001 for 0.1%\n
+        onOpportunity(function): Called with every opportunity as soon as it is detected
+        '''
+
+        self.pairs = pairs
+        self.fees = fees
+        self.minSpread = minSpread
+        self.onOpportunity = onOpportunity
+
+        # (exchange, symbol) -> (pair, books of the pair), books are exchange -> [bid, ask, bidQty, askQty, time]
+        self.books = {}
+        self.symbols = {}
+
+        for pair, symbols in pairs.items():
+            books = {}
+            self.books[pair] = books
+
+            for exchange, symbol in symbols.items():
+                self.symbols[(exchange, symbol)] = (pair, books)
+
+        self.updates = 0
+        self.opportunities = 0
+        self.totalLatency = 0.0
+        self.maxLatency = 0.0
+
+    def update(self, exchange, symbol, bid, ask, time=None, bidQty=None, askQty=None):
+        '''
+        Updates the best bid/ask of a symbol and returns the opportunities it creates.
+        Updates of symbols which are not in pairs are ignored.
+        '''
+
+        start = perf_counter()
+        key = self.symbols.get((exchange, symbol))
+
+        if key is None:
+            return []
+
+        pair, books = key
+        book = books.get(exchange)
+
+        if book is None:
+            book = books[exchange] = [0.0, 0.0, None, None, None]
+
+        book[BID] = bid = float(bid)
+        book[ASK] = ask = float(ask)
+        book[BID_QTY] = bidQty
+        book[ASK_QTY] = askQty
+        book[TIME] = time
+
+        fee = self.fees.get(exchange, 0.0)
+        buyCost = ask * (1 + fee)
+        sellIncome = bid * (1 - fee)
+        found = []
+
+        for other, otherBook in books.items():
+            if other == exchange:
+                continue
+
+            otherFee = self.fees.get(other, 0.0)
+
+            # buy here, sell there
+            if buyCost > 0:
+                spread = otherBook[BID] * (1 - otherFee) / buyCost - 1
+
+                if spread >= self.minSpread:
+                    found.append(self.opportunity(pair, exchange, other, ask, otherBook[BID], spread, askQty, otherBook[BID_QTY], time))
+
+            # buy there, sell here
+            if otherBook[ASK] > 0:
+                spread = sellIncome / (otherBook[ASK] * (1 + otherFee)) - 1
+
+                if spread >= self.minSpread:
+                    found.append(self.opportunity(pair, other, exchange, otherBook[ASK], bid, spread, otherBook[ASK_QTY], bidQty, time))
+
+        latency = (perf_counter() - start) * 1e6
+        self.updates += 1
+        self.totalLatency += latency
+        self.maxLatency = max(self.maxLatency, latency)
+
+        for opportunity in found:
+            opportunity['latency'] = latency
+            self.opportunities += 1
+
+            if self.onOpportunity is not None:
+                self.onOpportunity(opportunity)
+
+        return found
+
+    def updateQuote(self, quote):
+        '''
+        update() with a quote in the format of QuoteFetcher. Quotes with an error are ignored.
+        '''
+
+        if quote.get('error') is not None:
+            return []
+
+        return self.update(quote['exchange'], quote['symbol'], quote['bid'], quote['ask'], quote.get('time'), quote.get('bidQty'), quote.get('askQty'))
+
+    def opportunity(self, pair, buyExchange, sellExchange, buyPrice, sellPrice, spread, askQty, bidQty, time):
+        quantity = min(askQty, bidQty) if askQty is not None and bidQty is not None else None
+
+        return {
+            'pair': pair,
+            'buyExchange': buyExchange,
+            'sellExchange': sellExchange,
+            'buyPrice': buyPrice,
+            'sellPrice': sellPrice,
+            'spread': spread,
+            'quantity': quantity,
+            'time': time,
+            'latency': None
+        }
+
+    def replay(self, quotes):
+        '''
+        Pushes recorded quotes (see recordedQuotes and xlsQuotes) through the engine as fast as possible.
+        Returns the list of opportunities, use stats() for the latencies.
+        '''
+
+        found = []
+
+        for quote in quotes:
+            found += self.updateQuote(quote)
+
+        return found
+
+    def stats(self):
+        return {
+            'updates': self.updates,
+            'opportunities': self.opportunities,
+            'meanLatency': self.totalLatency / self.updates if self.updates else 0.0,
+            'maxLatency': self.maxLatency
+        }
+
+def rowQuotes(rows, fields, symbols):
+    '''
+    Yields QuoteFetcher quotes from recorded rows with '<exchange>_bid' and '<exchange>_ask' columns,
+    e.g. fields ['time', 'btcTurk_bid', 'btcTurk_ask', 'binance_bid', 'binance_ask'].
+
+    Parameters
+    ---------------
+    (m)rows(iterable): Rows in the order of fields, time in ms\n
+    (m)fields(list): Column names\n
+    (m)symbols(dict): Exchange -> symbol, e.g. {'binance': 'USDCUSDT', 'btcturk': 'USDC_USDT'}
+    '''
+
+    index = {field.lower(): i for i, field in enumerate(fields)}
+    timeColumn = index['time']
+    columns = [(exchange, symbol, index[exchange + '_bid'], index[exchange + '_ask']) for exchange, symbol in symbols.items()]
+
+    for row in rows:
+        for exchange, symbol, bid, ask in columns:
+            yield {'exchange': exchange, 'symbol': symbol, 'bid': float(row[bid]), 'ask': float(row[ask]), 'bidQty': None, 'askQty': None, 'time': row[timeColumn], 'error': None}
+
+def recordedQuotes(recorder, symbols):
+    '''
+    Yields the quotes recorded by a TickRecorder, see rowQuotes.
+    '''
+
+    return rowQuotes(recorder.read(), recorder.fields, symbols)
+
+def xlsQuotes(path, symbols, sheetName=None):
+    '''
+    Yields the quotes of an xls file written by the old usdc_usdt.py, e.g. coinDatav1.xls, see rowQuotes.
+    Times are 'day-month-year hour:minute:second' strings and are converted to ms.
+    '''
+
+    import xlrd
+
+    wb = xlrd.open_workbook(path)
+    sheet = wb.sheet_by_name(sheetName) if sheetName else wb.sheet_by_index(0)
+    fields = sheet.row_values(0)
+    timeColumn = [field.lower() for field in fields].index('time')
+
+    def rows():
+        for i in range(1, sheet.nrows):
+            row = sheet.row_values(i)
+            row[timeColumn] = dateToUnix(row[timeColumn])
+
+            yield row
+
+    return rowQuotes(rows(), fields, symbols)
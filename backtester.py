@@ -0,0 +1,236 @@
+import itertools
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+try:
+    from .columnar import klinesToColumns, ohlcToColumns
+    from .historyDownloader import HistoryDownloader
+except ImportError:
+    from columnar import klinesToColumns, ohlcToColumns
+    from historyDownloader import HistoryDownloader
+
+def klineColumns(binance, symbol, interval, startTime, endTime=None, maxWorkers=8):
+    '''
+    Downloads the Binance klines of [startTime, endTime] (see HistoryDownloader) as column arrays (see klinesToColumns).
+    '''
+
+    return klinesToColumns(list(HistoryDownloader(binance, maxWorkers).klines(symbol, interval, startTime, endTime)))
+
+def ohlcColumns(btcturk, pair, fromTimestamp='', toTimestamp=''):
+    '''
+    Downloads the BtcTurk daily OHLC data as column arrays (see ohlcToColumns).
+    '''
+
+    return ohlcToColumns(btcturk.ohclData(pair, fromTimestamp, toTimestamp))
+
+def lastIndex(mask):
+    '''
+    For every element, the index of the last True element up to it, -1 before the first one.
+    '''
+
+    return np.maximum.accumulate(np.where(mask, np.arange(len(mask)), -1))
+
+def maxDrawdown(equity):
+    if not len(equity):
+        return 0.0
+
+    return float(np.max(1 - equity / np.maximum.accumulate(equity)))
+
+def threshold(columns, lowerLimit, upperLimit, fee=0.001):
+    '''
+    Simulates the threshold strategy of Arbitrage/doge.py: the whole capital is bought with a limit order at lowerLimit
+    and sold with a limit order at upperLimit, one position at a time.
+
+    A buy fills in the first candle whose low reaches lowerLimit (at the open if the candle opened below it),
+    a sell in the first candle whose high reaches upperLimit. Candles which reach both limits are skipped, because
+    the order of the two fills inside the candle is unknown. An open position is valued at the last close minus the fee.
+
+    Parameters
+    ---------------
+    (m)columns(dict): 'open', 'high', 'low', 'close' arrays, e.g. the result of klineColumns\n
+    (m)lowerLimit(float): Buy price\n
+    (m)upperLimit(float): Sell price\n
+    fee(float): Fee rate of every fill
+
+    Result
+    ---------------
+    {\n
+        "return": 0.12,         // Final capital / initial capital - 1
+        "trades": 14,           // Number of fills
+        "maxDrawdown": 0.05,    // Largest drop of the equity from its peak, marked at the closes
+        "exposure": 0.4         // Share of the candles with an open position
+    }
+    '''
+
+    openPrice, high, low, close = (np.asarray(columns[name], dtype=np.float64) for name in ('open', 'high', 'low', 'close'))
+
+    buyTouch = low <= lowerLimit
+    sellTouch = high >= upperLimit
+    signal = np.where(buyTouch & ~sellTouch, 1, np.where(sellTouch & ~buyTouch, -1, 0))
+
+    # the position is held from the last buy signal until the next sell signal
+    last = lastIndex(signal != 0)
+    holding = (last >= 0) & (signal[np.maximum(last, 0)] == 1)
+    previous = np.concatenate(([False], holding[:-1]))
+
+    buys = np.flatnonzero(holding & ~previous)
+    sells = np.flatnonzero(~holding & previous)
+
+    buyPrices = np.minimum(openPrice[buys], lowerLimit)
+    sellPrices = np.maximum(openPrice[sells], upperLimit)
+
+    factors = sellPrices * (1 - fee) / (buyPrices[:len(sells)] * (1 + fee))
+    capitals = np.concatenate(([1.0], np.cumprod(factors)))
+
+    # equity of every candle: capital after the completed round trips, marked to the close while holding
+    markers = np.zeros((2, len(close)), dtype=np.int64)
+    markers[0, sells] = 1
+    markers[1, buys] = 1
+    completed, bought = np.cumsum(markers, axis=1)
+    bought -= 1
+    equity = capitals[completed]
+    held = np.flatnonzero(holding)
+    equity[held] = equity[held] * close[held] / (buyPrices[bought[held]] * (1 + fee))
+
+    final = capitals[-1]
+
+    if len(buys) > len(sells):
+        final = final * close[-1] * (1 - fee) / (buyPrices[-1] * (1 + fee))
+
+    return {
+        'return': float(final - 1),
+        'trades': int(len(buys) + len(sells)),
+        'maxDrawdown': maxDrawdown(equity),
+        'exposure': float(holding.mean()) if len(holding) else 0.0
+    }
+
+def grid(columns, levels, quantity, fee=0.001):
+    '''
+    Simulates a grid strategy: quantity is bought for every level the close crosses downwards and sold for every level
+    it crosses upwards, at the level price. Crossings inside a candle which do not change the level of the close are ignored.
+    The account is assumed to hold enough of both assets for every fill.
+
+    Parameters
+    ---------------
+    (m)columns(dict): 'close' array\n
+    (m)levels(list): Grid prices\n
+    (m)quantity(float): Base quantity of every fill\n
+    fee(float): Fee rate of every fill
+
+    Result
+    ---------------
+    {\n
+        "profit": 12.5,     // Quote asset profit, the base position change is valued at the last close
+        "trades": 140,
+        "fees": 1.2,        // Paid fees in the quote asset
+        "position": -3.0    // Base asset position change
+    }
+    '''
+
+    close = np.asarray(columns['close'], dtype=np.float64)
+    levels = np.sort(np.asarray(levels, dtype=np.float64))
+
+    if not len(close):
+        return {'profit': 0.0, 'trades': 0, 'fees': 0.0, 'position': 0.0}
+
+    # k = number of levels above the close, grows when the price falls
+    k = len(levels) - np.searchsorted(levels, close, side='right')
+    sums = np.concatenate(([0.0], np.cumsum(levels[::-1])))
+
+    # quote value of the levels crossed between two closes, positive when buying
+    crossed = (sums[k[1:]] - sums[k[:-1]]) * quantity
+    fees = np.abs(crossed).sum() * fee
+    position = (k[-1] - k[0]) * quantity
+    cash = -crossed.sum() - fees
+
+    return {
+        'profit': float(cash + position * close[-1]),
+        'trades': int(np.abs(np.diff(k)).sum()),
+        'fees': float(fees),
+        'position': float(position)
+    }
+
+def spread(columns, other, entry, exit, fee=0.001):
+    '''
+    Simulates a spread (relative value) strategy between two aligned close series, e.g. the same pair on Binance and BtcTurk.
+    When close/otherClose - 1 rises to entry, the first market is sold and the other bought; the position is closed
+    when the spread falls back to exit. Fills are at the closes.
+
+    Parameters
+    ---------------
+    (m)columns(dict): 'close' array of the first market\n
+    (m)other(dict): 'close' array of the other market, aligned with the first one\n
+    (m)entry(float): Spread to open at, e.g. 0.004\n
+    (m)exit(float): Spread to close at, e.g. 0.0\n
+    fee(float): Fee rate of every fill, 4 fills per round trip
+
+    Result
+    ---------------
+    {\n
+        "return": 0.03,     // Compounded return of the round trips
+        "trades": 12,       // Number of round trips
+        "exposure": 0.1     // Share of the candles with an open position
+    }
+    '''
+
+    a = np.asarray(columns['close'], dtype=np.float64)
+    b = np.asarray(other['close'], dtype=np.float64)
+    ratio = a / b - 1
+
+    signal = np.where(ratio >= entry, 1, np.where(ratio <= exit, -1, 0))
+    last = lastIndex(signal != 0)
+    holding = (last >= 0) & (signal[np.maximum(last, 0)] == 1)
+    previous = np.concatenate(([False], holding[:-1]))
+
+    opens = np.flatnonzero(holding & ~previous)
+    closes = np.flatnonzero(~holding & previous)
+    opens = opens[:len(closes)]
+
+    factors = (a[opens] / a[closes]) * (b[closes] / b[opens]) * (1 - fee) ** 4
+
+    return {
+        'return': float(np.prod(factors) - 1),
+        'trades': int(len(closes)),
+        'exposure': float(holding.mean()) if len(holding) else 0.0
+    }
+
+STRATEGIES = {'threshold': threshold, 'grid': grid, 'spread': spread}
+
+# columns shared by the workers of a sweep, sent once per process instead of once per parameter set
+workerData = {}
+
+def initWorker(data):
+    workerData.update(data)
+
+def runWorker(strategy, params):
+    return STRATEGIES[strategy](**workerData, **params)
+
+def parameterGrid(**values):
+    '''
+    Every combination of the values, e.g. parameterGrid(lowerLimit=[0.39, 0.395], upperLimit=[0.4, 0.41]) gives 4 parameter sets.
+    '''
+
+    names = list(values)
+
+    return [dict(zip(names, combination)) for combination in itertools.product(*values.values())]
+
+def sweep(strategy, params, processes=None, **data):
+    '''
+    Runs a strategy for every parameter set in a process pool. Returns [(params, result), ...] in the order of params.
+
+    sweep('threshold', parameterGrid(lowerLimit=[0.39, 0.395], upperLimit=[0.4, 0.41]), columns=columns)
+
+    Parameters
+    ---------------
+    (m)strategy(str): 'threshold', 'grid' or 'spread'\n
+    (m)params(list): Parameter sets, e.g. the result of parameterGrid\n
+    processes(int): Number of worker processes. Default is the number of CPUs\n
+    data: Market data arguments of the strategy, columns= (and other= for spread)
+    '''
+
+    if strategy not in STRATEGIES:
+        raise ValueError('strategy must be one of {}'.format(list(STRATEGIES)))
+
+    with ProcessPoolExecutor(max_workers = processes, initializer = initWorker, initargs = (data,)) as executor:
+        results = list(executor.map(runWorker, itertools.repeat(strategy), params, chunksize = max(1, len(params) // (4 * (processes or 4)))))
+
+    return list(zip(params, results))
@@ -0,0 +1,58 @@
+'''
+Decoding of a large kline / OHLC history from the response body into columns: the DataFrame of Python rows used before against columnar.py.
+The payloads have the format of Binance.klines and BtcTurk.ohclData (built with tests/mockExchange.py, the repo has no recorded payloads).
+
+python benchmarks/columnarBenchmark.py [candles] [repeat]
+'''
+
+import os, sys, json, time, timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'tests')]
+
+from columnar import KLINE_COLUMNS, klinesToColumns, ohlcToColumns
+from mockExchange import kline
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+def ohlc(i):
+    return {'pair': 'BTCTRY', 'time': 1609459200 + i * 60, 'open': 450000.0, 'high': 451000.5, 'low': 449000.25,
+            'close': 450500.75, 'volume': 12.34567, 'total': 5561234.5, 'average': 450400.1, 'dailyChangeAmount': 500.75, 'dailyChangePercentage': 0.11}
+
+def klinesDataFrame(content):
+    frame = pd.DataFrame(json.loads(content), columns = [name for name, dtype in KLINE_COLUMNS] + ['ignore'])
+
+    for name, dtype in KLINE_COLUMNS:
+        frame[name] = frame[name].astype(dtype)
+
+    return frame
+
+def main(candles=1000000, repeat=3):
+    start = time.perf_counter()
+    klines = json.dumps([kline(1499040000000 + i * 60000) for i in range(candles)], separators=(',', ':')).encode('utf-8')
+    ohlcs = json.dumps([ohlc(i) for i in range(candles)], separators=(',', ':')).encode('utf-8')
+    print('{} candles, klines {:.0f} MB, OHLC {:.0f} MB, built in {:.1f} s'.format(candles, len(klines) / 1e6, len(ohlcs) / 1e6, time.perf_counter() - start))
+
+    cases = [
+        ('klines, raw bytes', lambda: klinesToColumns(klines)),
+        ('klines, json + columns', lambda: klinesToColumns(json.loads(klines))),
+        ('klines, raw, fixed-point', lambda: klinesToColumns(klines, pricePrecision = 8)),
+        ('OHLC, raw bytes', lambda: ohlcToColumns(ohlcs)),
+        ('OHLC, json + columns', lambda: ohlcToColumns(json.loads(ohlcs))),
+    ]
+
+    if pd is not None:
+        cases = [
+            ('klines, json + DataFrame', lambda: klinesDataFrame(klines)),
+            ('OHLC, json + DataFrame', lambda: pd.DataFrame(json.loads(ohlcs))),
+        ] + cases
+
+    for name, case in cases:
+        best = min(timeit.repeat(case, number = 1, repeat = repeat)) * 1000
+        print('{:<28}{:>10.0f} ms'.format(name, best))
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,51 @@
+'''
+Decoding time of the large payloads with every installed JSON backend, and select() of a few symbols from the raw bytes.
+The payloads have the format of the exchanges (built with tests/mockExchange.py, the repo has no recorded payloads).
+
+python benchmarks/jsonBackendBenchmark.py [symbols] [repeat]
+'''
+
+import os, sys, json, timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'tests')]
+
+import jsonBackend
+from response import formatResult
+from mockExchange import tickerSymbols, ticker24, bookTicker, btcturkTicker
+
+def compact(payload):
+    return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+def main(symbols=2500, repeat=20):
+    names = tickerSymbols(symbols)
+    payloads = [
+        ('ticker24, every symbol', compact([ticker24(symbol) for symbol in names])),
+        ('bookTicker, every symbol', compact([bookTicker(symbol) for symbol in names])),
+        ('orderBook, limit=5000', compact({'lastUpdateId': 1027024, 'bids': [['{:.8f}'.format(4 - i * 1e-5), '431.00000000'] for i in range(5000)],
+                                           'asks': [['{:.8f}'.format(4 + i * 1e-5), '12.00000000'] for i in range(5000)]})),
+        ('BtcTurk ticker, every pair', compact({'data': [btcturkTicker(symbol[:-3] + '_TRY') for symbol in names[:300]], 'success': True, 'message': None, 'code': 0})),
+    ]
+    wanted = names[:3]
+
+    print('{:<30}{:>10}'.format('', 'MB') + ''.join('{:>12}'.format(name + ' ms') for name in jsonBackend.available()))
+
+    try:
+        for name, content in payloads:
+            times = []
+
+            for backend in jsonBackend.available():
+                jsonBackend.setBackend(backend)
+                times.append(min(timeit.repeat(lambda: formatResult(content, 'dict'), number = 1, repeat = repeat)) * 1000)
+
+            print('{:<30}{:>10.2f}'.format(name, len(content) / 1e6) + ''.join('{:>12.2f}'.format(t) for t in times))
+
+        for name, content in payloads[:2]:
+            jsonBackend.setBackend()
+            best = min(timeit.repeat(lambda: jsonBackend.select(content, wanted, ['symbol', 'bidPrice']), number = 1, repeat = repeat)) * 1000
+            print('{:<30}{:>10.2f} ms'.format('select 3 symbols, ' + name.split(',')[0], best))
+    finally:
+        jsonBackend.setBackend()
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,33 @@
+'''
+Cost of every result type on a full-market ticker24 payload, from the response body to the parsed list the caller uses.
+The payload has the fields of Binance.ticker24 for every symbol (built with tests/mockExchange.py, the repo has no recorded payloads).
+
+python benchmarks/resultTypesBenchmark.py [symbols] [repeat]
+'''
+
+import os, sys, json, timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'tests')]
+
+from response import formatResult, loadResult
+from mockExchange import tickerSymbols, ticker24
+
+def main(symbols=2500, repeat=20):
+    content = json.dumps([ticker24(symbol) for symbol in tickerSymbols(symbols)], separators=(',', ':')).encode('utf-8')
+
+    cases = [
+        ('str + json.loads (caller)', lambda: json.loads(formatResult(content, 'str'))),
+        ('str + loadResult', lambda: loadResult(formatResult(content, 'str'))),
+        ('dict', lambda: loadResult(formatResult(content, 'dict'))),
+        ('raw + loadResult', lambda: loadResult(formatResult(content, 'raw'))),
+    ]
+
+    print('{} symbols, {:.2f} MB body'.format(symbols, len(content) / 1e6))
+
+    for name, case in cases:
+        best = min(timeit.repeat(case, number = 1, repeat = repeat)) * 1000
+        print('{:<28}{:>10.2f} ms'.format(name, best))
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
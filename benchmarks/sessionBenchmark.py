@@ -0,0 +1,57 @@
+'''
+Per-call latency of a pooled keep-alive client against one new connection per call (the old requests.get path),
+measured on the local stand-in server of tests/mockExchange.py.
+The stand-in speaks plain HTTP, so the gap only contains the TCP handshake; against the exchanges the TLS handshake adds more.
+
+python benchmarks/sessionBenchmark.py [calls]
+'''
+
+import os, sys, time, statistics
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'tests')]
+
+from binance import Binance
+from btcTurk import BtcTurk
+from mockExchange import MockExchange
+
+def measure(call, calls):
+    call()
+    times = []
+
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        times.append((time.perf_counter() - start) * 1000)
+
+    times.sort()
+
+    return statistics.mean(times), times[len(times) // 2], times[int(len(times) * 0.99) - 1]
+
+def main(calls=500):
+    with MockExchange() as exchange:
+        binance = Binance('key', 'secret')
+        binance.urlBase = exchange.url
+        unpooled = Binance('key', 'secret', keepAlive=False)
+        unpooled.urlBase = exchange.url
+        btcturk = BtcTurk('key', 'c2VjcmV0')
+        btcturk.urlBase = exchange.url
+
+        cases = [
+            ('requests.get per call', lambda: requests.get(exchange.url + '/api/v3/ticker/bookTicker?symbol=S0001TRY').content),
+            ('Binance, keepAlive=False', lambda: unpooled.symbolOrderBookTicker('S0001TRY')),
+            ('Binance, pooled', lambda: binance.symbolOrderBookTicker('S0001TRY')),
+            ('BtcTurk, pooled', lambda: btcturk.ticker('S0001_TRY')),
+        ]
+
+        print('{:<28}{:>10}{:>10}{:>10}'.format('{} calls'.format(calls), 'mean ms', 'p50 ms', 'p99 ms'))
+
+        for name, call in cases:
+            print('{:<28}{:>10.3f}{:>10.3f}{:>10.3f}'.format(name, *measure(call, calls)))
+
+        for client in (binance, unpooled, btcturk):
+            client.close()
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
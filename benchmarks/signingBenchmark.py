@@ -0,0 +1,60 @@
+'''
+Signing throughput of both clients: the signing code used before (a new HMAC keyed on every call) against the cached keyed HMAC state.
+
+python benchmarks/signingBenchmark.py [signatures]
+'''
+
+import os, sys, time, hmac, hashlib, base64, timeit
+from urllib.parse import urlencode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from binance import Binance
+from btcTurk import BtcTurk
+
+API_KEY = 'vmPUZE6mv9SD5VNHk4HlWFsOr6aKE2zvsw0MuIgwCIPy6utIco14y7Ju91duEh8A'
+API_SECRET = 'NhqPtmdSJYdKjVHjA7PZj4Mge3R5YNiP1e3UZjInClVN65XAbvqqM6A7H5fATj0j'
+BTCTURK_SECRET = base64.b64encode(API_SECRET.encode('utf-8')).decode('ascii')
+
+ORDER = {'symbol': 'BTCTRY', 'side': 'BUY', 'type': 'LIMIT', 'timeInForce': 'GTC', 'quantity': '0.01000000', 'price': '500000.00', 'recvWindow': 5000}
+
+def legacyBinanceSignature(data=''):
+    if data:
+        data += '&'
+    data += 'timestamp=' + str(int(time.time())*1000)
+    signature = hmac.new(API_SECRET.encode('utf-8'), data.encode('utf-8'), hashlib.sha256).hexdigest()
+
+    return data + '&signature=' + signature
+
+def legacyBtcturkHeaders(apiSecret=base64.b64decode(BTCTURK_SECRET)):
+    stamp = str(int(time.time())*1000)
+    data = '{}{}'.format(API_KEY, stamp).encode('utf-8')
+    signature = base64.b64encode(hmac.new(apiSecret, data, hashlib.sha256).digest())
+
+    return {'X-PCK': API_KEY, 'X-Stamp': stamp, 'X-Signature': signature, 'Content-Type' : 'application/json'}
+
+def main(signatures=200000):
+    binance = Binance(API_KEY, API_SECRET)
+    btcturk = BtcTurk(API_KEY, BTCTURK_SECRET)
+
+    cases = [
+        ('Binance order, before', lambda: legacyBinanceSignature(urlencode(ORDER, True))),
+        ('Binance order, cached HMAC', lambda: binance.createSignature(urlencode(ORDER, True))),
+        ('Binance signature, before', legacyBinanceSignature),
+        ('Binance signature, cached', binance.createSignature),
+        ('BtcTurk headers, before', legacyBtcturkHeaders),
+        ('BtcTurk headers, cached', btcturk.headersCreator),
+    ]
+
+    print('{:<30}{:>14}{:>12}'.format('{} signatures'.format(signatures), 'signatures/s', 'us each'))
+
+    for name, case in cases:
+        best = min(timeit.repeat(case, number = signatures, repeat = 3))
+        print('{:<30}{:>14.0f}{:>12.2f}'.format(name, signatures / best, best / signatures * 1e6))
+
+    binance.close()
+    btcturk.close()
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -1,39 +1,159 @@
-import time, base64, hmac, hashlib, requests, json
+import time, hmac, hashlib, json
 from urllib.parse import urlencode
+try:
+    from .httpSession import createSession, createAsyncSession, asyncRequest
+    from .response import RESULT_TYPES, formatResult, loadResult
+    from . import marketTypes
+except ImportError:
+    from httpSession import createSession, createAsyncSession, asyncRequest
+    from response import RESULT_TYPES, formatResult, loadResult
+    import marketTypes
 
 class Binance:
-    def __init__(self, apiKey, apiSecret):
+    def __init__(self, apiKey, apiSecret, poolSize=10, keepAlive=True, retries=3, backoffFactor=0.3, resultType='str', prober=None, rateLimiter=None, cache=None, filters=None):
+        '''
+        Parameters
+        --------------
+        (m)apiKey(str)\n
+        (m)apiSecret(str)\n
+        poolSize(int): Number of pooled keep-alive connections shared by every endpoint method\n
+        keepAlive(bool): Reuse connections between requests\n
+        retries(int): Retry count for connection errors and 5xx responses. Orders (POST) are never retried\n
+        backoffFactor(float): Exponential backoff factor between retries in seconds\n
+        resultType(str): 'str' returns indented JSON strings (default), 'dict' returns parsed dicts/lists, 'raw' returns the response body as bytes\n
+        prober(EndpointProber): If sent, every request is sent to the currently fastest base URL of the prober\n
+        rateLimiter(RateLimiter): If sent, requests are paced and prioritized to stay within the rate limits, e.g. binanceRateLimiter()\n
+        cache(ResponseCache): If sent, responses of the public market data functions are reused for a short time and identical concurrent requests are sent once\n
+        filters(ExchangeInfo): If sent, newOrder rounds every order to the symbol filters and raises OrderFilterError instead of sending orders the exchange would reject
+        '''
+
+        if resultType not in RESULT_TYPES:
+            raise ValueError('resultType must be one of {}'.format(RESULT_TYPES))
+
         self.urlBase = 'https://api.binance.com'
         self.apiKey = apiKey
         self.apiSecret = apiSecret
+        # keyed HMAC state and headers are built once and reused by every request
+        self.signer = hmac.new(apiSecret.encode('utf-8'), digestmod=hashlib.sha256)
+        self.headers = {'X-MBX-APIKEY':self.apiKey, 'Content-Type':'application/json'}
+        self.session = self.openSession(poolSize, keepAlive, retries, backoffFactor)
+        self.resultType = resultType
+        self.prober = prober
+        self.rateLimiter = rateLimiter
+        self.cache = cache
+        self.filters = filters
+        self.timeSync = None
+
+        if filters is not None:
+            filters.attach(self)
         
-    def requestData(self, createURL = True, requestType = 'GET', data = {}, timeout = None):
-        headers = {'X-MBX-APIKEY':self.apiKey, 'Content-Type':'application/json'}
-        
-        if createURL:
-            self.url = self.urlBase + self.urlMethod
-
-        if requestType == 'GET':
-        	self.result = requests.get(url = self.url, headers = headers, data = data, timeout = timeout)
-        elif requestType == 'POST':
-        	self.result = requests.post(url = self.url, headers = headers, data = data , timeout = timeout)
-        elif requestType == 'DELETE':
-        	self.result = requests.delete(url = self.url, headers = headers, data = data, timeout = timeout)
-        elif requestType == 'PUT':
-        	self.result = requests.put(url = self.url, headers = headers, data = data, timeout = timeout)
-        	
-        self.result = self.result.json()
-        
-        return json.dumps(self.result, indent=2)
+    def openSession(self, poolSize, keepAlive, retries, backoffFactor):
+        return createSession(poolSize, keepAlive, retries, backoffFactor)
+
+    def requestData(self, urlMethod, createURL = True, requestType = 'GET', data = {}, timeout = None):
+        '''
+        Every request state is kept in local variables, so one client and its connection pool can be shared between threads.
+        '''
+
+        headers = self.headers
+        url = self.baseURL() + urlMethod if createURL else urlMethod
+
+        if self.cache is not None and createURL and requestType == 'GET' and not data:
+            content = self.cache.get(urlMethod, lambda: self.send(requestType, url, urlMethod, headers, data, timeout))
+        else:
+            content, status = self.send(requestType, url, urlMethod if createURL else None, headers, data, timeout)
+
+        return formatResult(content, self.resultType)
+
+    def send(self, requestType, url, urlMethod, headers, data, timeout):
+        '''
+        Sends the request within the rate limits and returns the response body and the status code.
+        urlMethod is None for requests which are not sent to the exchange API (not rate limited).
+        '''
+
+        if self.rateLimiter is not None and urlMethod is not None:
+            self.rateLimiter.acquire(requestType, urlMethod, data)
+
+        result = self.session.request(requestType, url = url, headers = headers, data = data, timeout = timeout)
+
+        if self.rateLimiter is not None and urlMethod is not None:
+            self.rateLimiter.update(result.status_code, result.headers)
+
+        return result.content, result.status_code
+
+    def close(self):
+        '''
+        Closes the pooled connections.
+        '''
+
+        self.session.close()
+
+    def baseURL(self):
+        if self.prober is not None:
+            return self.prober.fastest()
+
+        return self.urlBase
+
+    def timestamp(self):
+        '''
+        Current time in ms used in the signatures, corrected to the server clock if a TimeSync is attached (see timeSync.syncClock).
+        '''
+
+        if self.timeSync is not None:
+            return self.timeSync.timestamp()
+
+        return int(time.time()*1000)
     
     def createSignature(self, data=''):
-        if data:
-            data += '&'
-        data += 'timestamp=' + str(int(time.time())*1000)
-        self.signature = hmac.new(self.apiSecret.encode('utf-8'), data.encode('utf-8'), hashlib.sha256).hexdigest()
-        data += '&signature=' + self.signature
+        '''
+        Appends the timestamp and the signature to the url-encoded parameters.
+        '''
+
+        data = '{}&timestamp={}'.format(data, self.timestamp()) if data else 'timestamp={}'.format(self.timestamp())
+        signer = self.signer.copy()
+        signer.update(data.encode('utf-8'))
 
-        return data
+        return '{}&signature={}'.format(data, signer.hexdigest())
+
+    def serverTime(self):
+        '''
+        Current server time.
+
+        Result
+        ------------
+        {\n
+            "serverTime": 1499827319559
+        }
+        '''
+
+        urlMethod = '/api/v3/time'
+
+        return self.requestData(urlMethod)
+
+    def serverTimestamp(self):
+        '''
+        Server time in ms, used by TimeSync.
+        '''
+
+        return loadResult(self.serverTime())['serverTime']
+
+    def timeSample(self):
+        '''
+        (local time before the request, server time, local time after the answer) in ms, used by TimeSync.
+        Only the HTTP exchange is timed: the request waits for the rate limiter before the clock starts
+        and the answer is decoded after it stops.
+        '''
+
+        urlMethod = '/api/v3/time'
+
+        if self.rateLimiter is not None:
+            self.rateLimiter.acquire('GET', urlMethod)
+
+        start, begin = time.time(), time.perf_counter()
+        content, status = self.send('GET', self.baseURL() + urlMethod, None, self.headers, {}, None)
+        elapsed = time.perf_counter() - begin
+
+        return start * 1000, loadResult(content)['serverTime'], (start + elapsed) * 1000
 
     def orderBook(self, symbol, limit=100):
         '''
@@ -67,9 +187,9 @@ class Binance:
         params = {'symbol':symbol, 'limit':int(limit)}
         params = urlencode(params, True)
 
-        self.urlMethod = '/api/v3/depth?' + params
+        urlMethod = '/api/v3/depth?' + params
 
-        return self.requestData()
+        return self.requestData(urlMethod)
 
     def trades(self, symbol, limit=500):
         '''
@@ -101,9 +221,9 @@ class Binance:
         params = {'symbol':symbol, 'limit':int(limit)}
         params = urlencode(params, True)
 
-        self.urlMethod = '/api/v3/trades?' + params
+        urlMethod = '/api/v3/trades?' + params
 
-        return self.requestData()
+        return self.requestData(urlMethod)
 
 
     def historicalTrades(self, symbol, limit=500, fromId=0):
@@ -141,9 +261,9 @@ class Binance:
 
         params = urlencode(params, True)
 
-        self.urlMethod = '/api/v3/historicalTrades?' + params
+        urlMethod = '/api/v3/historicalTrades?' + params
 
-        return self.requestData()
+        return self.requestData(urlMethod)
 
     def aggregateTrades(self, symbol, fromId=0, startTime='', endTime='', limit=500):
         '''
@@ -189,9 +309,9 @@ class Binance:
         
         params = urlencode(params, True)
 
-        self.urlMethod = '/api/v3/aggTrades?' + params
+        urlMethod = '/api/v3/aggTrades?' + params
 
-        return self.requestData()
+        return self.requestData(urlMethod)
 
     def klines(self, symbol, interval, startTime='', endTime='', limit=500):
         '''
@@ -238,9 +358,9 @@ class Binance:
         
         params = urlencode(params, True)
 
-        self.urlMethod = '/api/v3/klines?' + params
+        urlMethod = '/api/v3/klines?' + params
 
-        return self.requestData()
+        return self.requestData(urlMethod)
 
     def avgPrice(self, symbol):
         '''
@@ -261,9 +381,9 @@ class Binance:
         params = {'symbol': symbol}
         params = urlencode(params, True)
 
-        self.urlMethod = '/api/v3/avgPrice?' + params
+        urlMethod = '/api/v3/avgPrice?' + params
         
-        return self.requestData()
+        return self.requestData(urlMethod)
 
     def ticker24(self, symbol=''):
         '''
@@ -306,9 +426,9 @@ class Binance:
         
         params = urlencode(params, True)
 
-        self.urlMethod = '/api/v3/ticker/24hr?' + params
+        urlMethod = '/api/v3/ticker/24hr?' + params
         
-        return self.requestData()
+        return self.requestData(urlMethod)
 
     def symbolPriceTicker(self, symbol=''):
         '''
@@ -334,9 +454,9 @@ class Binance:
         
         params = urlencode(params, True)
 
-        self.urlMethod = '/api/v3/ticker/price?' + params
+        urlMethod = '/api/v3/ticker/price?' + params
         
-        return self.requestData()
+        return self.requestData(urlMethod)
 
     def symbolOrderBookTicker(self, symbol='', timeout=None):
         '''
@@ -365,9 +485,56 @@ class Binance:
         
         params = urlencode(params, True)
 
-        self.urlMethod = '/api/v3/ticker/bookTicker?' + params
+        urlMethod = '/api/v3/ticker/bookTicker?' + params
         
-        return self.requestData(timeout=timeout)
+        return self.requestData(urlMethod, timeout=timeout)
+
+    def exchangeInfo(self, symbol='', symbols=None):
+        '''
+        Current exchange trading rules and symbol information.\n
+        If neither symbol nor symbols is sent, every symbol is returned.
+
+        Parameters
+        --------------
+        symbol(str): BTCTRY\n
+        symbols(list): ['BTCTRY', 'DOGETRY']
+
+        Result
+        --------------
+        {\n
+            "timezone": "UTC",
+            "serverTime": 1565246363776,
+            "rateLimits": [...],
+            "symbols": [
+                {
+                    "symbol": "ETHBTC",
+                    "status": "TRADING",
+                    "baseAsset": "ETH",
+                    "quoteAsset": "BTC",
+                    "orderTypes": ["LIMIT", "LIMIT_MAKER", "MARKET", ...],
+                    "filters": [
+                        {"filterType": "PRICE_FILTER", "minPrice": "0.00000100", "maxPrice": "100.00000000", "tickSize": "0.00000100"},
+                        {"filterType": "LOT_SIZE", "minQty": "0.00100000", "maxQty": "100000.00000000", "stepSize": "0.00100000"},
+                        {"filterType": "NOTIONAL", "minNotional": "0.00100000", "applyMinToMarket": true, ...},
+                        ...
+                    ]
+                }
+            ]
+        }
+        '''
+
+        params = {}
+
+        if symbol:
+            params['symbol'] = symbol
+        if symbols:
+            params['symbols'] = json.dumps(symbols, separators=(',', ':'))
+
+        params = urlencode(params, True)
+
+        urlMethod = '/api/v3/exchangeInfo?' + params
+
+        return self.requestData(urlMethod)
 
     def newOrder(self, symbol, side, oType, timeInForce='', quantity='', quoteOrderQty='', price='',
     newClientOrderId='', stopPrice='', icebergQty='', newOrderRespType='', recvWindow=''):
@@ -427,6 +594,9 @@ class Binance:
         if recvWindow and int(recvWindow)>60000:
             recvWindow = 60000
 
+        if self.filters is not None:
+            quantity, price, stopPrice, icebergQty = self.filters.get(symbol).prepareOrder(side, oType, quantity, price, stopPrice, icebergQty)
+
         data = {'symbol':symbol, 'side':side, 'type':oType}
 
         if timeInForce:
@@ -451,9 +621,9 @@ class Binance:
         data = urlencode(data, True)
         data = self.createSignature(data)
 
-        self.urlMethod = '/api/v3/order'
+        urlMethod = '/api/v3/order'
 
-        return self.requestData(requestType='POST', data=data)
+        return self.requestData(urlMethod, requestType='POST', data=data)
 
     def queryOrder(self, symbol, orderId='', origClientOrderId='', recvWindow=''):
         '''
@@ -508,9 +678,9 @@ class Binance:
         data = urlencode(data, True)
         data = self.createSignature(data)
 
-        self.urlMethod = '/api/v3/order'
+        urlMethod = '/api/v3/order'
 
-        return self.requestData(data=data)
+        return self.requestData(urlMethod, data=data)
 
     def cancelOrder(self, symbol, orderId='', origClientOrderId='', newClientOrderId='', recvWindow=''):
         '''
@@ -562,9 +732,9 @@ class Binance:
         data = urlencode(data, True)
         data = self.createSignature(data)
 
-        self.urlMethod = '/api/v3/order'
+        urlMethod = '/api/v3/order'
 
-        return self.requestData(requestType='DELETE', data=data)
+        return self.requestData(urlMethod, requestType='DELETE', data=data)
 
     def cancelAllOrdersOfSymbol(self, symbol, recvWindow=''):
         '''
@@ -587,9 +757,9 @@ class Binance:
         data = urlencode(data, True)
         data = self.createSignature(data)
 
-        self.urlMethod = '/api/v3/openOrders'
+        urlMethod = '/api/v3/openOrders'
 
-        return self.requestData(requestType='DELETE', data=data)
+        return self.requestData(urlMethod, requestType='DELETE', data=data)
 
     def openOrders(self, symbol='', recvWindow=''):
         '''
@@ -641,9 +811,9 @@ class Binance:
         data = urlencode(data, True)
         data = self.createSignature(data)
 
-        self.urlMethod = '/api/v3/openOrders'
+        urlMethod = '/api/v3/openOrders'
 
-        return self.requestData(data=data)
+        return self.requestData(urlMethod, data=data)
 
     def allOrders(self, symbol, orderId='', startTime='', endTime='', limit=500, recvWindow=''):
         '''
@@ -707,9 +877,9 @@ class Binance:
         data = urlencode(data, True)
         data = self.createSignature(data)
 
-        self.urlMethod = '/api/v3/allOrders'
+        urlMethod = '/api/v3/allOrders'
 
-        return self.requestData(data=data)
+        return self.requestData(urlMethod, data=data)
 
     def newOCO(self, symbol, side, quantity, price, stopPrice, listClientOrderId='',
 limitClientOrderId='', limitIcebergQty='', stopClientOrderId='', stopLimitPrice='',
@@ -773,9 +943,9 @@ stopIcerbergQty='', stopLimitTimeInForce='', newOrderRespType='', recvWindow='')
         data = urlencode(data, True)
         data = self.createSignature(data)
 
-        self.urlMethod = '/api/v3/order/oco'
+        urlMethod = '/api/v3/order/oco'
 
-        return self.requestData(requestType='POST', data=data)
+        return self.requestData(urlMethod, requestType='POST', data=data)
 
     def cancelOCO(self, symbol, orderListId='', listClientOrderId='', newClientOrderId='', recvWindow=''):
         '''
@@ -809,9 +979,9 @@ stopIcerbergQty='', stopLimitTimeInForce='', newOrderRespType='', recvWindow='')
         data = urlencode(data, True)
         data = self.createSignature(data)
 
-        self.urlMethod = '/api/v3/orderList'
+        urlMethod = '/api/v3/orderList'
 
-        return self.requestData(requestType='DELETE', data=data)
+        return self.requestData(urlMethod, requestType='DELETE', data=data)
 
  ##################################
     def accountInfo(self, recvWindow=''):
@@ -828,6 +998,181 @@ stopIcerbergQty='', stopLimitTimeInForce='', newOrderRespType='', recvWindow='')
 
         data = self.createSignature()
 
-        self.urlMethod = '/api/v3/account?' + data
+        urlMethod = '/api/v3/account?' + data
+
+        return self.requestData(urlMethod)
+
+    def createListenKey(self):
+        '''
+        Starts a new user data stream. The stream is closed after 60 minutes unless keepAliveListenKey is called.
+
+        Result
+        --------------
+        {\n
+            "listenKey": "pqia91ma19a5s61cv6a81va65sdf19v8a65a1a5s61cv6a81va65sdf19v8a65a1"
+        }
+        '''
+
+        urlMethod = '/api/v3/userDataStream'
+
+        return self.requestData(urlMethod, requestType='POST')
+
+    def keepAliveListenKey(self, listenKey):
+        '''
+        Extends the validity of a user data stream by 60 minutes. Call it about every 30 minutes.
+        '''
+
+        data = urlencode({'listenKey': listenKey}, True)
+
+        urlMethod = '/api/v3/userDataStream'
+
+        return self.requestData(urlMethod, requestType='PUT', data=data)
+
+    def closeListenKey(self, listenKey):
+        '''
+        Closes a user data stream.
+        '''
+
+        data = urlencode({'listenKey': listenKey}, True)
+
+        urlMethod = '/api/v3/userDataStream'
+
+        return self.requestData(urlMethod, requestType='DELETE', data=data)
+
+    def scales(self, symbol):
+        '''
+        (price decimals, quantity decimals) of symbol for the market data types, from the filters if they were sent.
+        '''
+
+        symbolFilters = self.filters.index.get(symbol) if self.filters is not None else None
+
+        if symbolFilters is None:
+            return marketTypes.DEFAULT_SCALE, marketTypes.DEFAULT_SCALE
+
+        return symbolFilters.priceDecimals, symbolFilters.qtyDecimals
+
+    def parseQuotes(self, payload, time=None):
+        '''
+        Result of symbolOrderBookTicker -> list of marketTypes.Quote with fixed-point prices and quantities.
+        '''
+
+        return marketTypes.binanceQuotes(payload, self.scales, time)
+
+    def parseTrades(self, payload, symbol):
+        '''
+        Result of trades or historicalTrades -> list of marketTypes.Trade.
+        '''
+
+        return marketTypes.binanceTrades(payload, symbol, self.scales)
+
+    def parseOrderBook(self, payload, symbol):
+        '''
+        Result of orderBook -> (bids, asks) lists of marketTypes.BookLevel.
+        '''
+
+        return marketTypes.binanceLevels(payload, symbol, self.scales)
+
+    def parseCandles(self, payload, symbol):
+        '''
+        Result of klines -> list of marketTypes.Candle.
+        '''
+
+        return marketTypes.binanceCandles(payload, symbol, self.scales)
+
+class AsyncBinance(Binance):
+    '''
+    asyncio version of Binance with the same functions. Every function returns a coroutine, e.g.\n
+    await asyncio.gather(b.symbolOrderBookTicker('BTCTRY'), b.symbolOrderBookTicker('ETHTRY'))
+    '''
+
+    def __init__(self, apiKey, apiSecret, session=None, poolSize=100, keepAlive=True, retries=3, backoffFactor=0.3, resultType='str', prober=None, rateLimiter=None, cache=None, filters=None):
+        '''
+        Parameters
+        --------------
+        (m)apiKey(str)\n
+        (m)apiSecret(str)\n
+        session(aiohttp.ClientSession): Shared connection pool, e.g. the same session for AsyncBinance and AsyncBtcTurk. Created on the first request if not sent\n
+        poolSize(int): Number of pooled keep-alive connections if the session is created by the client\n
+        keepAlive(bool): Reuse connections between requests\n
+        retries(int): Retry count for connection errors and 5xx responses. Orders (POST) are never retried\n
+        backoffFactor(float): Exponential backoff factor between retries in seconds\n
+        resultType(str): 'str', 'dict' or 'raw'\n
+        prober(EndpointProber): If sent, every request is sent to the currently fastest base URL of the prober\n
+        rateLimiter(RateLimiter): If sent, requests are paced and prioritized to stay within the rate limits, e.g. binanceRateLimiter()\n
+        cache(ResponseCache): If sent, responses of the public market data functions are reused for a short time and identical concurrent requests are sent once\n
+        filters(ExchangeInfo): If sent, newOrder rounds every order to the symbol filters and raises OrderFilterError instead of sending orders the exchange would reject
+        '''
+
+        super().__init__(apiKey, apiSecret, poolSize, keepAlive, retries, backoffFactor, resultType, prober, rateLimiter, cache, filters)
+        self.session = session
+        self.ownSession = session is None
+
+    def openSession(self, poolSize, keepAlive, retries, backoffFactor):
+        # the aiohttp session is created on the first request, inside the event loop
+        self.poolSize = poolSize
+        self.keepAlive = keepAlive
+        self.retries = retries
+        self.backoffFactor = backoffFactor
+
+        return None
+
+    def requestData(self, urlMethod, createURL = True, requestType = 'GET', data = {}, timeout = None):
+        headers = self.headers
+        url = self.baseURL() + urlMethod if createURL else urlMethod
+
+        if self.cache is not None and createURL and requestType == 'GET' and not data:
+            return self.fetchCached(urlMethod, lambda: self.fetch(requestType, url, urlMethod, headers, data, timeout))
+
+        return self.fetchResult(self.fetch(requestType, url, urlMethod if createURL else None, headers, data, timeout))
+
+    async def fetchCached(self, urlMethod, fetch):
+        return formatResult(await self.cache.getAsync(urlMethod, fetch), self.resultType)
+
+    async def fetchResult(self, fetch):
+        content, status = await fetch
+
+        return formatResult(content, self.resultType)
+
+    async def fetch(self, requestType, url, urlMethod, headers, data, timeout):
+        if self.session is None:
+            self.session = createAsyncSession(self.poolSize, self.keepAlive)
+
+        if self.rateLimiter is not None and urlMethod is not None:
+            await self.rateLimiter.acquireAsync(requestType, urlMethod, data)
+
+        content, status, responseHeaders = await asyncRequest(self.session, requestType, url, self.retries, self.backoffFactor, timeout, headers = headers, data = data)
+
+        if self.rateLimiter is not None and urlMethod is not None:
+            self.rateLimiter.update(status, responseHeaders)
+
+        return content, status
+
+    async def serverTimestamp(self):
+        return loadResult(await self.serverTime())['serverTime']
+
+    async def timeSample(self):
+        urlMethod = '/api/v3/time'
+
+        if self.rateLimiter is not None:
+            await self.rateLimiter.acquireAsync('GET', urlMethod)
+
+        start, begin = time.time(), time.perf_counter()
+        content, status = await self.fetch('GET', self.baseURL() + urlMethod, None, self.headers, {}, None)
+        elapsed = time.perf_counter() - begin
+
+        return start * 1000, loadResult(content)['serverTime'], (start + elapsed) * 1000
+
+    async def close(self):
+        '''
+        Closes the connection pool if it was created by the client.
+        '''
+
+        if self.ownSession and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return self
 
-        return self.requestData()
\ No newline at end of file
+    async def __aexit__(self, *args):
+        await self.close()
@@ -0,0 +1,333 @@
+import json, time, threading
+try:
+    from . import jsonBackend
+    from .response import loadResult
+    from .localOrderBook import LocalOrderBook, OrderBookOutOfSync
+except ImportError:
+    import jsonBackend
+    from response import loadResult
+    from localOrderBook import LocalOrderBook, OrderBookOutOfSync
+
+try:
+    import websocket
+except ImportError:
+    websocket = None
+
+STREAM_URL = 'wss://stream.binance.com:9443'
+
+# Binance allows at most 1024 streams on one connection
+MAX_STREAMS = 1024
+
+def bookTickerStream(symbol):
+    return symbol.lower() + '@bookTicker'
+
+def tradeStream(symbol):
+    return symbol.lower() + '@trade'
+
+def aggTradeStream(symbol):
+    return symbol.lower() + '@aggTrade'
+
+def klineStream(symbol, interval):
+    return '{}@kline_{}'.format(symbol.lower(), interval)
+
+def depthStream(symbol, speed=100):
+    '''
+    Diff depth stream, speed is 100 or 1000 ms
+    '''
+
+    return '{}@depth@{}ms'.format(symbol.lower(), speed) if speed == 100 else symbol.lower() + '@depth'
+
+class BinanceStream:
+    '''
+    Binance market data over WebSocket combined streams. Every connection carries up to 1024 streams and is read by
+    its own thread, which reconnects with exponential backoff when the connection drops.
+    The latest message of every stream is kept in memory. The lookup functions (bookTicker, lastTrade, aggTrade, kline, orderBook)
+    return it while it is fresh and fall back to the REST functions of the Binance client when the stream is stale or down.
+
+    stream = BinanceStream([bookTickerStream('BTCTRY'), depthStream('BTCTRY')], binance = Binance(apiKey, apiSecret))\n
+    stream.start()\n
+    stream.bookTicker('BTCTRY')
+    '''
+
+    def __init__(self, streams, binance=None, url=STREAM_URL, staleAfter=5, onMessage=None, reconnectDelay=1, maxReconnectDelay=30):
+        '''
+        Parameters
+        ---------------
+        (m)streams(list): Stream names, e.g. [bookTickerStream('BTCTRY'), klineStream('ETHTRY', '1m')]\n
+        binance(Binance): Client used for the REST fallback and the depth snapshots\n
+        url(str): Base URL of the stream API\n
+        staleAfter(float): Seconds without a message after which a stream is stale\n
+        onMessage(function): Called with (stream, data) for every message, from the connection thread\n
+        reconnectDelay(float): First delay before reconnecting in seconds, doubled after every failed attempt\n
+        maxReconnectDelay(float): Maximum delay before reconnecting in seconds
+        '''
+
+        if websocket is None:
+            raise ImportError('websocket-client is required for BinanceStream')
+
+        self.url = url
+        self.binance = binance
+        self.staleAfter = staleAfter
+        self.onMessage = onMessage
+        self.reconnectDelay = reconnectDelay
+        self.maxReconnectDelay = maxReconnectDelay
+        self.groups = [list(streams[i:i + MAX_STREAMS]) for i in range(0, len(streams), MAX_STREAMS)]
+        self.latest = {}
+        self.books = {}
+        self.connections = {}
+        self.threads = []
+        self.lock = threading.Lock()
+        self.stopEvent = threading.Event()
+        self.messageId = 0
+        self.reconnects = 0
+        self.fallbacks = 0
+        self.lastError = None
+
+        for stream in streams:
+            self.addBook(stream)
+
+    def start(self):
+        '''
+        Opens one connection per 1024 streams, each in a background thread.
+        '''
+
+        self.stopEvent.clear()
+        self.threads = [threading.Thread(target = self.run, args = (group,), daemon = True) for group in self.groups]
+
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self):
+        self.stopEvent.set()
+
+        with self.lock:
+            connections = list(self.connections.values())
+
+        for connection in connections:
+            try:
+                # shuts the socket down so the blocked recv() of the stream thread returns at once
+                connection.abort()
+            except Exception:
+                pass
+
+        for thread in self.threads:
+            thread.join()
+
+        self.threads = []
+
+    def subscribe(self, streams):
+        '''
+        Adds streams to the last connection with room, or to a new connection.
+        '''
+
+        for stream in streams:
+            self.addBook(stream)
+
+        if self.groups and len(self.groups[-1]) + len(streams) <= MAX_STREAMS:
+            group = self.groups[-1]
+            group += streams
+
+            with self.lock:
+                connection = self.connections.get(id(group))
+                self.messageId += 1
+                message = json.dumps({'method': 'SUBSCRIBE', 'params': streams, 'id': self.messageId})
+
+            # if the connection is down the streams are part of the URL of the next connection
+            if connection is not None:
+                try:
+                    connection.send(message)
+                except Exception:
+                    pass
+        else:
+            group = list(streams)
+            self.groups.append(group)
+
+            if self.threads:
+                thread = threading.Thread(target = self.run, args = (group,), daemon = True)
+                self.threads.append(thread)
+                thread.start()
+
+    def streamURL(self, streams):
+        return '{}/stream?streams={}'.format(self.url, '/'.join(streams))
+
+    def run(self, group):
+        delay = self.reconnectDelay
+
+        while not self.stopEvent.is_set():
+            connection = None
+
+            try:
+                connection = websocket.create_connection(self.streamURL(group), timeout = self.staleAfter)
+
+                with self.lock:
+                    self.connections[id(group)] = connection
+
+                delay = self.reconnectDelay
+
+                while not self.stopEvent.is_set():
+                    try:
+                        message = connection.recv()
+                    except websocket.WebSocketTimeoutException:
+                        # no message for staleAfter seconds, lookups use REST until the stream is back
+                        continue
+
+                    if not message:
+                        break
+
+                    self.handle(message)
+            except Exception as e:
+                self.lastError = e
+            finally:
+                with self.lock:
+                    self.connections.pop(id(group), None)
+
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+            if self.stopEvent.wait(delay):
+                break
+
+            self.reconnects += 1
+            delay = min(delay * 2, self.maxReconnectDelay)
+
+    def handle(self, message):
+        message = jsonBackend.loads(message)
+        stream = message.get('stream')
+
+        # answers of SUBSCRIBE requests have no stream
+        if stream is None:
+            return
+
+        data = message['data']
+        self.latest[stream] = (data, time.monotonic())
+
+        if data.get('e') == 'depthUpdate':
+            book = self.books.get(data['s'])
+
+            if book is not None:
+                with self.lock:
+                    try:
+                        book.applyDiff(data)
+                    except OrderBookOutOfSync:
+                        # a new book buffers the diffs until orderBook() loads a new snapshot
+                        book = self.books[data['s']] = LocalOrderBook(data['s'])
+                        book.applyDiff(data)
+
+        if self.onMessage is not None:
+            self.onMessage(stream, data)
+
+    def addBook(self, stream):
+        # only diff depth streams (<symbol>@depth, <symbol>@depth@100ms) build a local book, partial depth streams do not
+        parts = stream.split('@')
+
+        if len(parts) > 1 and parts[1] == 'depth':
+            symbol = parts[0].upper()
+            self.books.setdefault(symbol, LocalOrderBook(symbol))
+
+    def fresh(self, stream):
+        '''
+        Latest message of stream or None if it is older than staleAfter seconds.
+        '''
+
+        latest = self.latest.get(stream)
+
+        if latest is None or time.monotonic() - latest[1] > self.staleAfter:
+            return None
+
+        return latest[0]
+
+    def fallback(self):
+        if self.binance is None:
+            raise RuntimeError('stream is stale and no Binance client was sent for the REST fallback')
+
+        self.fallbacks += 1
+
+        return self.binance
+
+    def bookTicker(self, symbol):
+        '''
+        Best bid/ask in the format of Binance.symbolOrderBookTicker.
+        '''
+
+        data = self.fresh(bookTickerStream(symbol))
+
+        if data is None:
+            return loadResult(self.fallback().symbolOrderBookTicker(symbol))
+
+        return {'symbol': data['s'], 'bidPrice': data['b'], 'bidQty': data['B'], 'askPrice': data['a'], 'askQty': data['A']}
+
+    def lastTrade(self, symbol):
+        '''
+        Latest trade in the format of Binance.trades.
+        '''
+
+        data = self.fresh(tradeStream(symbol))
+
+        if data is None:
+            return loadResult(self.fallback().trades(symbol, 1))[-1]
+
+        return {'id': data['t'], 'price': data['p'], 'qty': data['q'], 'quoteQty': str(float(data['p']) * float(data['q'])), 'time': data['T'], 'isBuyerMaker': data['m'], 'isBestMatch': data.get('M', True)}
+
+    def aggTrade(self, symbol):
+        '''
+        Latest aggregate trade in the format of Binance.aggregateTrades.
+        '''
+
+        data = self.fresh(aggTradeStream(symbol))
+
+        if data is None:
+            return loadResult(self.fallback().aggregateTrades(symbol, limit=1))[-1]
+
+        return {key: data[key] for key in ('a', 'p', 'q', 'f', 'l', 'T', 'm')}
+
+    def kline(self, symbol, interval):
+        '''
+        Current kline in the format of Binance.klines.
+        '''
+
+        data = self.fresh(klineStream(symbol, interval))
+
+        if data is None:
+            return loadResult(self.fallback().klines(symbol, interval, limit=1))[-1]
+
+        k = data['k']
+
+        return [k['t'], k['o'], k['h'], k['l'], k['c'], k['v'], k['T'], k['q'], k['n'], k['V'], k['Q'], '0']
+
+    def orderBook(self, symbol, depth=None):
+        '''
+        Order book in the format of Binance.orderBook, kept up to date by the depth stream.
+        The first call (and the first call after the book went out of sync) downloads a snapshot.
+        Without a depth stream, or if it is stale, the book is requested with REST.
+        '''
+
+        # handle() replaces the book of the symbol when it goes out of sync
+        with self.lock:
+            book = self.books.get(symbol)
+            loaded = book is not None and book.lastUpdateId is not None
+
+        stale = book is None or not any(self.fresh(stream) is not None for stream in (depthStream(symbol), depthStream(symbol, 1000)))
+
+        if stale or self.binance is None:
+            return loadResult(self.fallback().orderBook(symbol, depth or 100))
+
+        if not loaded:
+            # the snapshot is downloaded without the lock so the stream is not blocked meanwhile
+            snapshot = self.binance.orderBook(symbol, 1000)
+
+            with self.lock:
+                book = self.books[symbol]
+
+                if book.lastUpdateId is None:
+                    try:
+                        book.loadSnapshot(snapshot)
+                    except OrderBookOutOfSync:
+                        # the buffered diffs are newer than the snapshot, the next call downloads a new one
+                        book.lastUpdateId = None
+                        return loadResult(snapshot)
+
+        with self.lock:
+            return self.books[symbol].snapshot(depth)
@@ -1,37 +1,179 @@
-import time, base64, hmac, hashlib, requests, json
+import time, base64, hmac, hashlib
 from urllib.parse import urlencode
+try:
+    from .httpSession import createSession, createAsyncSession, asyncRequest
+    from .response import RESULT_TYPES, formatResult, loadResult
+    from . import marketTypes
+except ImportError:
+    from httpSession import createSession, createAsyncSession, asyncRequest
+    from response import RESULT_TYPES, formatResult, loadResult
+    import marketTypes
 
 class BtcTurk:
-    def __init__(self, apiKey, apiSecret):
+    def __init__(self, apiKey, apiSecret, poolSize=10, keepAlive=True, retries=3, backoffFactor=0.3, resultType='str', prober=None, rateLimiter=None, cache=None):
+        '''
+        Parameters
+        --------------
+        (m)apiKey(str)\n
+        (m)apiSecret(str)\n
+        poolSize(int): Number of pooled keep-alive connections shared by every endpoint method\n
+        keepAlive(bool): Reuse connections between requests\n
+        retries(int): Retry count for connection errors and 5xx responses. Orders (POST) are never retried\n
+        backoffFactor(float): Exponential backoff factor between retries in seconds\n
+        resultType(str): 'str' returns indented JSON strings (default), 'dict' returns parsed dicts/lists, 'raw' returns the response body as bytes\n
+        prober(EndpointProber): If sent, every request is sent to the currently fastest base URL of the prober\n
+        rateLimiter(RateLimiter): If sent, requests are paced and prioritized to stay within the rate limits, e.g. btcturkRateLimiter()\n
+        cache(ResponseCache): If sent, responses of the public market data functions are reused for a short time and identical concurrent requests are sent once
+        '''
+
+        if resultType not in RESULT_TYPES:
+            raise ValueError('resultType must be one of {}'.format(RESULT_TYPES))
+
         self.urlBase = 'https://api.btcturk.com'
         self.apiKey = apiKey
         self.apiSecret = base64.b64decode(apiSecret)
+        # keyed HMAC state is built once, every signature copies it
+        self.signer = hmac.new(self.apiSecret, digestmod=hashlib.sha256)
+        self.signPrefix = apiKey.encode('utf-8')
+        self.session = self.openSession(poolSize, keepAlive, retries, backoffFactor)
+        self.resultType = resultType
+        self.prober = prober
+        self.rateLimiter = rateLimiter
+        self.cache = cache
+        self.timeSync = None
+        self.scales = marketTypes.defaultScales
+
+    def openSession(self, poolSize, keepAlive, retries, backoffFactor):
+        return createSession(poolSize, keepAlive, retries, backoffFactor)
+
+    def requestData(self, urlMethod, createURL = True, requestType = 'GET', headers = {}, params = {}, timeout = None):
+        '''
+        Every request state is kept in local variables, so one client and its connection pool can be shared between threads.
+        '''
 
-    def requestData(self, createURL = True, requestType = 'GET', headers = {}, params = {}, timeout = None):
-        if createURL:
-            self.url = self.urlBase + self.urlMethod
-
-        if requestType == 'GET':
-            self.result = requests.get(url = self.url, headers = headers, json = params, timeout = None)
-        elif requestType == 'POST':
-            self.result = requests.post(url = self.url, headers = headers, json = params, timeout = None)  
-        elif requestType == 'DELETE':
-            self.result = requests.delete(url = self.url, headers = headers, json = params, timeout = None)
-        elif requestType == 'PUT':
-            self.result = requests.put(url = self.url, headers = headers, json = params, timeout = None)
-            
-        self.result = self.result.json()
-        
-        return json.dumps(self.result, indent=2)
+        url = self.baseURL() + urlMethod if createURL else urlMethod
+
+        if self.cache is not None and createURL and requestType == 'GET' and not headers:
+            content = self.cache.get(urlMethod, lambda: self.send(requestType, url, urlMethod, headers, params, timeout))
+        else:
+            content, status = self.send(requestType, url, urlMethod if createURL else None, headers, params, timeout)
+
+        return formatResult(content, self.resultType)
+
+    def send(self, requestType, url, urlMethod, headers, params, timeout):
+        '''
+        Sends the request within the rate limits and returns the response body and the status code.
+        urlMethod is None for requests which are not sent to the exchange API (not rate limited).
+        '''
+
+        if self.rateLimiter is not None and urlMethod is not None:
+            self.rateLimiter.acquire(requestType, urlMethod, params)
+
+        result = self.session.request(requestType, url = url, headers = headers, json = params, timeout = timeout)
+
+        if self.rateLimiter is not None and urlMethod is not None:
+            self.rateLimiter.update(result.status_code, result.headers)
+
+        return result.content, result.status_code
+
+    def close(self):
+        '''
+        Closes the pooled connections.
+        '''
+
+        self.session.close()
+
+    def baseURL(self):
+        if self.prober is not None:
+            return self.prober.fastest()
+
+        return self.urlBase
+
+    def timestamp(self):
+        '''
+        Current time in ms used in the signatures, corrected to the server clock if a TimeSync is attached (see timeSync.syncClock).
+        '''
+
+        if self.timeSync is not None:
+            return self.timeSync.timestamp()
+
+        return int(time.time()*1000)
 
     def headersCreator(self):
-        self.stamp = str(int(time.time())*1000)
-        self.data = '{}{}'.format(self.apiKey, self.stamp).encode('utf-8')
-        self.signature = hmac.new(self.apiSecret, self.data, hashlib.sha256).digest()
-        self.signature = base64.b64encode(self.signature)
-        self.headers = {'X-PCK': self.apiKey, 'X-Stamp': self.stamp, 'X-Signature': self.signature, 'Content-Type' : 'application/json'}
+        stamp = str(self.timestamp())
+        signer = self.signer.copy()
+        signer.update(self.signPrefix + stamp.encode('ascii'))
+        signature = base64.b64encode(signer.digest()).decode('ascii')
+
+        return {'X-PCK': self.apiKey, 'X-Stamp': stamp, 'X-Signature': signature, 'Content-Type' : 'application/json'}
+
+    def exchangeInfo(self):
+        '''
+        Server time, pairs and currencies with their trading rules.
+
+        GET ../api/v2/server/exchangeinfo
+
+        Result
+        ------------
+        {\n
+            "data": {
+                "timeZone": "UTC",
+                "serverTime": 1618839112395,
+                "symbols": [...],
+                "currencies": [...]
+            },
+            "success": true,
+            "message": null,
+            "code": 0
+        }
+        '''
+
+        urlMethod = '/api/v2/server/exchangeinfo'
+
+        return self.requestData(urlMethod)
+
+    def serverTime(self):
+        '''
+        Current server time. A small answer, unlike exchangeInfo which also lists every pair.
+
+        GET ../api/v2/server/time
+
+        Result
+        ------------
+        {\n
+            "serverTime": 1618839112395,
+            "serverTime2": "2021-04-19T13:31:52.3952246+00:00"
+        }
+        '''
+
+        urlMethod = '/api/v2/server/time'
+
+        return self.requestData(urlMethod)
+
+    def serverTimestamp(self):
+        '''
+        Server time in ms, used by TimeSync.
+        '''
+
+        return loadResult(self.serverTime())['serverTime']
+
+    def timeSample(self):
+        '''
+        (local time before the request, server time, local time after the answer) in ms, used by TimeSync.
+        Only the HTTP exchange is timed: the request waits for the rate limiter before the clock starts
+        and the answer is decoded after it stops.
+        '''
 
-        return self.headers
+        urlMethod = '/api/v2/server/time'
+
+        if self.rateLimiter is not None:
+            self.rateLimiter.acquire('GET', urlMethod)
+
+        start, begin = time.time(), time.perf_counter()
+        content, status = self.send('GET', self.baseURL() + urlMethod, None, {}, {}, None)
+        elapsed = time.perf_counter() - begin
+
+        return start * 1000, loadResult(content)['serverTime'], (start + elapsed) * 1000
 
     def ticker(self, pairSymbol='', currency='', timeout=None):
         '''
@@ -73,14 +215,14 @@ class BtcTurk:
         numeratorSymbol: Numerator currency symbol of the pair\n
         '''
 
-        self.urlMethod = '/api/v2/ticker'
+        urlMethod = '/api/v2/ticker'
 
         if pairSymbol:
-            self.urlMethod += '?pairSymbol=' + pairSymbol
+            urlMethod += '?pairSymbol=' + pairSymbol
         elif currency:
-            self.urlMethod += '/currency?symbol=' + currency
+            urlMethod += '/currency?symbol=' + currency
 
-        return self.requestData(timeout=timeout)
+        return self.requestData(urlMethod, timeout=timeout)
 
     def trades(self, pairSymbol, last=''):
         '''
@@ -114,9 +256,9 @@ class BtcTurk:
 
         params = {'pairSymbol':pairSymbol, 'last':last}
 
-        self.urlMethod = '/api/v2/trades?' + urlencode(params, True)
+        urlMethod = '/api/v2/trades?' + urlencode(params, True)
 
-        return self.requestData()
+        return self.requestData(urlMethod)
 
     def orderBook(self, pairSymbol, limit=''):
         '''
@@ -147,9 +289,9 @@ class BtcTurk:
 
         params = {'pairSymbol':pairSymbol, 'limit':limit}
 
-        self.urlMethod = '/api/v2/orderbook?' + urlencode(params, True)
+        urlMethod = '/api/v2/orderbook?' + urlencode(params, True)
 
-        return self.requestData()
+        return self.requestData(urlMethod)
 
     def ohclData(self, pair, fromTimestamp='', toTimestamp=''):
         '''
@@ -184,9 +326,9 @@ class BtcTurk:
 
         params = {'pair':pair, 'from':fromTimestamp, 'to':toTimestamp}
 
-        self.url = 'https://graph-api.btcturk.com/v1/ohlcs?' + urlencode(params, True)
+        urlMethod = 'https://graph-api.btcturk.com/v1/ohlcs?' + urlencode(params, True)
 
-        return self.requestData(createURL = False)
+        return self.requestData(urlMethod, createURL = False)
 
     def accountBalance(self):
         '''
@@ -202,9 +344,9 @@ class BtcTurk:
         free: Asset available amount for trading\n
         '''
 
-        self.urlMethod = '/api/v1/users/balances'
+        urlMethod = '/api/v1/users/balances'
 
-        return self.requestData(headers = self.headersCreator())
+        return self.requestData(urlMethod, headers = self.headersCreator())
 
     def allOrders(self, pairSymbol, orderID='', startTime='', endTime='', page='', limit=''):
         '''
@@ -242,9 +384,9 @@ class BtcTurk:
 
         params = {'orderId':orderID, 'pairSymbol':pairSymbol, 'startTime':startTime, 'endTime':endTime, 'page':page, 'limit':limit}
     
-        self.urlMethod = '/api/v1/allOrders?' + urlencode(params, True)
+        urlMethod = '/api/v1/allOrders?' + urlencode(params, True)
 
-        return self.requestData(headers = self.headersCreator())
+        return self.requestData(urlMethod, headers = self.headersCreator())
     
     def cancelOrder(self, orderID):
         '''
@@ -261,9 +403,9 @@ class BtcTurk:
         Success true if the order cancellation succeeded. False if it failed.
         '''
 
-        self.urlMethod = '/api/v1/order?id=' + orderID
+        urlMethod = '/api/v1/order?id=' + str(orderID)
 
-        return self.requestData(requestType = 'DELETE', headers = self.headersCreator())
+        return self.requestData(urlMethod, requestType = 'DELETE', headers = self.headersCreator())
 
     def openOrders(self, pairSymbol=''):
         '''
@@ -293,9 +435,9 @@ class BtcTurk:
         leftAmount: Order left amount if it matched partialy\n
         '''
         
-        self.urlMethod = '/api/v1/openOrders?pairSymbol=' + pairSymbol
+        urlMethod = '/api/v1/openOrders?pairSymbol=' + pairSymbol
 
-        return self.requestData(headers = self.headersCreator())
+        return self.requestData(urlMethod, headers = self.headersCreator())
 
     def submitOrder(self, quantity, price, orderMethod, orderType, pairSymbol, stopPrice='', newOrderClientId=''):
         '''
@@ -330,9 +472,9 @@ class BtcTurk:
 
         params = {'quantity':quantity, 'price':price, 'stopPrice':stopPrice, 'newOrderClientId':newOrderClientId, 'orderMethod':orderMethod, 'orderType':orderType, 'pairSymbol':pairSymbol}
 
-        self.urlMethod = '/api/v1/order'       
+        urlMethod = '/api/v1/order'
   
-        return self.requestData(requestType = 'POST', headers = self.headersCreator(), params = params)
+        return self.requestData(urlMethod, requestType = 'POST', headers = self.headersCreator(), params = params)
 
     def userTransactionsCrypto(self, tType='', symbol='', startDate='', endDate=''):
         '''
@@ -349,9 +491,9 @@ class BtcTurk:
 
         params= {'type':tType, 'symbol':symbol, 'startDate':startDate, 'endDate':endDate}
 
-        self.urlMethod = '/api/v1/users/transactions/crypto?' + urlencode(params, True)
+        urlMethod = '/api/v1/users/transactions/crypto?' + urlencode(params, True)
 
-        return self.requestData(headers = self.headersCreator())
+        return self.requestData(urlMethod, headers = self.headersCreator())
 
     def userTransactionsFiat(self, balanceTypes='', currencySymbols='', startDate='', endDate=''):
         '''
@@ -379,9 +521,9 @@ class BtcTurk:
 
         params= {'balanceTypes':balanceTypes, 'currencySymbols':currencySymbols, 'startDate':startDate, 'endDate':endDate}
 
-        self.urlMethod = '/api/v1/users/transactions/fiat' + urlencode(params, True)
+        urlMethod = '/api/v1/users/transactions/fiat?' + urlencode(params, True)
 
-        return self.requestData(headers = self.headersCreator())
+        return self.requestData(urlMethod, headers = self.headersCreator())
 
     def userTransactionsTrade(self, tType='', symbol='', startDate='', endDate=''):
         '''
@@ -412,6 +554,138 @@ class BtcTurk:
 
         params= {'type':tType, 'symbol':symbol, 'startDate':startDate, 'endDate':endDate}
 
-        self.urlMethod = '/api/v1/users/transactions/trade?' + urlencode(params, True)
+        urlMethod = '/api/v1/users/transactions/trade?' + urlencode(params, True)
+
+        return self.requestData(urlMethod, headers = self.headersCreator())
+
+    def loadScales(self, exchangeInfo=None):
+        '''
+        Uses the pair precisions of exchangeInfo (requested if not sent) for the market data types instead of 8 decimals.
+        AsyncBtcTurk must send the awaited result of exchangeInfo.
+        '''
+
+        self.scales = marketTypes.btcturkScales(exchangeInfo if exchangeInfo is not None else self.exchangeInfo())
+
+    def parseQuotes(self, payload):
+        '''
+        Result of ticker -> list of marketTypes.Quote with fixed-point prices.
+        '''
+
+        return marketTypes.btcturkQuotes(payload, self.scales)
+
+    def parseTrades(self, payload):
+        '''
+        Result of trades -> list of marketTypes.Trade.
+        '''
+
+        return marketTypes.btcturkTrades(payload, self.scales)
+
+    def parseOrderBook(self, payload, pairSymbol):
+        '''
+        Result of orderBook -> (bids, asks) lists of marketTypes.BookLevel.
+        '''
+
+        return marketTypes.btcturkLevels(payload, pairSymbol, self.scales)
+
+    def parseCandles(self, payload, pair):
+        '''
+        Result of ohclData -> list of marketTypes.Candle.
+        '''
+
+        return marketTypes.btcturkCandles(payload, pair, self.scales)
+
+class AsyncBtcTurk(BtcTurk):
+    '''
+    asyncio version of BtcTurk with the same functions. Every function returns a coroutine, e.g.\n
+    await asyncio.gather(b.ticker('BTC_TRY'), b.ticker('ETH_TRY'))
+    '''
+
+    def __init__(self, apiKey, apiSecret, session=None, poolSize=100, keepAlive=True, retries=3, backoffFactor=0.3, resultType='str', prober=None, rateLimiter=None, cache=None):
+        '''
+        Parameters
+        --------------
+        (m)apiKey(str)\n
+        (m)apiSecret(str)\n
+        session(aiohttp.ClientSession): Shared connection pool, e.g. the same session for AsyncBinance and AsyncBtcTurk. Created on the first request if not sent\n
+        poolSize(int): Number of pooled keep-alive connections if the session is created by the client\n
+        keepAlive(bool): Reuse connections between requests\n
+        retries(int): Retry count for connection errors and 5xx responses. Orders (POST) are never retried\n
+        backoffFactor(float): Exponential backoff factor between retries in seconds\n
+        resultType(str): 'str', 'dict' or 'raw'\n
+        prober(EndpointProber): If sent, every request is sent to the currently fastest base URL of the prober\n
+        rateLimiter(RateLimiter): If sent, requests are paced and prioritized to stay within the rate limits, e.g. btcturkRateLimiter()\n
+        cache(ResponseCache): If sent, responses of the public market data functions are reused for a short time and identical concurrent requests are sent once
+        '''
+
+        super().__init__(apiKey, apiSecret, poolSize, keepAlive, retries, backoffFactor, resultType, prober, rateLimiter, cache)
+        self.session = session
+        self.ownSession = session is None
+
+    def openSession(self, poolSize, keepAlive, retries, backoffFactor):
+        # the aiohttp session is created on the first request, inside the event loop
+        self.poolSize = poolSize
+        self.keepAlive = keepAlive
+        self.retries = retries
+        self.backoffFactor = backoffFactor
+
+        return None
+
+    def requestData(self, urlMethod, createURL = True, requestType = 'GET', headers = {}, params = {}, timeout = None):
+        url = self.baseURL() + urlMethod if createURL else urlMethod
+
+        if self.cache is not None and createURL and requestType == 'GET' and not headers:
+            return self.fetchCached(urlMethod, lambda: self.fetch(requestType, url, urlMethod, headers, params, timeout))
+
+        return self.fetchResult(self.fetch(requestType, url, urlMethod if createURL else None, headers, params, timeout))
+
+    async def fetchCached(self, urlMethod, fetch):
+        return formatResult(await self.cache.getAsync(urlMethod, fetch), self.resultType)
+
+    async def fetchResult(self, fetch):
+        content, status = await fetch
+
+        return formatResult(content, self.resultType)
+
+    async def fetch(self, requestType, url, urlMethod, headers, params, timeout):
+        if self.session is None:
+            self.session = createAsyncSession(self.poolSize, self.keepAlive)
+
+        if self.rateLimiter is not None and urlMethod is not None:
+            await self.rateLimiter.acquireAsync(requestType, urlMethod, params)
+
+        content, status, responseHeaders = await asyncRequest(self.session, requestType, url, self.retries, self.backoffFactor, timeout, headers = headers, json = params)
+
+        if self.rateLimiter is not None and urlMethod is not None:
+            self.rateLimiter.update(status, responseHeaders)
+
+        return content, status
+
+    async def serverTimestamp(self):
+        return loadResult(await self.serverTime())['serverTime']
+
+    async def timeSample(self):
+        urlMethod = '/api/v2/server/time'
+
+        if self.rateLimiter is not None:
+            await self.rateLimiter.acquireAsync('GET', urlMethod)
+
+        start, begin = time.time(), time.perf_counter()
+        content, status = await self.fetch('GET', self.baseURL() + urlMethod, None, {}, {}, None)
+        elapsed = time.perf_counter() - begin
+
+        return start * 1000, loadResult(content)['serverTime'], (start + elapsed) * 1000
+
+    async def close(self):
+        '''
+        Closes the connection pool if it was created by the client.
+        '''
+
+        if self.ownSession and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return self
 
-        return self.requestData(headers = self.headersCreator())
\ No newline at end of file
+    async def __aexit__(self, *args):
+        await self.close()
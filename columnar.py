@@ -0,0 +1,148 @@
+import re, json
+import numpy as np
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+KLINE_COLUMNS = [
+    ('openTime', np.int64), ('open', np.float64), ('high', np.float64), ('low', np.float64), ('close', np.float64),
+    ('volume', np.float64), ('closeTime', np.int64), ('quoteVolume', np.float64), ('trades', np.int64),
+    ('takerBuyBaseVolume', np.float64), ('takerBuyQuoteVolume', np.float64)
+]
+
+OHLC_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'total', 'average']
+
+def klinesToColumns(payload, pricePrecision=None):
+    '''
+    Converts the result of Binance.klines to typed column arrays without creating a Python object per row.
+    Raw bytes (resultType='raw') are parsed directly as one flat numeric array, which is the fastest way.
+
+    Parameters
+    ---------------
+    (m)payload(bytes/str/list): Result of Binance.klines\n
+    pricePrecision(int): If sent, open/high/low/close are returned as int64 fixed-point values scaled by 10**pricePrecision
+
+    Result
+    ---------------
+    {\n
+        "openTime": int64 array (ms),
+        "open": float64 array,
+        ...
+        "trades": int64 array,
+        "takerBuyQuoteVolume": float64 array
+    }
+    '''
+
+    if isinstance(payload, (bytes, bytearray, str)):
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
+
+        if payload.lstrip()[:1] == b'{':
+            raise ValueError('not a klines payload: {}'.format(payload[:200]))
+
+        # '[[1499040000000,"0.01634790",...],[...]]' -> '1499040000000,0.01634790,...'
+        text = payload.translate(None, b'[]" \n\t\r')
+        values = np.fromstring(text, dtype=np.float64, sep=',') if text else np.empty(0)
+    else:
+        values = np.array(payload, dtype=np.float64).ravel() if payload else np.empty(0)
+
+    # every kline has 12 fields, the last one is ignored
+    values = values.reshape(-1, 12)
+
+    columns = {}
+
+    for i, (name, dtype) in enumerate(KLINE_COLUMNS):
+        columns[name] = values[:, i].astype(dtype)
+
+    if pricePrecision is not None:
+        for name in ['open', 'high', 'low', 'close']:
+            columns[name] = toFixedPoint(columns[name], pricePrecision)
+
+    return columns
+
+def ohlcToColumns(payload, pricePrecision=None):
+    '''
+    Converts the result of BtcTurk.ohclData to typed column arrays.
+    Raw bytes are scanned field by field, so no dict is created per row.
+
+    Parameters
+    ---------------
+    (m)payload(bytes/str/list): Result of BtcTurk.ohclData\n
+    pricePrecision(int): If sent, open/high/low/close/average are returned as int64 fixed-point values scaled by 10**pricePrecision
+
+    Result
+    ---------------
+    {\n
+        "time": int64 array (s),
+        "open": float64 array,
+        ...
+        "average": float64 array
+    }
+    '''
+
+    if isinstance(payload, str):
+        payload = payload.encode('utf-8')
+
+    columns = {}
+
+    if isinstance(payload, (bytes, bytearray)):
+        if payload.lstrip()[:1] == b'{':
+            # column-oriented payloads ({"t": [...], "o": [...], ...}) are already arrays
+            return ohlcToColumns(json.loads(payload), pricePrecision)
+
+        timeKey = b'time' if b'"time"' in payload else b'timestamp'
+        columns['time'] = np.array(re.findall(b'"' + timeKey + rb'"\s*:\s*"?([-0-9.eE]+)', payload), dtype=np.float64).astype(np.int64)
+
+        for name in OHLC_COLUMNS:
+            values = re.findall(b'"' + name.encode('utf-8') + rb'"\s*:\s*"?([-0-9.eE]+)', payload)
+
+            if values:
+                columns[name] = np.array(values, dtype=np.float64)
+    elif isinstance(payload, dict):
+        if 'data' in payload:
+            return ohlcToColumns(payload['data'], pricePrecision)
+
+        keys = {'time': 't', 'open': 'o', 'high': 'h', 'low': 'l', 'close': 'c', 'volume': 'v'}
+
+        for name, key in keys.items():
+            columns[name] = np.asarray(payload[key], dtype = np.int64 if name == 'time' else np.float64)
+    else:
+        count = len(payload)
+        timeKey = 'time' if count and 'time' in payload[0] else 'timestamp'
+
+        columns['time'] = np.fromiter((row[timeKey] for row in payload), dtype=np.int64, count=count)
+
+        for name in OHLC_COLUMNS:
+            if count and name in payload[0]:
+                columns[name] = np.fromiter((row[name] for row in payload), dtype=np.float64, count=count)
+
+    if pricePrecision is not None:
+        for name in ['open', 'high', 'low', 'close', 'average']:
+            if name in columns:
+                columns[name] = toFixedPoint(columns[name], pricePrecision)
+
+    return columns
+
+def toFixedPoint(values, precision):
+    '''
+    float64 array -> int64 array scaled by 10**precision
+    '''
+
+    return np.rint(values * (10 ** precision)).astype(np.int64)
+
+def toDataFrame(columns):
+    import pandas as pd
+
+    return pd.DataFrame(columns, copy=False)
+
+def toArrow(columns):
+    '''
+    Converts the columns to a pyarrow.Table without copying the arrays.
+    '''
+
+    if pyarrow is None:
+        raise ImportError('pyarrow is required for toArrow()')
+
+    return pyarrow.table(columns)
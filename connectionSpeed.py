@@ -1,4 +1,10 @@
-import subprocess, re
+import subprocess, re, socket, time, math, threading, http.client
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+BINANCE_ENDPOINTS = ['https://api.binance.com', 'https://api1.binance.com', 'https://api2.binance.com', 'https://api3.binance.com', 'https://api4.binance.com']
+BINANCE_PING = '/api/v3/ping'
 
 def ping(host, attemptCount = 5):
     '''
@@ -27,18 +33,181 @@ def ping(host, attemptCount = 5):
 def compareHosts(hosts, attemptCount = 5):
     '''
     results are based on average speed.
-    criteria can be changed from ping() function
+    criteria can be changed from ping() function.
+    hosts which cannot be pinged are skipped.
 
     Result
     ----------------
-    [bestURL, pingOfBestURL]
+    [bestURL, pingOfBestURL] or None if no host can be pinged
     '''
 
     speeds = {}
 
-    for host in hosts:
-        speeds[host] = ping(host)[1]
+    with ThreadPoolExecutor(max_workers = len(hosts) or 1) as executor:
+        results = executor.map(lambda host: ping(host, attemptCount), hosts)
+
+        for host, result in zip(hosts, results):
+            if result:
+                speeds[host] = result[1]
+
+    if not speeds:
+        return None
 
     best = min(speeds, key=speeds.get)
 
-    return [best, speeds[best]]
\ No newline at end of file
+    return [best, speeds[best]]
+
+def tcpConnectTime(url, timeout = 2):
+    '''
+    Time of a TCP connect to the host of the url in ms
+    '''
+
+    url = urlparse(url)
+    port = url.port or (443 if url.scheme == 'https' else 80)
+
+    start = time.perf_counter()
+    connection = socket.create_connection((url.hostname, port), timeout = timeout)
+    elapsed = (time.perf_counter() - start) * 1000
+    connection.close()
+
+    return elapsed
+
+def httpRoundTrip(url, path = '/', timeout = 2, connection = None):
+    '''
+    Time of a GET request in ms. If an open http.client connection is sent, it is reused,
+    so only the request round trip is measured and not the handshake.
+    '''
+
+    if connection is None:
+        connection = httpConnection(url, timeout)
+
+    start = time.perf_counter()
+    connection.request('GET', path, headers = {'Connection': 'keep-alive'})
+    connection.getresponse().read()
+
+    return (time.perf_counter() - start) * 1000
+
+def httpConnection(url, timeout = 2):
+    url = urlparse(url)
+
+    if url.scheme == 'https':
+        return http.client.HTTPSConnection(url.hostname, url.port, timeout = timeout)
+
+    return http.client.HTTPConnection(url.hostname, url.port, timeout = timeout)
+
+def percentile(samples, p):
+    '''
+    Nearest-rank percentile of a list of samples, p in [0, 100]
+    '''
+
+    samples = sorted(samples)
+
+    if not samples:
+        return float('inf')
+
+    return samples[min(len(samples), max(1, math.ceil(p / 100 * len(samples)))) - 1]
+
+class EndpointProber:
+    '''
+    Measures TCP connect and HTTP round trip times to several base URLs of an exchange in parallel,
+    without subprocesses, and keeps a rolling window of the samples of each URL.
+    The clients use fastest() to send every request to the currently fastest base URL.
+    Failed probes are recorded as infinite times, so unreachable URLs are not selected.
+
+    Example
+    ----------------
+    prober = EndpointProber(BINANCE_ENDPOINTS, BINANCE_PING)\n
+    prober.start(interval = 10)\n
+    binance = Binance(apiKey, apiSecret, prober = prober)
+    '''
+
+    def __init__(self, urls, path = '/', window = 50, timeout = 2, metric = 'http', p = 50):
+        '''
+        Parameters
+        ----------------
+        (m)urls(list): Base URLs, e.g. BINANCE_ENDPOINTS\n
+        path(str): Cheap endpoint used for the HTTP round trip, e.g. BINANCE_PING\n
+        window(int): Number of samples kept per URL\n
+        timeout(float): Timeout of a probe in seconds\n
+        metric(str): 'http' or 'tcp', used by fastest()\n
+        p(float): Percentile used by fastest()
+        '''
+
+        self.urls = list(urls)
+        self.path = path
+        self.timeout = timeout
+        self.metric = metric
+        self.p = p
+        self.samples = {url: {'tcp': deque(maxlen = window), 'http': deque(maxlen = window)} for url in self.urls}
+        self.connections = {}
+        self.best = self.urls[0]
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers = len(self.urls))
+        self.stopEvent = threading.Event()
+        self.thread = None
+
+    def probe(self):
+        '''
+        Probes every URL once in parallel and updates the fastest URL.
+        '''
+
+        list(self.executor.map(self.probeURL, self.urls))
+
+        with self.lock:
+            self.best = min(self.urls, key = lambda url: percentile(self.samples[url][self.metric], self.p))
+
+        return self.best
+
+    def probeURL(self, url):
+        try:
+            tcp = tcpConnectTime(url, self.timeout)
+        except OSError:
+            tcp = float('inf')
+
+        try:
+            if url not in self.connections:
+                self.connections[url] = httpConnection(url, self.timeout)
+
+            rtt = httpRoundTrip(url, self.path, self.timeout, self.connections[url])
+        except (OSError, http.client.HTTPException):
+            self.connections.pop(url, None)
+            rtt = float('inf')
+
+        with self.lock:
+            self.samples[url]['tcp'].append(tcp)
+            self.samples[url]['http'].append(rtt)
+
+    def fastest(self):
+        '''
+        Base URL with the lowest percentile of the selected metric
+        '''
+
+        return self.best
+
+    def stats(self, p = (50, 90, 99)):
+        '''
+        {url: {'tcp': {50: ms, 90: ms, 99: ms}, 'http': {...}}}
+        '''
+
+        with self.lock:
+            return {url: {metric: {q: percentile(values, q) for q in p} for metric, values in samples.items()} for url, samples in self.samples.items()}
+
+    def start(self, interval = 10):
+        '''
+        Probes continuously in a background thread every interval seconds.
+        '''
+
+        def run():
+            while not self.stopEvent.is_set():
+                self.probe()
+                self.stopEvent.wait(interval)
+
+        self.stopEvent.clear()
+        self.thread = threading.Thread(target = run, daemon = True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopEvent.set()
+
+        if self.thread is not None:
+            self.thread.join()
@@ -0,0 +1,286 @@
+import math, time, threading, asyncio
+try:
+    from .response import loadResult
+except ImportError:
+    from response import loadResult
+
+# tolerance for float noise when a value is divided by a tick or step size
+EPSILON = 1e-9
+
+class OrderFilterError(ValueError):
+    '''
+    The order breaks a filter of the symbol and would be rejected by the exchange.
+    '''
+
+def decimals(size):
+    '''
+    Number of decimals of a tick or step size string, e.g. '0.00100000' -> 3
+    '''
+
+    size = size.rstrip('0')
+
+    return len(size) - size.index('.') - 1 if '.' in size else 0
+
+class SymbolFilters:
+    '''
+    Filters of one symbol, converted to floats once so an order is checked without parsing anything.
+    '''
+
+    def __init__(self, symbol):
+        '''
+        Parameters
+        ---------------
+        (m)symbol(dict): One element of the 'symbols' list of the exchangeInfo response
+        '''
+
+        filters = {f['filterType']: f for f in symbol.get('filters', [])}
+
+        self.symbol = symbol['symbol']
+        self.baseAsset = symbol.get('baseAsset')
+        self.quoteAsset = symbol.get('quoteAsset')
+        self.status = symbol.get('status', 'TRADING')
+        self.orderTypes = set(symbol.get('orderTypes', []))
+
+        priceFilter = filters.get('PRICE_FILTER', {})
+        self.minPrice = float(priceFilter.get('minPrice', 0))
+        self.maxPrice = float(priceFilter.get('maxPrice', 0))
+        self.tickSize = float(priceFilter.get('tickSize', 0))
+        self.priceDecimals = decimals(priceFilter.get('tickSize', '0.00000001'))
+
+        lotSize = filters.get('LOT_SIZE', {})
+        self.minQty = float(lotSize.get('minQty', 0))
+        self.maxQty = float(lotSize.get('maxQty', 0))
+        self.stepSize = float(lotSize.get('stepSize', 0))
+        self.qtyDecimals = decimals(lotSize.get('stepSize', '0.00000001'))
+
+        marketLotSize = filters.get('MARKET_LOT_SIZE', lotSize)
+        self.marketMinQty = float(marketLotSize.get('minQty', 0))
+        self.marketMaxQty = float(marketLotSize.get('maxQty', 0))
+
+        # MIN_NOTIONAL was replaced by NOTIONAL, both are read
+        notional = filters.get('NOTIONAL') or filters.get('MIN_NOTIONAL') or {}
+        self.minNotional = float(notional.get('minNotional', 0))
+        self.maxNotional = float(notional.get('maxNotional', 0))
+        self.notionalAppliesToMarket = notional.get('applyMinToMarket', notional.get('applyToMarket', False))
+
+    def roundPrice(self, price, up=False):
+        '''
+        Rounds the price to the tick size, down by default or up if up is True. Returns a string.
+        '''
+
+        price = float(price)
+
+        if self.tickSize:
+            units = math.ceil(price / self.tickSize - EPSILON) if up else math.floor(price / self.tickSize + EPSILON)
+            price = units * self.tickSize
+
+        return '{:.{}f}'.format(price, self.priceDecimals)
+
+    def roundQuantity(self, quantity):
+        '''
+        Rounds the quantity down to the step size. Returns a string.
+        '''
+
+        quantity = float(quantity)
+
+        if self.stepSize:
+            quantity = math.floor(quantity / self.stepSize + EPSILON) * self.stepSize
+
+        return '{:.{}f}'.format(quantity, self.qtyDecimals)
+
+    def checkPrice(self, price, name='price'):
+        price = float(price)
+
+        if self.minPrice and price < self.minPrice:
+            raise OrderFilterError('{} {} of {} is below minPrice {}'.format(name, price, self.symbol, self.minPrice))
+        if self.maxPrice and price > self.maxPrice:
+            raise OrderFilterError('{} {} of {} is above maxPrice {}'.format(name, price, self.symbol, self.maxPrice))
+
+    def checkQuantity(self, quantity, market=False):
+        quantity = float(quantity)
+        minQty, maxQty = (self.marketMinQty, self.marketMaxQty) if market else (self.minQty, self.maxQty)
+
+        if quantity <= 0 or quantity < minQty:
+            raise OrderFilterError('quantity {} of {} is below minQty {}'.format(quantity, self.symbol, minQty))
+        if maxQty and quantity > maxQty:
+            raise OrderFilterError('quantity {} of {} is above maxQty {}'.format(quantity, self.symbol, maxQty))
+
+    def checkNotional(self, notional):
+        if notional < self.minNotional:
+            raise OrderFilterError('notional {} of {} is below minNotional {}'.format(notional, self.symbol, self.minNotional))
+        if self.maxNotional and notional > self.maxNotional:
+            raise OrderFilterError('notional {} of {} is above maxNotional {}'.format(notional, self.symbol, self.maxNotional))
+
+    def prepareOrder(self, side, oType, quantity='', price='', stopPrice='', icebergQty=''):
+        '''
+        Rounds the order to the filters and checks it. Prices are rounded in favor of the order
+        (down for BUY, up for SELL) and quantities are rounded down.
+        Returns (quantity, price, stopPrice, icebergQty) as strings, '' for the values which are not sent.
+        Raises OrderFilterError if the rounded order would still be rejected.
+        '''
+
+        if self.status != 'TRADING':
+            raise OrderFilterError('{} is not trading, status is {}'.format(self.symbol, self.status))
+        if self.orderTypes and oType not in self.orderTypes:
+            raise OrderFilterError('{} orders are not allowed on {}'.format(oType, self.symbol))
+
+        up = side == 'SELL'
+        market = oType == 'MARKET'
+
+        if price != '':
+            price = self.roundPrice(price, up)
+            self.checkPrice(price)
+        if stopPrice != '':
+            stopPrice = self.roundPrice(stopPrice, up)
+            self.checkPrice(stopPrice, 'stopPrice')
+        if icebergQty != '':
+            icebergQty = self.roundQuantity(icebergQty)
+
+        if quantity != '':
+            quantity = self.roundQuantity(quantity)
+            self.checkQuantity(quantity, market)
+
+            if price != '' and not market:
+                self.checkNotional(float(price) * float(quantity))
+            elif stopPrice != '' and (not market or self.notionalAppliesToMarket):
+                self.checkNotional(float(stopPrice) * float(quantity))
+
+        return quantity, price, stopPrice, icebergQty
+
+class ExchangeInfo:
+    '''
+    Index of the Binance symbol filters built from Binance.exchangeInfo.
+    The index is loaded on first use and can be refreshed in a background thread with start().
+    Lookups never wait for a background refresh, the previous index is used until the new one is ready.
+
+    Downloads go through the Binance client, so they share its connection pool, endpoint prober and rate limiter.
+    Pass it to a client to round and check every order before it is sent, the client is then used for the downloads:\n
+    binance = Binance(apiKey, apiSecret, filters = ExchangeInfo())\n
+    The first download blocks. AsyncBinance cannot download from a blocking lookup, so await refreshAsync() before trading.
+    '''
+
+    def __init__(self, binance=None, symbols=None, missInterval=60):
+        '''
+        Parameters
+        ---------------
+        binance(Binance): Client of the downloads. Default is the client the ExchangeInfo is passed to\n
+        symbols(list): Only load these symbols, e.g. ['DOGETRY', 'BTCTRY']. Default is every symbol\n
+        missInterval(float): Seconds an unknown symbol is reported as unknown before a lookup downloads the index again
+        '''
+
+        self.binance = binance
+        self.symbols = symbols
+        self.missInterval = missInterval
+        self.index = {}
+        self.misses = {}
+        self.lock = threading.Lock()
+        self.refreshLock = threading.Lock()
+        self.stopEvent = threading.Event()
+        self.thread = None
+
+    def attach(self, binance):
+        '''
+        Uses binance for the downloads unless a client was already set. Called by the clients the ExchangeInfo is passed to.
+        '''
+
+        if self.binance is None:
+            self.binance = binance
+
+    def client(self):
+        if self.binance is None:
+            raise ValueError('ExchangeInfo has no Binance client, pass it to a client or send binance=')
+
+        return self.binance
+
+    def refresh(self):
+        '''
+        Downloads the exchange info and replaces the index. Concurrent refreshes are sent once.
+        '''
+
+        with self.refreshLock:
+            self.load(self.client().exchangeInfo(symbols = self.symbols))
+
+    async def refreshAsync(self):
+        '''
+        refresh() with an AsyncBinance client.
+        '''
+
+        self.load(await self.client().exchangeInfo(symbols = self.symbols))
+
+    def load(self, payload):
+        '''
+        Builds the index from an exchangeInfo response in any result type.
+        '''
+
+        payload = loadResult(payload)
+
+        if 'symbols' not in payload:
+            raise ValueError('not an exchangeInfo payload: {}'.format(str(payload)[:200]))
+
+        index = {symbol['symbol']: SymbolFilters(symbol) for symbol in payload['symbols']}
+
+        with self.lock:
+            self.index = index
+            self.misses = {}
+
+    def get(self, symbol):
+        '''
+        Returns the SymbolFilters of symbol. The index is downloaded if it is empty or the symbol is unknown,
+        at most once per missInterval seconds for the same unknown symbol.
+        '''
+
+        filters = self.index.get(symbol)
+
+        if filters is not None:
+            return filters
+
+        with self.refreshLock:
+            # another thread may have downloaded the index while this one was waiting
+            filters = self.index.get(symbol)
+            missed = self.misses.get(symbol)
+
+            if filters is None and (missed is None or time.monotonic() - missed >= self.missInterval):
+                binance = self.client()
+
+                # the functions of the asyncio clients return coroutines, which a blocking lookup cannot wait for
+                if asyncio.iscoroutinefunction(getattr(binance, 'fetch', None)):
+                    raise OrderFilterError('filters of {} are not loaded, await refreshAsync() first'.format(symbol))
+
+                self.load(binance.exchangeInfo(symbols = self.symbols))
+                filters = self.index.get(symbol)
+
+            if filters is None:
+                with self.lock:
+                    self.misses.setdefault(symbol, time.monotonic())
+
+        if filters is None:
+            raise OrderFilterError('{} is not listed on the exchange'.format(symbol))
+
+        return filters
+
+    def start(self, interval = 3600):
+        '''
+        Refreshes the index in a background thread every interval seconds.
+        '''
+
+        def run():
+            while not self.stopEvent.wait(interval):
+                try:
+                    self.refresh()
+                except Exception:
+                    # keep the previous index, try again at the next interval
+                    pass
+
+        if not self.index:
+            self.refresh()
+
+        self.stopEvent.clear()
+        self.thread = threading.Thread(target = run, daemon = True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopEvent.set()
+
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
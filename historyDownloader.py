@@ -0,0 +1,220 @@
+import time, threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+try:
+    from .response import loadResult
+    from .rateLimiter import BINANCE_WEIGHTS
+except ImportError:
+    from response import loadResult
+    from rateLimiter import BINANCE_WEIGHTS
+
+INTERVALS = {
+    '1s': 1000, '1m': 60000, '3m': 180000, '5m': 300000, '15m': 900000, '30m': 1800000,
+    '1h': 3600000, '2h': 7200000, '4h': 14400000, '6h': 21600000, '8h': 28800000, '12h': 43200000,
+    '1d': 86400000, '3d': 259200000, '1w': 604800000, '1M': 2678400000
+}
+
+# request weights of the paginated endpoints
+WEIGHTS = {
+    'klines': BINANCE_WEIGHTS[('GET', '/api/v3/klines')],
+    'aggregateTrades': BINANCE_WEIGHTS[('GET', '/api/v3/aggTrades')],
+    'historicalTrades': BINANCE_WEIGHTS[('GET', '/api/v3/historicalTrades')],
+    'trades': BINANCE_WEIGHTS[('GET', '/api/v3/trades')]
+}
+
+PAGE_LIMIT = 1000
+AGG_TRADES_WINDOW = 3600000
+
+# Binance error codes worth retrying: disconnected/unknown error, too many requests, timeout
+RETRY_CODES = (-1000, -1001, -1003, -1007)
+
+class HistoryDownloadError(Exception):
+    '''
+    Raised when a page request returns an error payload instead of rows, e.g. {"code": -1121, "msg": "Invalid symbol."}
+    '''
+
+    def __init__(self, payload):
+        self.code = payload.get('code') if isinstance(payload, dict) else None
+        self.msg = payload.get('msg') if isinstance(payload, dict) else None
+
+        super().__init__('page request failed: {}'.format(payload))
+
+class WeightPacer:
+    '''
+    Sliding one minute window of used request weight. acquire() blocks until the weight fits in the budget.
+    '''
+
+    def __init__(self, weightPerMinute):
+        self.weightPerMinute = weightPerMinute
+        self.used = deque()
+        self.usedWeight = 0
+        self.lock = threading.Lock()
+
+    def acquire(self, weight):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+
+                while self.used and self.used[0][0] <= now - 60:
+                    self.usedWeight -= self.used.popleft()[1]
+
+                if self.usedWeight + weight <= self.weightPerMinute or not self.used:
+                    self.used.append((now, weight))
+                    self.usedWeight += weight
+                    return
+
+                wait = self.used[0][0] + 60 - now
+
+            time.sleep(wait)
+
+class HistoryDownloader:
+    '''
+    Downloads long Binance histories by splitting them into pages which are fetched in parallel
+    within a request weight budget. Pages are stitched in order, overlapping rows are dropped and
+    the rows are yielded one by one, so only a few pages are kept in memory at a time.
+    '''
+
+    def __init__(self, binance, maxWorkers=8, weightPerMinute=1200, retries=3, retryDelay=1):
+        '''
+        Parameters
+        ---------------
+        (m)binance(Binance): Client used for the requests, shared by all workers\n
+        maxWorkers(int): Maximum number of pages requested at the same time\n
+        weightPerMinute(int): Request weight budget of the downloader. Keep it below the account limit so other requests still fit\n
+        retries(int): Retry count of a page which returned a rate limit or server error payload\n
+        retryDelay(float): First delay before retrying in seconds, doubled after every failed attempt
+        '''
+
+        self.binance = binance
+        self.maxWorkers = maxWorkers
+        self.pacer = WeightPacer(weightPerMinute)
+        self.retries = retries
+        self.retryDelay = retryDelay
+
+    def request(self, name, *args, **kwargs):
+        '''
+        Calls the client function name within the weight budget and returns its rows.
+        Error payloads are retried if they are transient, otherwise HistoryDownloadError is raised.
+        '''
+
+        delay = self.retryDelay
+
+        for attempt in range(self.retries + 1):
+            self.pacer.acquire(WEIGHTS[name])
+            rows = loadResult(getattr(self.binance, name)(*args, **kwargs))
+
+            if isinstance(rows, list):
+                return rows
+
+            if not isinstance(rows, dict) or rows.get('code') not in RETRY_CODES or attempt == self.retries:
+                raise HistoryDownloadError(rows)
+
+            time.sleep(delay)
+            delay *= 2
+
+    def klines(self, symbol, interval, startTime, endTime=None):
+        '''
+        Yields the klines of [startTime, endTime] in the format of Binance.klines, deduplicated by open time.
+
+        Parameters
+        ---------------
+        (m)symbol(str): BTCTRY\n
+        (m)interval(enum): '1m', '1h', ...\n
+        (m)startTime(int): Timestamp in ms\n
+        endTime(int): Timestamp in ms. Default is now
+        '''
+
+        if endTime is None:
+            endTime = int(time.time()*1000)
+
+        span = INTERVALS[interval] * PAGE_LIMIT
+        pages = ((start, min(start + span - 1, endTime)) for start in range(startTime, endTime + 1, span))
+
+        def fetch(page):
+            return self.request('klines', symbol, interval, page[0], page[1], PAGE_LIMIT)
+
+        return self.stitch(pages, fetch, lambda row: row[0])
+
+    def aggregateTrades(self, symbol, startTime, endTime=None):
+        '''
+        Yields the aggregate trades of [startTime, endTime] in the format of Binance.aggregateTrades, deduplicated by aggregate tradeId.
+        The range is split into 1 hour windows. Windows with more than 1000 trades are continued with fromId.
+
+        Parameters
+        ---------------
+        (m)symbol(str): BTCTRY\n
+        (m)startTime(int): Timestamp in ms\n
+        endTime(int): Timestamp in ms. Default is now
+        '''
+
+        if endTime is None:
+            endTime = int(time.time()*1000)
+
+        pages = ((start, min(start + AGG_TRADES_WINDOW - 1, endTime)) for start in range(startTime, endTime + 1, AGG_TRADES_WINDOW))
+
+        def fetch(page):
+            rows = self.request('aggregateTrades', symbol, startTime=page[0], endTime=page[1], limit=PAGE_LIMIT)
+            last = rows
+
+            while len(last) == PAGE_LIMIT and last[-1]['T'] <= page[1]:
+                last = self.request('aggregateTrades', symbol, fromId=last[-1]['a'] + 1, limit=PAGE_LIMIT)
+                rows += [row for row in last if row['T'] <= page[1]]
+
+            return rows
+
+        return self.stitch(pages, fetch, lambda row: row['a'])
+
+    def historicalTrades(self, symbol, fromId, toId=None):
+        '''
+        Yields the trades with ids in [fromId, toId] in the format of Binance.historicalTrades.
+        Trade ids are consecutive, so every page of 1000 ids can be requested in parallel.
+
+        Parameters
+        ---------------
+        (m)symbol(str): BTCTRY\n
+        (m)fromId(int): First tradeId, must be greater than 0\n
+        toId(int): Last tradeId. Default is the most recent trade
+        '''
+
+        if toId is None:
+            toId = self.request('trades', symbol, 1)[-1]['id']
+
+        pages = (start for start in range(fromId, toId + 1, PAGE_LIMIT))
+
+        def fetch(start):
+            rows = self.request('historicalTrades', symbol, PAGE_LIMIT, start)
+
+            return [row for row in rows if row['id'] <= toId]
+
+        return self.stitch(pages, fetch, lambda row: row['id'])
+
+    def stitch(self, pages, fetch, key):
+        '''
+        Fetches the pages with at most maxWorkers requests (and 2*maxWorkers finished pages) ahead
+        of the consumer and yields their rows in page order, skipping rows already yielded.
+        A page which failed with HistoryDownloadError ends the generator with that error.
+        '''
+
+        lastKey = None
+
+        with ThreadPoolExecutor(max_workers = self.maxWorkers) as executor:
+            futures = deque()
+            pages = iter(pages)
+
+            for page in pages:
+                futures.append(executor.submit(fetch, page))
+
+                if len(futures) >= 2 * self.maxWorkers:
+                    break
+
+            while futures:
+                rows = futures.popleft().result()
+
+                for page in pages:
+                    futures.append(executor.submit(fetch, page))
+                    break
+
+                for row in rows:
+                    if lastKey is None or key(row) > lastKey:
+                        lastKey = key(row)
+                        yield row
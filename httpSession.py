@@ -0,0 +1,91 @@
+import asyncio, requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+RETRY_STATUSES = [500, 502, 503, 504]
+RETRY_METHODS = ['GET', 'PUT', 'DELETE']
+
+def createSession(poolSize = 10, keepAlive = True, retries = 3, backoffFactor = 0.3):
+    '''
+    Creates a requests.Session with a persistent connection pool. Every endpoint method of a client shares it,
+    so the TCP/TLS handshake is only paid once per pooled connection.
+
+    Parameters
+    ---------------
+    poolSize(int): Maximum number of pooled connections per host\n
+    keepAlive(bool): Reuse connections between requests. If False every request is sent with 'Connection: close'\n
+    retries(int): Retry count for connection errors and 5xx responses. POST requests (orders) are never retried\n
+    backoffFactor(float): Sleep between retries is backoffFactor * (2 ** (retryNumber - 1)) seconds
+    '''
+
+    retry = Retry(
+        total = retries,
+        connect = retries,
+        read = retries,
+        status = retries,
+        backoff_factor = backoffFactor,
+        status_forcelist = RETRY_STATUSES,
+        allowed_methods = RETRY_METHODS,
+        raise_on_status = False
+    )
+
+    adapter = HTTPAdapter(pool_connections = poolSize, pool_maxsize = poolSize, max_retries = retry)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    if not keepAlive:
+        session.headers['Connection'] = 'close'
+
+    return session
+
+def createAsyncSession(poolSize = 100, keepAlive = True):
+    '''
+    Creates an aiohttp.ClientSession with a persistent connection pool for the asyncio clients.
+    The same session can be passed to several clients so they all share one pool.
+    Must be called while an event loop is running.
+
+    Parameters
+    ---------------
+    poolSize(int): Maximum number of simultaneous connections\n
+    keepAlive(bool): Reuse connections between requests
+    '''
+
+    if aiohttp is None:
+        raise ImportError('aiohttp is required for the asyncio clients')
+
+    connector = aiohttp.TCPConnector(limit = poolSize, force_close = not keepAlive)
+
+    return aiohttp.ClientSession(connector = connector)
+
+async def asyncRequest(session, requestType, url, retries = 3, backoffFactor = 0.3, timeout = None, **kwargs):
+    '''
+    Sends a request with the same retry/backoff policy as createSession().
+    Returns the response body as bytes, the status code and the response headers.
+    '''
+
+    if timeout:
+        kwargs['timeout'] = aiohttp.ClientTimeout(total = timeout)
+
+    retry = requestType in RETRY_METHODS
+    attempt = 0
+
+    while True:
+        try:
+            async with session.request(requestType, url, **kwargs) as response:
+                content = await response.read()
+
+                if not (retry and response.status in RETRY_STATUSES and attempt < retries):
+                    return content, response.status, response.headers
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if not (retry and attempt < retries):
+                raise
+
+        await asyncio.sleep(backoffFactor * (2 ** attempt))
+        attempt += 1
@@ -0,0 +1,178 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+def available():
+    '''
+    Names of the installed backends, fastest first.
+    '''
+
+    return [name for name, module in (('orjson', orjson), ('ujson', ujson), ('json', json)) if module is not None]
+
+def setBackend(name=None):
+    '''
+    Selects the JSON decoder of every client result, stream message and select() call.
+    'str' results are always encoded with the json module, so their text does not depend on the backend.
+
+    Parameters
+    ---------------
+    name(str): 'orjson', 'ujson' or 'json'. Default is the fastest installed one
+    '''
+
+    global backend, loads
+
+    installed = available()
+
+    if name is None:
+        name = installed[0]
+    elif name not in installed:
+        raise ValueError('JSON backend must be one of {}'.format(installed))
+
+    if name == 'orjson':
+        loads = orjson.loads
+    elif name == 'ujson':
+        loads = ujson.loads
+    else:
+        loads = json.loads
+
+    backend = name
+
+    return name
+
+backend = loads = None
+setBackend()
+
+# symbol fields of the list results, BtcTurk results are matched on 'BTC_TRY' and on 'BTCTRY' like QuoteFetcher does
+SYMBOL_KEYS = ('symbol',)
+BTCTURK_KEYS = ('pairNormalized', 'pair')
+
+def symbolKeys(key):
+    if key is None:
+        return None
+
+    return (key,) if isinstance(key, str) else tuple(key)
+
+def missingSymbols(symbols):
+    return KeyError('symbols not found in the result: {}'.format(symbols))
+
+def extract(content, symbols, keys):
+    '''
+    Decodes only the objects of symbols from a JSON array of flat objects (e.g. ticker24 or symbolOrderBookTicker of every symbol),
+    in the order of the payload. Returns None if the payload is not in the compact format of the exchanges,
+    then the caller decodes it fully. Raises KeyError with the symbols which are not in the payload.
+    '''
+
+    prefixes = [(key, b'"' + key.encode('utf-8') + b'":"') for key in keys]
+
+    if not any(prefix in content for key, prefix in prefixes):
+        return None
+
+    found = {}
+    missing = []
+
+    for symbol in symbols:
+        for key, prefix in prefixes:
+            start = content.find(prefix + symbol.encode('utf-8') + b'"')
+
+            if start >= 0:
+                break
+        else:
+            missing.append(symbol)
+            continue
+
+        begin = content.rfind(b'{', 0, start)
+        end = content.find(b'}', start)
+
+        # nested objects or arrays would make the slice invalid or ambiguous
+        if begin < 0 or end < 0 or b'[' in content[begin:end]:
+            return None
+
+        try:
+            item = loads(content[begin:end + 1])
+        except ValueError:
+            return None
+
+        if not isinstance(item, dict) or item.get(key) != symbol:
+            return None
+
+        # 'BTC_TRY' and 'BTCTRY' are the same object
+        found[begin] = item
+
+    if missing:
+        raise missingSymbols(missing)
+
+    return [found[begin] for begin in sorted(found)]
+
+def project(items, symbols=None, fields=None, keys=SYMBOL_KEYS):
+    '''
+    Keeps the items of symbols and the fields of every item. Raises KeyError with the symbols which are not in items.
+    '''
+
+    if symbols is not None:
+        wanted = set(symbols)
+        items = [item for item in items if any(item.get(key) in wanted for key in keys)]
+        found = {item.get(key) for item in items for key in keys}
+        missing = [symbol for symbol in symbols if symbol not in found]
+
+        if missing:
+            raise missingSymbols(missing)
+
+    if fields is not None:
+        items = [{field: item[field] for field in fields if field in item} for item in items]
+
+    return items
+
+def select(result, symbols=None, fields=None, key=None):
+    '''
+    Only the requested symbols and fields of a list result, e.g. Binance.ticker24() or BtcTurk.ticker() of every pair.
+
+    With resultType='raw' and symbols sent, only the objects of those symbols are decoded instead of the whole array.
+    Other payloads are decoded fully and then projected.
+
+    select(binance.ticker24(), ['BTCTRY', 'ETHTRY'], ['symbol', 'lastPrice'])\n
+    select(btcturk.ticker(), ['BTC_TRY'], ['pairNormalized', 'bid', 'ask'])
+
+    Parameters
+    ---------------
+    (m)result: Result of a client function in any result type\n
+    symbols(list): Symbols to keep. Default is every symbol. A symbol which is not in the result raises KeyError\n
+    fields(list): Fields to keep. Default is every field\n
+    key(str/list): Symbol field(s). Default is 'pairNormalized' ('BTC_TRY') or 'pair' ('BTCTRY') for BtcTurk ({"data": [...]}) results and 'symbol' for the others
+
+    Result
+    ---------------
+    [{field: value, ...}, ...] in the order of the result
+    '''
+
+    keys = symbolKeys(key)
+
+    if isinstance(result, str):
+        result = result.encode('utf-8')
+
+    if isinstance(result, (bytes, bytearray)):
+        result = bytes(result)
+
+        if symbols is not None:
+            items = extract(result, symbols, keys or (BTCTURK_KEYS if b'"pairNormalized":' in result else SYMBOL_KEYS))
+
+            if items is not None:
+                return project(items, None, fields)
+
+        result = loads(result)
+
+    if isinstance(result, dict):
+        if 'data' in result:
+            keys = keys or BTCTURK_KEYS
+            result = result['data']
+        else:
+            result = [result]
+
+    return project(result, symbols, fields, keys or SYMBOL_KEYS)
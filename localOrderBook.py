@@ -0,0 +1,215 @@
+import heapq
+from collections import deque
+try:
+    from .response import loadResult
+except ImportError:
+    from response import loadResult
+
+# diffs kept while no snapshot is loaded, 100 s of a 100 ms depth stream
+MAX_BUFFER = 1000
+
+class OrderBookOutOfSync(Exception):
+    '''
+    Raised when a depth diff does not continue the last applied update. The book must be synced from a new snapshot.
+    '''
+
+class BookSide:
+    '''
+    Price levels of one side: quantities in a dict keyed by price and the keys in a heap with the best level on top.
+    Asks use the price as key and bids use the negative price.
+    Quantity changes are O(1), new and removed levels O(log n), the best level is O(1).
+    Removed levels stay in the heap until they reach the top, the heap is rebuilt when it holds more stale keys than live ones.
+    '''
+
+    def __init__(self, isBid):
+        self.sign = -1 if isBid else 1
+        self.qtys = {}
+        self.heap = []
+
+    def update(self, price, qty):
+        key = float(price) * self.sign
+        qty = float(qty)
+
+        if qty:
+            if key not in self.qtys:
+                heapq.heappush(self.heap, key)
+
+            self.qtys[key] = qty
+        elif self.qtys.pop(key, None) is not None:
+            if len(self.heap) > 2 * len(self.qtys) + 64:
+                self.heap = list(self.qtys)
+                heapq.heapify(self.heap)
+            else:
+                # keeps a live level on top so best() does not have to skip removed ones
+                while self.heap and self.heap[0] not in self.qtys:
+                    heapq.heappop(self.heap)
+
+    def clear(self):
+        self.qtys = {}
+        self.heap = []
+
+    def best(self):
+        '''
+        [price, qty] of the best level or None if the side is empty
+        '''
+
+        if not self.heap:
+            return None
+
+        key = self.heap[0]
+
+        return [key * self.sign, self.qtys[key]]
+
+    def levels(self, depth=None):
+        '''
+        [[price, qty], ...] from the best level to the worst
+        '''
+
+        keys = sorted(self.qtys) if depth is None else heapq.nsmallest(depth, self.qtys)
+
+        return [[key * self.sign, self.qtys[key]] for key in keys]
+
+    def __len__(self):
+        return len(self.qtys)
+
+class LocalOrderBook:
+    '''
+    Local Binance order book maintained from a depth snapshot (Binance.orderBook) and the incremental
+    depth diffs of the <symbol>@depth stream, so the whole book is not downloaded on every refresh.
+
+    Diffs received before the snapshot are buffered, only the newest maxBuffer of them. If older ones were dropped
+    and the snapshot is older than the buffer, loading it raises OrderBookOutOfSync and a newer snapshot is needed. Diffs are applied according to the Binance rules:\n
+    -Diffs with u <= lastUpdateId of the snapshot are dropped.\n
+    -The first applied diff must contain lastUpdateId+1 (U <= lastUpdateId+1 <= u).\n
+    -Every following diff must start at the previous u+1, otherwise OrderBookOutOfSync is raised.
+
+    Diff
+    ---------------
+    {\n
+        "e": "depthUpdate",
+        "E": 123456789,     // Event time
+        "s": "BNBBTC",      // Symbol
+        "U": 157,           // First update ID in event
+        "u": 160,           // Final update ID in event
+        "b": [["0.0024", "10"]],  // Bids to be updated, quantity 0 removes the level
+        "a": [["0.0026", "100"]]  // Asks to be updated
+    }
+    '''
+
+    def __init__(self, symbol, snapshot=None, maxBuffer=MAX_BUFFER):
+        '''
+        Parameters
+        ---------------
+        (m)symbol(str): BTCTRY\n
+        snapshot(dict/str): Result of Binance.orderBook\n
+        maxBuffer(int): Maximum number of diffs buffered before the snapshot, the oldest ones are dropped
+        '''
+
+        self.symbol = symbol
+        self.bids = BookSide(isBid = True)
+        self.asks = BookSide(isBid = False)
+        self.lastUpdateId = None
+        self.synced = False
+        self.maxBuffer = maxBuffer
+        self.buffer = deque(maxlen = maxBuffer)
+        self.updateCount = 0
+
+        if snapshot is not None:
+            self.loadSnapshot(snapshot)
+
+    def sync(self, binance, limit=1000):
+        '''
+        Downloads a new snapshot with the Binance client and applies the buffered diffs.
+        '''
+
+        self.loadSnapshot(binance.orderBook(self.symbol, limit))
+
+    def loadSnapshot(self, snapshot):
+        snapshot = loadResult(snapshot)
+
+        self.bids.clear()
+        self.asks.clear()
+
+        for price, qty in snapshot['bids']:
+            self.bids.update(price, qty)
+        for price, qty in snapshot['asks']:
+            self.asks.update(price, qty)
+
+        self.lastUpdateId = snapshot['lastUpdateId']
+        self.synced = False
+
+        buffer, self.buffer = self.buffer, deque(maxlen = self.maxBuffer)
+
+        for event in buffer:
+            self.applyDiff(event)
+
+    def applyDiff(self, event):
+        '''
+        Applies one depth diff. Returns True if the diff changed the book.
+        '''
+
+        event = loadResult(event)
+
+        # combined stream payloads are wrapped as {"stream": ..., "data": ...}
+        if 'data' in event:
+            event = event['data']
+
+        if self.lastUpdateId is None:
+            self.buffer.append(event)
+            return False
+
+        if event['u'] <= self.lastUpdateId:
+            return False
+
+        if self.synced:
+            if event['U'] != self.lastUpdateId + 1:
+                self.synced = False
+                raise OrderBookOutOfSync('expected update {}, got {}'.format(self.lastUpdateId + 1, event['U']))
+        elif event['U'] > self.lastUpdateId + 1:
+            raise OrderBookOutOfSync('snapshot {} is older than update {}'.format(self.lastUpdateId, event['U']))
+
+        for price, qty in event['b']:
+            self.bids.update(price, qty)
+        for price, qty in event['a']:
+            self.asks.update(price, qty)
+
+        self.lastUpdateId = event['u']
+        self.synced = True
+        self.updateCount += 1
+
+        return True
+
+    def replay(self, path):
+        '''
+        Applies the diffs recorded in a file, one JSON event per line. Returns the number of applied diffs.
+        '''
+
+        applied = 0
+
+        with open(path) as f:
+            for line in f:
+                if line.strip() and self.applyDiff(line):
+                    applied += 1
+
+        return applied
+
+    def bestBid(self):
+        return self.bids.best()
+
+    def bestAsk(self):
+        return self.asks.best()
+
+    def spread(self):
+        bid, ask = self.bids.best(), self.asks.best()
+
+        if bid is None or ask is None:
+            return None
+
+        return ask[0] - bid[0]
+
+    def snapshot(self, depth=None):
+        '''
+        Current book in the format of Binance.orderBook with float values.
+        '''
+
+        return {'lastUpdateId': self.lastUpdateId, 'bids': self.bids.levels(depth), 'asks': self.asks.levels(depth)}
@@ -0,0 +1,252 @@
+try:
+    from .response import loadResult
+except ImportError:
+    from response import loadResult
+
+# decimals of the prices and quantities when the symbol precision is not known (Binance sends 8 decimals)
+DEFAULT_SCALE = 8
+
+def toFixed(value, scale=DEFAULT_SCALE):
+    '''
+    Converts a decimal string or number to an integer scaled by 10**scale, e.g. toFixed('4.00000200', 8) = 400000200.
+    Strings are converted exactly, digits beyond scale are truncated.
+    '''
+
+    if isinstance(value, str) and 'e' not in value and 'E' not in value:
+        whole, _, fraction = value.partition('.')
+
+        return int(whole + (fraction + '0' * scale)[:scale]) if scale else int(whole or '0')
+
+    return int(round(float(value) * 10 ** scale))
+
+def fromFixed(value, scale=DEFAULT_SCALE):
+    return value / 10 ** scale
+
+def defaultScales(symbol):
+    return DEFAULT_SCALE, DEFAULT_SCALE
+
+def btcturkScales(exchangeInfo):
+    '''
+    Returns a function giving (price decimals, quantity decimals) of a pair ('BTC_TRY' or 'BTCTRY') from the result of BtcTurk.exchangeInfo.
+    Unknown pairs use DEFAULT_SCALE.
+    '''
+
+    index = {}
+
+    for pair in loadResult(exchangeInfo)['data']['symbols']:
+        pairScales = (pair['denominatorScale'], pair['numeratorScale'])
+        index[pair['name']] = pairScales
+        index[pair['nameNormalized']] = pairScales
+
+    def scales(symbol):
+        return index.get(symbol, (DEFAULT_SCALE, DEFAULT_SCALE))
+
+    return scales
+
+class Quote:
+    '''
+    Best bid/ask of a symbol. Prices are integers scaled by 10**priceScale, quantities by 10**qtyScale (None if unknown).
+    '''
+
+    __slots__ = ('exchange', 'symbol', 'bid', 'ask', 'bidQty', 'askQty', 'time', 'priceScale', 'qtyScale')
+
+    def __init__(self, exchange, symbol, bid, ask, bidQty, askQty, time, priceScale, qtyScale):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.bid = bid
+        self.ask = ask
+        self.bidQty = bidQty
+        self.askQty = askQty
+        self.time = time
+        self.priceScale = priceScale
+        self.qtyScale = qtyScale
+
+    def spread(self):
+        return self.ask - self.bid
+
+    def toDict(self):
+        '''
+        The quote with float values, in the format of QuoteFetcher.
+        '''
+
+        return {
+            'exchange': self.exchange,
+            'symbol': self.symbol,
+            'bid': fromFixed(self.bid, self.priceScale),
+            'ask': fromFixed(self.ask, self.priceScale),
+            'bidQty': fromFixed(self.bidQty, self.qtyScale) if self.bidQty is not None else None,
+            'askQty': fromFixed(self.askQty, self.qtyScale) if self.askQty is not None else None,
+            'time': self.time,
+            'error': None
+        }
+
+    def __repr__(self):
+        return 'Quote({}, {}, bid={}, ask={})'.format(self.exchange, self.symbol, fromFixed(self.bid, self.priceScale), fromFixed(self.ask, self.priceScale))
+
+class Trade:
+    '''
+    One trade. isBuyerMaker is None if the exchange does not send it.
+    '''
+
+    __slots__ = ('exchange', 'symbol', 'id', 'price', 'qty', 'time', 'isBuyerMaker', 'priceScale', 'qtyScale')
+
+    def __init__(self, exchange, symbol, id, price, qty, time, isBuyerMaker, priceScale, qtyScale):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.id = id
+        self.price = price
+        self.qty = qty
+        self.time = time
+        self.isBuyerMaker = isBuyerMaker
+        self.priceScale = priceScale
+        self.qtyScale = qtyScale
+
+    def __repr__(self):
+        return 'Trade({}, {}, {}, price={}, qty={})'.format(self.exchange, self.symbol, self.id, fromFixed(self.price, self.priceScale), fromFixed(self.qty, self.qtyScale))
+
+class BookLevel:
+    '''
+    One price level of an order book side, the scales are the ones of the book.
+    '''
+
+    __slots__ = ('price', 'qty')
+
+    def __init__(self, price, qty):
+        self.price = price
+        self.qty = qty
+
+    def __repr__(self):
+        return 'BookLevel({}, {})'.format(self.price, self.qty)
+
+class Candle:
+    '''
+    One kline/OHLC candle. openTime is in ms.
+    '''
+
+    __slots__ = ('exchange', 'symbol', 'openTime', 'open', 'high', 'low', 'close', 'volume', 'priceScale', 'qtyScale')
+
+    def __init__(self, exchange, symbol, openTime, open, high, low, close, volume, priceScale, qtyScale):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.openTime = openTime
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.priceScale = priceScale
+        self.qtyScale = qtyScale
+
+    def __repr__(self):
+        return 'Candle({}, {}, {}, close={})'.format(self.exchange, self.symbol, self.openTime, fromFixed(self.close, self.priceScale))
+
+def binanceQuotes(payload, scales=defaultScales, time=None):
+    '''
+    Quotes from the result of Binance.symbolOrderBookTicker (one symbol or every symbol).
+    '''
+
+    payload = loadResult(payload)
+
+    if isinstance(payload, dict):
+        payload = [payload]
+
+    quotes = []
+
+    for ticker in payload:
+        priceScale, qtyScale = scales(ticker['symbol'])
+        quotes.append(Quote('binance', ticker['symbol'], toFixed(ticker['bidPrice'], priceScale), toFixed(ticker['askPrice'], priceScale),
+            toFixed(ticker['bidQty'], qtyScale), toFixed(ticker['askQty'], qtyScale), time, priceScale, qtyScale))
+
+    return quotes
+
+def binanceTrades(payload, symbol, scales=defaultScales):
+    '''
+    Trades from the result of Binance.trades or Binance.historicalTrades.
+    '''
+
+    priceScale, qtyScale = scales(symbol)
+
+    return [Trade('binance', symbol, t['id'], toFixed(t['price'], priceScale), toFixed(t['qty'], qtyScale), t['time'], t['isBuyerMaker'], priceScale, qtyScale) for t in loadResult(payload)]
+
+def binanceLevels(payload, symbol, scales=defaultScales):
+    '''
+    (bids, asks) lists of BookLevel from the result of Binance.orderBook, best level first.
+    '''
+
+    payload = loadResult(payload)
+    priceScale, qtyScale = scales(symbol)
+
+    bids = [BookLevel(toFixed(price, priceScale), toFixed(qty, qtyScale)) for price, qty in payload['bids']]
+    asks = [BookLevel(toFixed(price, priceScale), toFixed(qty, qtyScale)) for price, qty in payload['asks']]
+
+    return bids, asks
+
+def binanceCandles(payload, symbol, scales=defaultScales):
+    '''
+    Candles from the result of Binance.klines.
+    '''
+
+    priceScale, qtyScale = scales(symbol)
+
+    return [Candle('binance', symbol, k[0], toFixed(k[1], priceScale), toFixed(k[2], priceScale), toFixed(k[3], priceScale), toFixed(k[4], priceScale),
+        toFixed(k[5], qtyScale), priceScale, qtyScale) for k in loadResult(payload)]
+
+def btcturkQuotes(payload, scales=defaultScales):
+    '''
+    Quotes from the result of BtcTurk.ticker. The symbol is the pairNormalized, e.g. 'BTC_TRY'.
+    '''
+
+    quotes = []
+
+    for ticker in loadResult(payload)['data']:
+        priceScale, qtyScale = scales(ticker['pairNormalized'])
+        quotes.append(Quote('btcturk', ticker['pairNormalized'], toFixed(ticker['bid'], priceScale), toFixed(ticker['ask'], priceScale),
+            None, None, ticker['timestamp'], priceScale, qtyScale))
+
+    return quotes
+
+def btcturkTrades(payload, scales=defaultScales):
+    '''
+    Trades from the result of BtcTurk.trades. side is the side of the taker, so a 'sell' trade hit a resting buy order.
+    '''
+
+    trades = []
+
+    for t in loadResult(payload)['data']:
+        priceScale, qtyScale = scales(t['pairNormalized'])
+        trades.append(Trade('btcturk', t['pairNormalized'], t['tid'], toFixed(t['price'], priceScale), toFixed(t['amount'], qtyScale), t['date'], t['side'] == 'sell' if 'side' in t else None, priceScale, qtyScale))
+
+    return trades
+
+def btcturkLevels(payload, symbol, scales=defaultScales):
+    '''
+    (bids, asks) lists of BookLevel from the result of BtcTurk.orderBook, best level first.
+    '''
+
+    data = loadResult(payload)['data']
+    priceScale, qtyScale = scales(symbol)
+
+    bids = [BookLevel(toFixed(price, priceScale), toFixed(qty, qtyScale)) for price, qty in data['bids']]
+    asks = [BookLevel(toFixed(price, priceScale), toFixed(qty, qtyScale)) for price, qty in data['asks']]
+
+    return bids, asks
+
+def btcturkCandles(payload, symbol, scales=defaultScales):
+    '''
+    Candles from the result of BtcTurk.ohclData (row or column oriented). The time of the candles is converted from seconds to ms.
+    '''
+
+    payload = loadResult(payload)
+    priceScale, qtyScale = scales(symbol)
+
+    if isinstance(payload, dict) and 'data' in payload:
+        payload = payload['data']
+
+    if isinstance(payload, dict):
+        rows = zip(payload['t'], payload['o'], payload['h'], payload['l'], payload['c'], payload['v'])
+    else:
+        timeKey = 'time' if payload and 'time' in payload[0] else 'timestamp'
+        rows = ((c[timeKey], c['open'], c['high'], c['low'], c['close'], c['volume']) for c in payload)
+
+    return [Candle('btcturk', symbol, int(t) * 1000, toFixed(o, priceScale), toFixed(h, priceScale), toFixed(l, priceScale),
+        toFixed(c, priceScale), toFixed(v, qtyScale), priceScale, qtyScale) for t, o, h, l, c, v in rows]
@@ -0,0 +1,126 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+try:
+    from .response import loadResult
+except ImportError:
+    from response import loadResult
+
+# client functions an intent can call on each exchange
+ACTIONS = {
+    'binance': ('newOrder', 'cancelOrder', 'newOCO', 'cancelOCO', 'cancelAllOrdersOfSymbol'),
+    'btcturk': ('submitOrder', 'cancelOrder')
+}
+
+def orderIntent(exchange, action, **params):
+    '''
+    Creates an order intent, e.g.\n
+    orderIntent('binance', 'newOrder', symbol='BTCTRY', side='BUY', oType='LIMIT', timeInForce='GTC', quantity=0.01, price=500000)\n
+    orderIntent('btcturk', 'cancelOrder', orderID=123)
+
+    Parameters
+    ---------------
+    (m)exchange(str): 'binance' or 'btcturk'\n
+    (m)action(str): Name of the client function, see ACTIONS\n
+    params: Arguments of the client function
+    '''
+
+    if exchange not in ACTIONS:
+        raise ValueError('exchange must be one of {}'.format(list(ACTIONS)))
+    if action not in ACTIONS[exchange]:
+        raise ValueError('action of {} must be one of {}'.format(exchange, ACTIONS[exchange]))
+
+    return {'exchange': exchange, 'action': action, 'params': params}
+
+def responseError(exchange, result):
+    '''
+    Error message of an exchange response, None if the request succeeded.
+    '''
+
+    if exchange == 'binance':
+        if isinstance(result, dict) and 'code' in result and 'msg' in result and result['code'] < 0:
+            return '{}: {}'.format(result['code'], result['msg'])
+    elif isinstance(result, dict) and result.get('success') is False:
+        return '{}: {}'.format(result.get('code'), result.get('message'))
+
+    return None
+
+class OrderBatch:
+    '''
+    Submits and cancels many orders on Binance and BtcTurk concurrently.
+    Every intent is sent by a worker thread, at most maxWorkers at a time. The rate limits are kept by the
+    clients: create them with rateLimiter = binanceRateLimiter() / btcturkRateLimiter() and the orders are
+    paced within the budget, ahead of any market data request.
+
+    Results
+    ---------------
+    {\n
+        "exchange": "binance",
+        "action": "newOrder",
+        "params": {...},        // Arguments of the intent
+        "result": {...},        // Parsed response, None if the request failed
+        "error": None,          // Error message of the exchange or the exception
+        "sent": 1499865549590,  // Time the request was sent in ms
+        "latency": 23.4         // Round trip in ms, including the time waited for the rate limiter
+    }
+    '''
+
+    def __init__(self, binance=None, btcturk=None, maxWorkers=20):
+        '''
+        Parameters
+        ---------------
+        binance(Binance): Client of the Binance intents\n
+        btcturk(BtcTurk): Client of the BtcTurk intents\n
+        maxWorkers(int): Maximum number of requests in flight
+        '''
+
+        self.clients = {'binance': binance, 'btcturk': btcturk}
+        self.executor = ThreadPoolExecutor(max_workers = maxWorkers)
+
+    def execute(self, intents):
+        '''
+        Sends every intent at once and returns the results in the order of the intents.
+        A failed intent does not stop the others, check the error of every result.
+        '''
+
+        for intent in intents:
+            if self.clients.get(intent['exchange']) is None:
+                raise ValueError('no client for {}'.format(intent['exchange']))
+
+        futures = [self.executor.submit(self.send, intent) for intent in intents]
+
+        return [future.result() for future in futures]
+
+    def requote(self, cancels, orders):
+        '''
+        Cancels the old orders and sends the new ones, each group concurrently.
+        Returns (cancel results, order results).
+        '''
+
+        return self.execute(cancels), self.execute(orders)
+
+    def send(self, intent):
+        client = self.clients[intent['exchange']]
+        function = getattr(client, intent['action'])
+        result = {'exchange': intent['exchange'], 'action': intent['action'], 'params': intent['params'], 'result': None, 'error': None}
+
+        result['sent'] = int(time.time()*1000)
+        start = time.perf_counter()
+
+        try:
+            result['result'] = loadResult(function(**intent['params']))
+            result['error'] = responseError(intent['exchange'], result['result'])
+        except Exception as e:
+            result['error'] = repr(e)
+
+        result['latency'] = (time.perf_counter() - start) * 1000
+
+        return result
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
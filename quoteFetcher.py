@@ -0,0 +1,133 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+try:
+    from .response import loadResult
+except ImportError:
+    from response import loadResult
+
+class QuoteFetcher:
+    '''
+    Fetches the best bid/ask of many symbols from Binance and BtcTurk at once.
+
+    If at least bulkThreshold symbols are requested from an exchange, the all-symbols endpoint is called once
+    (Binance bookTicker without symbol, BtcTurk ticker without pairSymbol) and the requested symbols are picked from it.
+    Otherwise every symbol is requested separately with at most maxWorkers requests in flight.
+    The clients are thread-safe, so one client is shared by all workers.
+
+    Quotes
+    ---------------
+    {\n
+        "exchange": "binance",
+        "symbol": "BTCTRY",
+        "bid": 100.5,
+        "ask": 100.6,
+        "bidQty": 0.2,      // None for BtcTurk
+        "askQty": 0.1,      // None for BtcTurk
+        "time": 1499865549590,
+        "error": None       // Error message if the quote could not be fetched
+    }
+    '''
+
+    def __init__(self, binance=None, btcturk=None, maxWorkers=16, bulkThreshold=5):
+        '''
+        Parameters
+        ---------------
+        binance(Binance): Client used for Binance symbols, e.g. 'BTCTRY'\n
+        btcturk(BtcTurk): Client used for BtcTurk symbols, e.g. 'BTC_TRY'\n
+        maxWorkers(int): Maximum number of requests in flight\n
+        bulkThreshold(int): Minimum symbol count to use the all-symbols endpoint of an exchange
+        '''
+
+        self.binance = binance
+        self.btcturk = btcturk
+        self.bulkThreshold = bulkThreshold
+        self.executor = ThreadPoolExecutor(max_workers = maxWorkers)
+
+    def fetch(self, binanceSymbols=[], btcturkSymbols=[], timeout=None):
+        '''
+        Generator that yields the quotes in the order they arrive.
+        '''
+
+        futures = []
+
+        if binanceSymbols:
+            futures += self.submit(self.binanceQuotes, binanceSymbols, 'binance', timeout)
+        if btcturkSymbols:
+            futures += self.submit(self.btcturkQuotes, btcturkSymbols, 'btcturk', timeout)
+
+        for future in as_completed(futures):
+            for quote in future.result():
+                yield quote
+
+    def fetchAll(self, binanceSymbols=[], btcturkSymbols=[], timeout=None):
+        '''
+        Waits for all quotes and returns them in a dict keyed by (exchange, symbol).
+        '''
+
+        return {(quote['exchange'], quote['symbol']): quote for quote in self.fetch(binanceSymbols, btcturkSymbols, timeout)}
+
+    def close(self):
+        self.executor.shutdown()
+
+    def submit(self, function, symbols, exchange, timeout):
+        if len(symbols) >= self.bulkThreshold:
+            return [self.executor.submit(self.collect, function, symbols, exchange, '', timeout)]
+
+        return [self.executor.submit(self.collect, function, [symbol], exchange, symbol, timeout) for symbol in symbols]
+
+    def collect(self, function, symbols, exchange, symbol, timeout):
+        try:
+            quotes = function(symbol, timeout)
+        except Exception as e:
+            return [self.errorQuote(exchange, s, repr(e)) for s in symbols]
+
+        return [quotes[s] if s in quotes else self.errorQuote(exchange, s, 'symbol not found') for s in symbols]
+
+    def binanceQuotes(self, symbol, timeout):
+        result = loadResult(self.binance.symbolOrderBookTicker(symbol, timeout=timeout))
+        now = int(time.time()*1000)
+
+        if isinstance(result, dict):
+            result = [result]
+
+        quotes = {}
+
+        for ticker in result:
+            quotes[ticker['symbol']] = {
+                'exchange': 'binance',
+                'symbol': ticker['symbol'],
+                'bid': float(ticker['bidPrice']),
+                'ask': float(ticker['askPrice']),
+                'bidQty': float(ticker['bidQty']),
+                'askQty': float(ticker['askQty']),
+                'time': now,
+                'error': None
+            }
+
+        return quotes
+
+    def btcturkQuotes(self, symbol, timeout):
+        result = loadResult(self.btcturk.ticker(symbol, timeout=timeout))['data']
+
+        quotes = {}
+
+        for ticker in result:
+            quote = {
+                'exchange': 'btcturk',
+                'symbol': ticker['pairNormalized'],
+                'bid': float(ticker['bid']),
+                'ask': float(ticker['ask']),
+                'bidQty': None,
+                'askQty': None,
+                'time': ticker['timestamp'],
+                'error': None
+            }
+
+            # both 'BTC_TRY' and 'BTCTRY' can be requested
+            quotes[ticker['pairNormalized']] = quote
+            quotes[ticker['pair']] = quote
+
+        return quotes
+
+    def errorQuote(self, exchange, symbol, error):
+        return {'exchange': exchange, 'symbol': symbol, 'bid': None, 'ask': None, 'bidQty': None, 'askQty': None, 'time': int(time.time()*1000), 'error': error}
@@ -0,0 +1,326 @@
+import time, heapq, itertools, threading, asyncio
+from urllib.parse import urlparse, parse_qs
+
+ORDER_PRIORITY = 0
+DEFAULT_PRIORITY = 1
+
+def depthWeight(params):
+    limit = int(params.get('limit', 100))
+
+    if limit <= 100:
+        return 5
+    if limit <= 500:
+        return 25
+    if limit <= 1000:
+        return 50
+
+    return 250
+
+def allSymbolsWeight(single, allSymbols):
+    return lambda params: single if 'symbol' in params else allSymbols
+
+# request weight of every Binance endpoint, keyed by (requestType, path)
+BINANCE_WEIGHTS = {
+    ('GET', '/api/v3/depth'): depthWeight,                              # orderBook
+    ('GET', '/api/v3/trades'): 25,                                      # trades
+    ('GET', '/api/v3/historicalTrades'): 25,                            # historicalTrades
+    ('GET', '/api/v3/aggTrades'): 4,                                    # aggregateTrades
+    ('GET', '/api/v3/klines'): 2,                                       # klines
+    ('GET', '/api/v3/avgPrice'): 2,                                     # avgPrice
+    ('GET', '/api/v3/ticker/24hr'): allSymbolsWeight(2, 80),            # ticker24
+    ('GET', '/api/v3/ticker/price'): allSymbolsWeight(2, 4),            # symbolPriceTicker
+    ('GET', '/api/v3/ticker/bookTicker'): allSymbolsWeight(2, 4),       # symbolOrderBookTicker
+    ('GET', '/api/v3/exchangeInfo'): 20,                                # exchangeInfo
+    ('GET', '/api/v3/time'): 1,                                         # serverTime
+    ('POST', '/api/v3/order'): 1,                                       # newOrder
+    ('GET', '/api/v3/order'): 4,                                        # queryOrder
+    ('DELETE', '/api/v3/order'): 1,                                     # cancelOrder
+    ('DELETE', '/api/v3/openOrders'): 1,                                # cancelAllOrdersOfSymbol
+    ('GET', '/api/v3/openOrders'): allSymbolsWeight(6, 80),             # openOrders
+    ('GET', '/api/v3/allOrders'): 20,                                   # allOrders
+    ('POST', '/api/v3/order/oco'): 1,                                   # newOCO
+    ('DELETE', '/api/v3/orderList'): 1,                                 # cancelOCO
+    ('GET', '/api/v3/account'): 20,                                     # accountInfo
+    ('POST', '/api/v3/userDataStream'): 2,                              # createListenKey
+    ('PUT', '/api/v3/userDataStream'): 2,                               # keepAliveListenKey
+    ('DELETE', '/api/v3/userDataStream'): 2,                            # closeListenKey
+}
+
+# orders counted against the order rate limit
+BINANCE_ORDERS = {('POST', '/api/v3/order'): 1, ('POST', '/api/v3/order/oco'): 2}
+
+BINANCE_DEFAULT_WEIGHT = 1
+
+# BtcTurk limits per endpoint group: (request count, period in seconds). Adjust to the limits of your account.
+BTCTURK_LIMITS = {
+    'public': (100, 10),
+    'private': (90, 60),
+    'orders': (60, 60)
+}
+
+class TokenBucket:
+    '''
+    capacity tokens refilled evenly over period seconds.
+    '''
+
+    def __init__(self, capacity, period):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blockedUntil = 0
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait(self, amount, now):
+        '''
+        Seconds until amount tokens are available, 0 if they are available now
+        '''
+
+        self.refill(now)
+
+        if now < self.blockedUntil:
+            return self.blockedUntil - now
+
+        # requests heavier than the whole bucket are let through when it is full
+        amount = min(amount, self.capacity)
+
+        if self.tokens >= amount:
+            return 0
+
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount):
+        self.tokens -= min(amount, self.capacity)
+
+    def sync(self, used, now):
+        '''
+        Lowers the available tokens to the usage reported by the server.
+        '''
+
+        self.refill(now)
+        self.tokens = min(self.tokens, self.capacity - used)
+
+class RateLimiter:
+    '''
+    Client-side request scheduler. Every request waits until all the token buckets it counts against
+    have enough tokens. Waiting requests are served strictly by priority (orders first, then everything else)
+    and in arrival order within the same priority, so market data polling never delays an order.
+
+    Use binanceRateLimiter() or btcturkRateLimiter() and pass the result to the client:\n
+    binance = Binance(apiKey, apiSecret, rateLimiter = binanceRateLimiter())
+    '''
+
+    def __init__(self, buckets, cost, headerSync=None):
+        '''
+        Parameters
+        ---------------
+        (m)buckets(dict): Bucket name -> TokenBucket\n
+        (m)cost(function): (requestType, path, params) -> (priority, {bucket name: amount})\n
+        headerSync(function): (limiter, headers, now) -> None, syncs the buckets with the usage reported in the response headers
+        '''
+
+        self.buckets = buckets
+        self.cost = cost
+        self.headerSync = headerSync
+        self.condition = threading.Condition()
+        self.waiting = []
+        self.asyncWaiters = []
+        self.counter = itertools.count()
+        self.throttled = 0
+
+    def acquire(self, requestType, urlMethod, data=''):
+        '''
+        Blocks until the request can be sent.
+        '''
+
+        priority, amounts = self.requestCost(requestType, urlMethod, data)
+        ticket = (priority, next(self.counter))
+
+        with self.condition:
+            heapq.heappush(self.waiting, ticket)
+
+            try:
+                while True:
+                    if self.waiting[0] == ticket:
+                        wait = self.take(amounts)
+
+                        if not wait:
+                            return
+
+                        self.condition.wait(wait)
+                    else:
+                        self.condition.wait()
+            finally:
+                # e.g. KeyboardInterrupt while waiting, the ticket must not block the queue
+                self.leave(ticket)
+
+    async def acquireAsync(self, requestType, urlMethod, data=''):
+        '''
+        acquire() for the asyncio clients. Waits on an asyncio.Event in the same queue as the threads,
+        so orders of the async clients also go before their market data, and no executor thread is held while waiting.
+        '''
+
+        priority, amounts = self.requestCost(requestType, urlMethod, data)
+        ticket = (priority, next(self.counter))
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+
+        with self.condition:
+            heapq.heappush(self.waiting, ticket)
+            self.asyncWaiters.append(waiter)
+
+        try:
+            while True:
+                wait = None
+
+                with self.condition:
+                    if self.waiting[0] == ticket:
+                        wait = self.take(amounts)
+
+                        if not wait:
+                            return
+
+                    # cleared under the lock, so a wake up sent after this check is not lost
+                    waiter[1].clear()
+
+                try:
+                    await asyncio.wait_for(waiter[1].wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self.condition:
+                self.asyncWaiters.remove(waiter)
+
+                # a cancelled waiter must not block the queue
+                self.leave(ticket)
+
+    def take(self, amounts):
+        '''
+        Called with the lock held by the first waiter. Consumes the tokens and leaves the queue if they are available,
+        otherwise returns the seconds to wait.
+        '''
+
+        now = time.monotonic()
+        wait = max([self.buckets[name].wait(amount, now) for name, amount in amounts.items()] or [0])
+
+        if wait:
+            self.throttled += 1
+            return wait
+
+        for name, amount in amounts.items():
+            self.buckets[name].consume(amount)
+
+        heapq.heappop(self.waiting)
+        self.notifyWaiters()
+
+        return 0
+
+    def leave(self, ticket):
+        '''
+        Called with the lock held. Removes the ticket of a waiter which stopped waiting before it got its tokens.
+        '''
+
+        if ticket in self.waiting:
+            self.waiting.remove(ticket)
+            heapq.heapify(self.waiting)
+            self.notifyWaiters()
+
+    def notifyWaiters(self):
+        self.condition.notify_all()
+
+        for loop, event in self.asyncWaiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # the loop of the waiter is closed
+                pass
+
+    def update(self, status, headers):
+        '''
+        Syncs the buckets with the response. 429 and 418 responses block every bucket for Retry-After seconds.
+        '''
+
+        now = time.monotonic()
+
+        with self.condition:
+            if status in (418, 429):
+                retryAfter = float(headers.get('Retry-After') or 60)
+
+                for bucket in self.buckets.values():
+                    bucket.blockedUntil = max(bucket.blockedUntil, now + retryAfter)
+
+            if self.headerSync is not None:
+                self.headerSync(self, headers, now)
+
+            self.notifyWaiters()
+
+    def requestCost(self, requestType, urlMethod, data):
+        url = urlparse(urlMethod)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        if isinstance(data, str):
+            params.update({key: values[0] for key, values in parse_qs(data).items()})
+        elif isinstance(data, dict):
+            params.update(data)
+
+        return self.cost(requestType, url.path, params)
+
+def binanceCost(requestType, path, params):
+    key = (requestType, path)
+    weight = BINANCE_WEIGHTS.get(key, BINANCE_DEFAULT_WEIGHT)
+
+    if callable(weight):
+        weight = weight(params)
+
+    amounts = {'weight': weight}
+
+    if key in BINANCE_ORDERS:
+        amounts['orders'] = BINANCE_ORDERS[key]
+
+    priority = ORDER_PRIORITY if requestType in ('POST', 'DELETE') else DEFAULT_PRIORITY
+
+    return priority, amounts
+
+def binanceHeaderSync(limiter, headers, now):
+    # response headers of requests and aiohttp are case-insensitive
+    used = headers.get('X-MBX-USED-WEIGHT-1M')
+
+    if used:
+        limiter.buckets['weight'].sync(int(used), now)
+
+    orders = headers.get('X-MBX-ORDER-COUNT-10S')
+
+    if orders:
+        limiter.buckets['orders'].sync(int(orders), now)
+
+def binanceRateLimiter(weightPerMinute=6000, ordersPer10s=100, safety=0.9):
+    '''
+    RateLimiter with the Binance REQUEST_WEIGHT and ORDERS limits.
+    safety is the share of the limits the client may use, leaving room for clock and header delays.
+    '''
+
+    buckets = {
+        'weight': TokenBucket(int(weightPerMinute * safety), 60),
+        'orders': TokenBucket(int(ordersPer10s * safety), 10)
+    }
+
+    return RateLimiter(buckets, binanceCost, binanceHeaderSync)
+
+def btcturkCost(requestType, path, params):
+    if path.startswith('/api/v1/order') and requestType in ('POST', 'DELETE'):
+        return ORDER_PRIORITY, {'orders': 1, 'private': 1}
+    if path.startswith('/api/v1/'):
+        return DEFAULT_PRIORITY, {'private': 1}
+
+    return DEFAULT_PRIORITY, {'public': 1}
+
+def btcturkRateLimiter(limits=BTCTURK_LIMITS, safety=0.9):
+    '''
+    RateLimiter with the BtcTurk limits of each endpoint group (public market data, private, orders).
+    '''
+
+    buckets = {name: TokenBucket(max(1, int(count * safety)), period) for name, (count, period) in limits.items()}
+
+    return RateLimiter(buckets, btcturkCost)
@@ -0,0 +1,39 @@
+import json
+try:
+    from . import jsonBackend
+except ImportError:
+    import jsonBackend
+
+RESULT_TYPES = ['str', 'dict', 'raw']
+
+def formatResult(content, resultType = 'str'):
+    '''
+    Converts the response body to the result type of the client. The body is decoded with the JSON backend selected in jsonBackend.
+
+    Parameters
+    ---------------
+    (m)content(bytes): Response body\n
+    resultType(str): 'str' (indented JSON string, default), 'dict' (parsed dict/list) or 'raw' (response body as bytes)
+    '''
+
+    if resultType == 'raw':
+        return content
+
+    result = jsonBackend.loads(content)
+
+    if resultType == 'dict':
+        return result
+
+    # the json module keeps the text of 'str' results the same whatever the backend is (escaping, float format)
+    return json.dumps(result, indent=2)
+
+def loadResult(result):
+    '''
+    Returns the parsed result of a client function whatever the result type of the client is.
+    Parsed results are returned as they are, so they are not decoded twice.
+    '''
+
+    if isinstance(result, (str, bytes, bytearray)):
+        return jsonBackend.loads(result)
+
+    return result
@@ -0,0 +1,210 @@
+import time, threading, asyncio
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+# seconds a response of a public market data endpoint is reused, keyed by path
+DEFAULT_TTLS = {
+    '/api/v3/avgPrice': 1.0,                # Binance.avgPrice
+    '/api/v3/ticker/price': 1.0,            # Binance.symbolPriceTicker
+    '/api/v3/ticker/bookTicker': 0.5,       # Binance.symbolOrderBookTicker
+    '/api/v3/ticker/24hr': 5.0,             # Binance.ticker24
+    '/api/v3/depth': 0.5,                   # Binance.orderBook
+    '/api/v3/trades': 1.0,                  # Binance.trades
+    '/api/v3/klines': 5.0,                  # Binance.klines
+    '/api/v2/ticker': 1.0,                  # BtcTurk.ticker
+    '/api/v2/ticker/currency': 1.0,         # BtcTurk.ticker(currency=...)
+    '/api/v2/orderbook': 0.5,               # BtcTurk.orderBook
+    '/api/v2/trades': 1.0,                  # BtcTurk.trades
+}
+
+class InFlight:
+    def __init__(self):
+        self.event = threading.Event()
+        self.future = None
+        self.value = None
+        self.error = None
+        # set when the leader was cancelled or interrupted, the waiters then send the request themselves
+        self.cancelled = False
+
+class ResponseCache:
+    '''
+    TTL cache with LRU eviction for the responses of public market data endpoints.
+    Identical requests sent at the same time are coalesced: only the first one is sent and
+    the others wait for its response. Only endpoints with a TTL are cached, signed requests never are.
+
+    Pass it to a client to enable it:\n
+    binance = Binance(apiKey, apiSecret, cache = ResponseCache())
+    '''
+
+    def __init__(self, ttls=DEFAULT_TTLS, maxSize=1024):
+        '''
+        Parameters
+        ---------------
+        ttls(dict): Path -> seconds a response is reused, e.g. {'/api/v3/avgPrice': 1.0}\n
+        maxSize(int): Maximum number of cached responses. The least recently used one is evicted first
+        '''
+
+        self.ttls = dict(ttls)
+        self.maxSize = maxSize
+        self.entries = OrderedDict()
+        self.inFlight = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def ttl(self, urlMethod):
+        return self.ttls.get(urlparse(urlMethod).path)
+
+    def lookup(self, key):
+        '''
+        Returns (cached value or None, InFlight to wait for or None, True if the caller has to fetch).
+        Must be called with the lock held.
+        '''
+
+        entry = self.entries.get(key)
+
+        if entry is not None and entry[0] > time.monotonic():
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], None, False
+
+        if key in self.inFlight:
+            self.coalesced += 1
+            return None, self.inFlight[key], False
+
+        self.misses += 1
+        self.inFlight[key] = InFlight()
+
+        return None, self.inFlight[key], True
+
+    def finish(self, key, waiting, value=None, ok=False, ttl=None, error=None, cancelled=False):
+        '''
+        Stores the response of the leader, removes the request from the in-flight requests and wakes up its waiters.
+        '''
+
+        with self.lock:
+            if ok:
+                self.entries[key] = (time.monotonic() + ttl, value)
+                self.entries.move_to_end(key)
+
+                while len(self.entries) > self.maxSize:
+                    self.entries.popitem(last=False)
+
+            self.inFlight.pop(key, None)
+
+        waiting.value = value
+        waiting.error = error
+        waiting.cancelled = cancelled
+
+        if waiting.future is not None and not waiting.future.done():
+            waiting.future.set_result(None)
+
+        waiting.event.set()
+
+    def result(self, waiting):
+        if waiting.error is not None:
+            raise waiting.error
+
+        return waiting.value
+
+    def get(self, urlMethod, fetch):
+        '''
+        Returns the cached response of urlMethod or calls fetch() once for all concurrent callers.
+        fetch must return (response body, status code); only status 200 is cached.
+        '''
+
+        ttl = self.ttl(urlMethod)
+
+        if ttl is None:
+            return fetch()[0]
+
+        while True:
+            with self.lock:
+                value, waiting, leader = self.lookup(urlMethod)
+
+            if waiting is None:
+                return value
+
+            if leader:
+                break
+
+            waiting.event.wait()
+
+            if not waiting.cancelled:
+                return self.result(waiting)
+
+        try:
+            value, status = fetch()
+        except Exception as e:
+            self.finish(urlMethod, waiting, error=e)
+            raise
+        except BaseException:
+            self.finish(urlMethod, waiting, cancelled=True)
+            raise
+
+        self.finish(urlMethod, waiting, value, status == 200, ttl)
+
+        return value
+
+    async def getAsync(self, urlMethod, fetch):
+        '''
+        get() for the asyncio clients, fetch is a coroutine function.
+        '''
+
+        ttl = self.ttl(urlMethod)
+
+        if ttl is None:
+            return (await fetch())[0]
+
+        while True:
+            with self.lock:
+                value, waiting, leader = self.lookup(urlMethod)
+
+                if waiting is not None and leader:
+                    waiting.future = asyncio.get_running_loop().create_future()
+
+            if waiting is None:
+                return value
+
+            if leader:
+                break
+
+            if waiting.future is None:
+                # the request is being sent by a blocking client
+                await asyncio.get_running_loop().run_in_executor(None, waiting.event.wait)
+            else:
+                await asyncio.shield(waiting.future)
+
+            if not waiting.cancelled:
+                return self.result(waiting)
+
+        try:
+            value, status = await fetch()
+        except Exception as e:
+            self.finish(urlMethod, waiting, error=e)
+            raise
+        except BaseException:
+            # e.g. asyncio.CancelledError of a wait_for timeout, the waiters must not wait forever
+            self.finish(urlMethod, waiting, cancelled=True)
+            raise
+
+        self.finish(urlMethod, waiting, value, status == 200, ttl)
+
+        return value
+
+    def stats(self):
+        with self.lock:
+            requests = self.hits + self.misses + self.coalesced
+
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'hitRate': (self.hits + self.coalesced) / requests if requests else 0.0,
+                'size': len(self.entries)
+            }
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
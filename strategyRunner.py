@@ -0,0 +1,250 @@
+import time
+try:
+    from .response import loadResult
+    from .orderBatch import OrderBatch, orderIntent
+except ImportError:
+    from response import loadResult
+    from orderBatch import OrderBatch, orderIntent
+
+class ThresholdStrategy:
+    '''
+    Buys when the price falls below lowerLimit and sells when it rises above upperLimit,
+    the strategy of Arbitrage/doge.py. The whole free balance is used, minus keep units of the asset.
+    '''
+
+    def __init__(self, symbol, baseAsset, quoteAsset, lowerLimit, upperLimit, minQuote=10, minBase=100, keep=5):
+        '''
+        Parameters
+        ---------------
+        (m)symbol(str): 'DOGETRY'\n
+        (m)baseAsset(str): 'DOGE'\n
+        (m)quoteAsset(str): 'TRY'\n
+        (m)lowerLimit(float): Buy below this price\n
+        (m)upperLimit(float): Sell above this price\n
+        minQuote(float): Minimum free quote balance to buy\n
+        minBase(float): Minimum free base balance to sell\n
+        keep(float): Units left on the account on every order
+        '''
+
+        self.symbol = symbol
+        self.baseAsset = baseAsset
+        self.quoteAsset = quoteAsset
+        self.lowerLimit = lowerLimit
+        self.upperLimit = upperLimit
+        self.minQuote = minQuote
+        self.minBase = minBase
+        self.keep = keep
+
+    def decide(self, price, balances):
+        '''
+        Returns the newOrder arguments of the orders to send, an empty list to hold.
+        '''
+
+        quote = balances.get(self.quoteAsset, 0.0)
+        base = balances.get(self.baseAsset, 0.0)
+
+        if price < self.lowerLimit and quote > self.minQuote:
+            return [{'side': 'BUY', 'quantity': quote / self.lowerLimit - self.keep, 'price': price}]
+        if price > self.upperLimit and base > self.minBase:
+            return [{'side': 'SELL', 'quantity': base - self.keep, 'price': price}]
+
+        return []
+
+class GridStrategy:
+    '''
+    Buys quantity every time the price crosses a grid level downwards and sells it every time the price crosses a level upwards.
+    '''
+
+    def __init__(self, symbol, baseAsset, quoteAsset, levels, quantity):
+        '''
+        Parameters
+        ---------------
+        (m)symbol(str): 'DOGETRY'\n
+        (m)baseAsset(str): 'DOGE'\n
+        (m)quoteAsset(str): 'TRY'\n
+        (m)levels(list): Grid prices, e.g. [0.39, 0.395, 0.4]\n
+        (m)quantity(float): Base quantity of every order
+        '''
+
+        self.symbol = symbol
+        self.baseAsset = baseAsset
+        self.quoteAsset = quoteAsset
+        self.levels = sorted(levels)
+        self.quantity = quantity
+        self.lastPrice = None
+
+    def decide(self, price, balances):
+        lastPrice, self.lastPrice = self.lastPrice, price
+
+        if lastPrice is None:
+            return []
+
+        if price < lastPrice:
+            crossed = sum(1 for level in self.levels if price <= level < lastPrice)
+
+            if crossed and balances.get(self.quoteAsset, 0.0) >= crossed * self.quantity * price:
+                return [{'side': 'BUY', 'quantity': crossed * self.quantity, 'price': price}]
+        elif price > lastPrice:
+            crossed = sum(1 for level in self.levels if lastPrice < level <= price)
+
+            if crossed and balances.get(self.baseAsset, 0.0) >= crossed * self.quantity:
+                return [{'side': 'SELL', 'quantity': crossed * self.quantity, 'price': price}]
+
+        return []
+
+class StrategyRunner:
+    '''
+    Runs many strategies over many Binance symbols in one process.
+
+    Every tick the prices of all symbols are fetched with one request and every strategy decides on the same prices.
+    The strategies decide in order on the balances left by the orders of the previous ones, so two strategies
+    spending the same asset do not both commit the whole free balance.
+    Free balances are kept in a dict and are only requested again after an order was sent (or markFilled() was called),
+    instead of on every tick. Orders of a tick are sent concurrently. Resting orders of a symbol are cancelled
+    only when the runner sent them and the strategy no longer wants to trade.
+
+    A strategy is any object with symbol, baseAsset and quoteAsset attributes and a decide(price, balances) function
+    returning a list of {'side', 'quantity', 'price'} dicts.
+    '''
+
+    def __init__(self, binance, strategies, interval=20, timeInForce='GTC', account=None):
+        '''
+        Parameters
+        ---------------
+        (m)binance(Binance): Client of the orders. Create it with filters=ExchangeInfo() to round the orders to the symbol filters\n
+        (m)strategies(list): ThresholdStrategy, GridStrategy or similar objects\n
+        interval(float): Seconds between two ticks\n
+        timeInForce(enum): timeInForce of the LIMIT orders\n
+        account(UserDataStream): If sent, balances are read from the user data stream and never requested
+        '''
+
+        self.binance = binance
+        self.strategies = strategies
+        self.interval = interval
+        self.timeInForce = timeInForce
+        self.account = account
+        self.symbols = sorted(set(strategy.symbol for strategy in strategies))
+        self.batch = OrderBatch(binance)
+        self.balances = None
+        self.openSymbols = set()
+
+        self.ticks = 0
+        self.orders = 0
+        self.balanceRefreshes = 0
+        self.totalLatency = 0.0
+        self.maxLatency = 0.0
+        self.lastError = None
+
+    def prices(self):
+        '''
+        Current price of every symbol, with one request.
+        '''
+
+        if len(self.symbols) == 1:
+            result = [loadResult(self.binance.symbolPriceTicker(self.symbols[0]))]
+        else:
+            result = loadResult(self.binance.symbolPriceTicker())
+
+        return {ticker['symbol']: float(ticker['price']) for ticker in result}
+
+    def refreshBalances(self):
+        balances = loadResult(self.binance.accountInfo())['balances']
+
+        self.balances = {balance['asset']: float(balance['free']) for balance in balances}
+        self.balanceRefreshes += 1
+
+    def markFilled(self):
+        '''
+        Requests the balances again on the next tick, e.g. when a fill is reported by a user data stream.
+        '''
+
+        self.balances = None
+
+    def reserve(self, balances, strategy, order):
+        '''
+        Subtracts the funds an order commits from balances: the quote amount of a BUY, the base quantity of a SELL.
+        '''
+
+        if order['side'] == 'BUY':
+            balances[strategy.quoteAsset] = balances.get(strategy.quoteAsset, 0.0) - float(order['quantity']) * float(order['price'])
+        else:
+            balances[strategy.baseAsset] = balances.get(strategy.baseAsset, 0.0) - float(order['quantity'])
+
+    def tick(self):
+        '''
+        Runs every strategy once. Returns the OrderBatch results of the orders and cancellations sent.
+        '''
+
+        prices = self.prices()
+
+        if self.account is not None:
+            self.balances = self.account.balances()
+        elif self.balances is None:
+            self.refreshBalances()
+
+        start = time.perf_counter()
+        intents = []
+        trading = set()
+        # the strategies decide one after the other, so funds committed by one are not offered to the next
+        available = dict(self.balances)
+
+        for strategy in self.strategies:
+            price = prices.get(strategy.symbol)
+
+            if price is None:
+                continue
+
+            for order in strategy.decide(price, available):
+                intents.append(orderIntent('binance', 'newOrder', symbol=strategy.symbol, oType='LIMIT', timeInForce=self.timeInForce, **order))
+                trading.add(strategy.symbol)
+                self.reserve(available, strategy, order)
+
+        cancels = [orderIntent('binance', 'cancelAllOrdersOfSymbol', symbol=symbol) for symbol in self.openSymbols - trading]
+
+        latency = (time.perf_counter() - start) * 1e6
+        self.ticks += 1
+        self.totalLatency += latency
+        self.maxLatency = max(self.maxLatency, latency)
+
+        results = self.batch.execute(cancels + intents) if cancels or intents else []
+
+        self.openSymbols = (self.openSymbols - set(intent['params']['symbol'] for intent in cancels)) | trading
+
+        if intents:
+            self.orders += len(intents)
+            self.balances = None
+
+        return results
+
+    def run(self, iterations=None):
+        '''
+        Ticks every interval seconds, forever or iterations times. Errors of a tick are kept in lastError and the next tick runs.
+        '''
+
+        count = 0
+
+        while iterations is None or count < iterations:
+            try:
+                self.tick()
+            except Exception as e:
+                self.lastError = e
+
+            count += 1
+            time.sleep(self.interval)
+
+    def stats(self):
+        '''
+        Decision latencies are in microseconds, from the prices to the list of orders.
+        '''
+
+        return {
+            'ticks': self.ticks,
+            'orders': self.orders,
+            'balanceRefreshes': self.balanceRefreshes,
+            'meanLatency': self.totalLatency / self.ticks if self.ticks else 0.0,
+            'maxLatency': self.maxLatency,
+            'lastError': repr(self.lastError) if self.lastError is not None else None
+        }
+
+    def close(self):
+        self.batch.close()
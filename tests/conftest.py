@@ -0,0 +1,20 @@
+import os, sys, base64
+import pytest
+
+# the modules are imported from the repository directory, as the README shows
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.dirname(os.path.abspath(__file__))]
+
+from mockExchange import MockExchange
+
+BINANCE_SECRET = 'binance-secret'
+BTCTURK_SECRET = base64.b64encode(b'btcturk-secret').decode('ascii')
+
+@pytest.fixture(scope = 'module')
+def exchange(request):
+    '''
+    MockExchange checking the signatures of BINANCE_SECRET and BTCTURK_SECRET, delayed by the LATENCY seconds of the test module.
+    '''
+
+    with MockExchange(BINANCE_SECRET, BTCTURK_SECRET, latency = getattr(request.module, 'LATENCY', 0)) as exchange:
+        yield exchange
@@ -0,0 +1,351 @@
+import json, time, hmac, hashlib, base64, struct, socket, threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+def tickerSymbols(count):
+    return ['S{:04d}TRY'.format(i) for i in range(count)]
+
+def bookTicker(symbol):
+    return {'symbol': symbol, 'bidPrice': '1.00000000', 'bidQty': '2.00000000', 'askPrice': '1.10000000', 'askQty': '3.00000000'}
+
+def ticker24(symbol):
+    return {
+        'symbol': symbol, 'priceChange': '-94.99999800', 'priceChangePercent': '-95.960', 'weightedAvgPrice': '0.29628482',
+        'prevClosePrice': '0.10002000', 'lastPrice': '4.00000200', 'lastQty': '200.00000000', 'bidPrice': '4.00000000',
+        'bidQty': '100.00000000', 'askPrice': '4.00000200', 'askQty': '100.00000000', 'openPrice': '99.00000000',
+        'highPrice': '100.00000000', 'lowPrice': '0.10000000', 'volume': '8913.30000000', 'quoteVolume': '15.30000000',
+        'openTime': 1499783499040, 'closeTime': 1499869899040, 'firstId': 28385, 'lastId': 28460, 'count': 76
+    }
+
+def kline(openTime, intervalMs=60000):
+    return [openTime, '0.01634790', '0.80000000', '0.01575800', '0.01577100', '148976.11427815', openTime + intervalMs - 1,
+            '2434.19055334', 308, '1756.87402397', '28.46694368', '0']
+
+def btcturkTicker(pair):
+    numerator, denominator = pair.split('_')
+
+    return {'pair': numerator + denominator, 'pairNormalized': pair, 'timestamp': int(time.time()*1000), 'last': 5.5, 'high': 6.0,
+            'low': 5.0, 'bid': 5.4, 'ask': 5.6, 'open': 5.2, 'volume': 1000.0, 'average': 5.5, 'daily': 0.3, 'dailyPercent': 5.77,
+            'denominatorSymbol': denominator, 'numeratorSymbol': numerator, 'order': 1000}
+
+class Server(ThreadingHTTPServer):
+    # the tests open dozens of connections at once, the default backlog of 5 resets some of them
+    request_queue_size = 128
+    daemon_threads = True
+
+class MockExchange:
+    '''
+    Local HTTP stand-in of the Binance and BtcTurk REST APIs, for the tests and the benchmarks.
+    It answers the endpoints used by them with payloads in the format of the exchanges and checks the signatures
+    of the private requests, so a response can be matched with the request it was sent for.
+
+    with MockExchange(binanceSecret = 's') as exchange:\n
+        binance = Binance('k', 's')\n
+        binance.urlBase = exchange.url
+    '''
+
+    def __init__(self, binanceSecret=None, btcturkSecret=None, latency=0, symbols=50):
+        '''
+        Parameters
+        ---------------
+        binanceSecret(str): API secret the Binance signatures are checked with\n
+        btcturkSecret(str): Base64 API secret the BtcTurk signatures are checked with\n
+        latency(float): Seconds every request is delayed before it is answered\n
+        symbols(int): Number of symbols in the answers of the requests for every symbol
+        '''
+
+        self.binanceSecret = binanceSecret
+        self.btcturkSecret = btcturkSecret
+        self.latency = latency
+        self.symbols = tickerSymbols(symbols)
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.server = None
+        self.url = None
+
+    def start(self):
+        exchange = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # headers and body are separate writes, with Nagle every keep-alive answer would wait for a delayed ACK
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def answer(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length).decode('utf-8') if length else ''
+                status, payload = exchange.route(self.command, self.path, self.headers, body)
+                content = json.dumps(payload).encode('utf-8')
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_PUT = do_DELETE = answer
+
+        self.server = Server(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:{}'.format(self.server.server_address[1])
+
+        threading.Thread(target = self.server.serve_forever, daemon = True).start()
+
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def binanceSignatureValid(self, payload):
+        data, _, signature = payload.rpartition('&signature=')
+
+        if self.binanceSecret is None or not data:
+            return False
+
+        return hmac.compare_digest(hmac.new(self.binanceSecret.encode('utf-8'), data.encode('utf-8'), hashlib.sha256).hexdigest(), signature)
+
+    def btcturkSignatureValid(self, headers):
+        if self.btcturkSecret is None or 'X-Signature' not in headers:
+            return False
+
+        message = (headers['X-PCK'] + headers['X-Stamp']).encode('utf-8')
+        signature = base64.b64encode(hmac.new(base64.b64decode(self.btcturkSecret), message, hashlib.sha256).digest()).decode('ascii')
+
+        return hmac.compare_digest(signature, headers['X-Signature'])
+
+    def route(self, method, path, headers, body):
+        '''
+        Returns (status code, payload) of a request.
+        '''
+
+        with self.lock:
+            self.requests += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        url = urlparse(path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        signed = url.query if 'signature=' in url.query else body
+
+        if url.path.startswith('/api/v3/'):
+            # signed requests of the client send their parameters in the body
+            if body and not body.startswith('{'):
+                query.update({key: values[0] for key, values in parse_qs(body).items()})
+
+            return self.binance(method, url.path, query, signed)
+
+        params = json.loads(body) if body.startswith('{') else {}
+
+        return self.btcturk(method, url.path, query, params, headers)
+
+    def binance(self, method, path, query, signed):
+        symbol = query.get('symbol')
+
+        if path == '/api/v3/time':
+            return 200, {'serverTime': int(time.time()*1000)}
+        if path == '/api/v3/ticker/bookTicker':
+            return 200, bookTicker(symbol) if symbol else [bookTicker(s) for s in self.symbols]
+        if path == '/api/v3/ticker/24hr':
+            return 200, ticker24(symbol) if symbol else [ticker24(s) for s in self.symbols]
+        if path == '/api/v3/klines':
+            start = int(query.get('startTime') or 0)
+
+            return 200, [kline(start + i * 60000) for i in range(int(query.get('limit', 500)))]
+        if path == '/api/v3/depth':
+            return 200, {'lastUpdateId': 100, 'bids': [['10.00000000', '1.00000000']], 'asks': [['11.00000000', '1.00000000']]}
+        if path == '/api/v3/trades':
+            return 200, [{'id': 28457, 'price': '4.00000100', 'qty': '12.00000000', 'quoteQty': '48.000012', 'time': 1499865549590, 'isBuyerMaker': True, 'isBestMatch': True}]
+
+        if path in ('/api/v3/order', '/api/v3/openOrders', '/api/v3/account'):
+            if not self.binanceSignatureValid(signed):
+                return 400, {'code': -1022, 'msg': 'Signature for this request is not valid.'}
+
+            # the order is echoed back, so the caller can check it got the answer of its own request
+            return 200, dict(query, orderId = int(query.get('orderId', 1)), status = 'CANCELED' if method == 'DELETE' else 'NEW', method = method)
+
+        return 400, {'code': -1100, 'msg': 'Unknown endpoint {} {}'.format(method, path)}
+
+    def btcturk(self, method, path, query, params, headers):
+        if path == '/api/v2/server/time':
+            return 200, {'serverTime': int(time.time()*1000), 'serverTime2': time.strftime('%Y-%m-%dT%H:%M:%S+00:00', time.gmtime())}
+        if path == '/api/v2/server/exchangeinfo':
+            return 200, {'data': {'timeZone': 'UTC', 'serverTime': int(time.time()*1000), 'symbols': [], 'currencies': []}, 'success': True, 'message': None, 'code': 0}
+        if path == '/api/v2/ticker':
+            pairs = [query['pairSymbol']] if 'pairSymbol' in query else [s[:-3] + '_TRY' for s in self.symbols]
+
+            return 200, {'data': [btcturkTicker(pair) for pair in pairs], 'success': True, 'message': None, 'code': 0}
+
+        if path in ('/api/v1/order', '/api/v1/openOrders', '/api/v1/users/balances'):
+            if not self.btcturkSignatureValid(headers):
+                return 401, {'success': False, 'message': 'Unauthorized', 'code': 401}
+
+            return 200, {'data': dict(query, **params, method = method), 'success': True, 'message': None, 'code': 0}
+
+        return 404, {'success': False, 'message': 'Unknown endpoint {} {}'.format(method, path), 'code': 404}
+
+WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+def textFrame(text):
+    data = text.encode('utf-8')
+
+    if len(data) < 126:
+        header = struct.pack('!BB', 0x81, len(data))
+    elif len(data) < 65536:
+        header = struct.pack('!BBH', 0x81, 126, len(data))
+    else:
+        header = struct.pack('!BBQ', 0x81, 127, len(data))
+
+    return header + data
+
+def readExactly(connection, size):
+    data = b''
+
+    while len(data) < size:
+        chunk = connection.recv(size - len(data))
+
+        if not chunk:
+            raise ConnectionError('connection closed')
+
+        data += chunk
+
+    return data
+
+class StreamServer:
+    '''
+    Local WebSocket stand-in of the Binance stream API. Records the path of every connection and the text messages
+    the clients send, and pushes messages to every connected client.
+
+    with StreamServer() as server:\n
+        stream = BinanceStream([bookTickerStream('BTCTRY')], url = server.url)\n
+        server.send('btctry@bookTicker', {...})
+    '''
+
+    def __init__(self):
+        self.paths = []
+        self.received = []
+        self.clients = []
+        self.lock = threading.Lock()
+        self.socket = None
+        self.url = None
+
+    def start(self):
+        self.socket = socket.socket()
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind(('127.0.0.1', 0))
+        self.socket.listen(16)
+        self.url = 'ws://127.0.0.1:{}'.format(self.socket.getsockname()[1])
+
+        threading.Thread(target = self.accept, daemon = True).start()
+
+        return self
+
+    def stop(self):
+        self.drop()
+        self.socket.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def accept(self):
+        while True:
+            try:
+                connection, address = self.socket.accept()
+            except OSError:
+                return
+
+            threading.Thread(target = self.serve, args = (connection,), daemon = True).start()
+
+    def serve(self, connection):
+        try:
+            request = b''
+
+            while b'\r\n\r\n' not in request:
+                chunk = connection.recv(4096)
+
+                if not chunk:
+                    return
+
+                request += chunk
+
+            lines = request.decode('utf-8').split('\r\n')
+            key = [line.split(':', 1)[1].strip() for line in lines if line.lower().startswith('sec-websocket-key:')][0]
+            accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode('ascii')).digest()).decode('ascii')
+
+            connection.sendall(('HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n'
+                                'Sec-WebSocket-Accept: {}\r\n\r\n'.format(accept)).encode('ascii'))
+
+            with self.lock:
+                self.paths.append(lines[0].split()[1])
+                self.clients.append(connection)
+
+            while True:
+                first, second = readExactly(connection, 2)
+                size = second & 0x7f
+
+                if size == 126:
+                    size = struct.unpack('!H', readExactly(connection, 2))[0]
+                elif size == 127:
+                    size = struct.unpack('!Q', readExactly(connection, 8))[0]
+
+                # frames of the clients are always masked
+                mask = readExactly(connection, 4)
+                data = bytes(byte ^ mask[i % 4] for i, byte in enumerate(readExactly(connection, size)))
+
+                if first & 0x0f == 0x8:
+                    return
+                if first & 0x0f == 0x1:
+                    with self.lock:
+                        self.received.append(json.loads(data))
+        except (OSError, ConnectionError, IndexError):
+            pass
+        finally:
+            with self.lock:
+                if connection in self.clients:
+                    self.clients.remove(connection)
+
+            connection.close()
+
+    def send(self, stream, data):
+        '''
+        Pushes a combined stream message to every connected client.
+        '''
+
+        frame = textFrame(json.dumps({'stream': stream, 'data': data}))
+
+        with self.lock:
+            clients = list(self.clients)
+
+        for connection in clients:
+            try:
+                connection.sendall(frame)
+            except OSError:
+                pass
+
+    def drop(self):
+        '''
+        Closes every connection without a close frame, like a network failure.
+        '''
+
+        with self.lock:
+            clients, self.clients = self.clients, []
+
+        for connection in clients:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+            connection.close()
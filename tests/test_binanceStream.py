@@ -0,0 +1,113 @@
+import time
+import pytest
+
+pytest.importorskip('websocket')
+
+from binance import Binance
+from binanceStream import BinanceStream, bookTickerStream, depthStream, tradeStream, klineStream
+from localOrderBook import LocalOrderBook
+from mockExchange import MockExchange, StreamServer
+
+def waitFor(condition, timeout=5):
+    end = time.monotonic() + timeout
+
+    while time.monotonic() < end:
+        if condition():
+            return True
+
+        time.sleep(0.01)
+
+    return False
+
+@pytest.fixture
+def server():
+    with StreamServer() as server:
+        yield server
+
+@pytest.fixture(scope = 'module')
+def binance():
+    with MockExchange() as exchange:
+        client = Binance('key', 'secret', resultType = 'dict')
+        client.urlBase = exchange.url
+
+        yield client
+
+        client.close()
+
+@pytest.fixture
+def stream(server, binance):
+    stream = BinanceStream([bookTickerStream('BTCTRY'), depthStream('BTCTRY'), tradeStream('ETHTRY')], binance = binance, url = server.url, staleAfter = 0.5, reconnectDelay = 0.05)
+    stream.start()
+
+    assert waitFor(lambda: server.clients)
+
+    yield stream
+
+    stream.stop()
+
+def test_streams_are_combined_on_one_connection(server, stream):
+    assert server.paths == ['/stream?streams=btctry@bookTicker/btctry@depth@100ms/ethtry@trade']
+
+def test_lookups_use_the_latest_stream_message(server, stream):
+    server.send('btctry@bookTicker', {'u': 1, 's': 'BTCTRY', 'b': '1.5', 'B': '2', 'a': '1.6', 'A': '3'})
+    server.send('ethtry@trade', {'e': 'trade', 's': 'ETHTRY', 't': 7, 'p': '2.0', 'q': '3.0', 'T': 1499865549590, 'm': True, 'M': True})
+
+    assert waitFor(lambda: stream.fresh(tradeStream('ETHTRY')) is not None)
+    assert stream.bookTicker('BTCTRY') == {'symbol': 'BTCTRY', 'bidPrice': '1.5', 'bidQty': '2', 'askPrice': '1.6', 'askQty': '3'}
+    assert stream.lastTrade('ETHTRY')['id'] == 7
+    assert stream.fallbacks == 0
+
+def test_depth_diffs_are_applied_on_the_rest_snapshot(server, stream):
+    # the snapshot of the stand-in has lastUpdateId 100, bids [10, 1] and asks [11, 1]
+    server.send('btctry@depth@100ms', {'e': 'depthUpdate', 's': 'BTCTRY', 'U': 99, 'u': 101, 'b': [['10', '5'], ['9', '1']], 'a': []})
+    assert waitFor(lambda: stream.fresh(depthStream('BTCTRY')) is not None)
+
+    book = stream.orderBook('BTCTRY')
+    assert book['lastUpdateId'] == 101
+    assert book['bids'] == [[10.0, 5.0], [9.0, 1.0]] and book['asks'] == [[11.0, 1.0]]
+
+    server.send('btctry@depth@100ms', {'e': 'depthUpdate', 's': 'BTCTRY', 'U': 102, 'u': 102, 'b': [['9', '0']], 'a': [['11.5', '2']]})
+    assert waitFor(lambda: stream.orderBook('BTCTRY')['lastUpdateId'] == 102)
+
+    book = stream.orderBook('BTCTRY')
+    assert book['bids'] == [[10.0, 5.0]] and book['asks'] == [[11.0, 1.0], [11.5, 2.0]]
+
+def test_stale_streams_fall_back_to_rest(server, stream):
+    server.send('btctry@bookTicker', {'u': 1, 's': 'BTCTRY', 'b': '1.5', 'B': '2', 'a': '1.6', 'A': '3'})
+    assert waitFor(lambda: stream.fresh(bookTickerStream('BTCTRY')) is not None)
+
+    time.sleep(0.6)
+
+    # the answer of the REST stand-in
+    assert stream.bookTicker('BTCTRY')['bidPrice'] == '1.00000000'
+    assert stream.fallbacks == 1
+
+def test_dropped_connections_are_reopened(server, stream):
+    server.drop()
+
+    assert waitFor(lambda: stream.reconnects >= 1 and server.clients)
+    assert server.paths[-1] == server.paths[0]
+
+    server.send('btctry@bookTicker', {'u': 2, 's': 'BTCTRY', 'b': '1.7', 'B': '2', 'a': '1.8', 'A': '3'})
+    assert waitFor(lambda: stream.fresh(bookTickerStream('BTCTRY')) is not None)
+    assert stream.bookTicker('BTCTRY')['bidPrice'] == '1.7'
+
+def test_subscribe_adds_streams_to_the_open_connection(server, stream):
+    stream.subscribe([klineStream('BTCTRY', '1m')])
+
+    assert waitFor(lambda: server.received)
+    assert server.received[0]['method'] == 'SUBSCRIBE' and server.received[0]['params'] == ['btctry@kline_1m']
+    assert len(server.paths) == 1
+
+def test_diffs_of_unread_books_are_capped(server, stream):
+    stream.books['BTCTRY'] = LocalOrderBook('BTCTRY', maxBuffer = 10)
+
+    for i in range(200, 250):
+        server.send('btctry@depth@100ms', {'e': 'depthUpdate', 's': 'BTCTRY', 'U': i, 'u': i, 'b': [['10', str(i)]], 'a': []})
+
+    assert waitFor(lambda: stream.fresh(depthStream('BTCTRY')) is not None and stream.books['BTCTRY'].buffer[-1]['u'] == 249)
+    assert len(stream.books['BTCTRY'].buffer) == 10
+
+    # the snapshot of the stand-in (lastUpdateId 100) is older than the kept diffs, the book needs a new one
+    assert stream.orderBook('BTCTRY')['lastUpdateId'] == 100
+    assert stream.books['BTCTRY'].lastUpdateId is None
@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+from binance import Binance
+from btcTurk import BtcTurk
+from rateLimiter import binanceRateLimiter, btcturkRateLimiter
+from conftest import BINANCE_SECRET, BTCTURK_SECRET
+
+CALLS = 600
+LATENCY = 0.001
+
+def clients(exchange, limited):
+    binance = Binance('binance-key', BINANCE_SECRET, poolSize = 32, resultType = 'dict', rateLimiter = binanceRateLimiter(weightPerMinute = 10**6, ordersPer10s = 10**6) if limited else None)
+    btcturk = BtcTurk('btcturk-key', BTCTURK_SECRET, poolSize = 32, resultType = 'dict', rateLimiter = btcturkRateLimiter({'public': (10**6, 1), 'private': (10**6, 1), 'orders': (10**6, 1)}) if limited else None)
+    binance.urlBase = btcturk.urlBase = exchange.url
+
+    return binance, btcturk
+
+def call(binance, btcturk, i):
+    '''
+    Sends request i and returns (what was asked, what was answered).
+    '''
+
+    kind = i % 4
+
+    if kind == 0:
+        result = binance.symbolOrderBookTicker('S{:04d}TRY'.format(i))
+        return 'S{:04d}TRY'.format(i), result['symbol']
+    if kind == 1:
+        result = binance.queryOrder('S{:04d}TRY'.format(i), orderId = i)
+        return ('S{:04d}TRY'.format(i), i), (result.get('symbol'), result.get('orderId'))
+    if kind == 2:
+        result = binance.newOrder('S{:04d}TRY'.format(i), 'BUY', 'LIMIT', 'GTC', quantity = 1, price = i)
+        return ('S{:04d}TRY'.format(i), str(i)), (result.get('symbol'), result.get('price'))
+
+    result = btcturk.submitOrder(1, i, 'limit', 'buy', 'S{:04d}_TRY'.format(i), newOrderClientId = str(i))
+    return ('S{:04d}_TRY'.format(i), str(i)), (result['data'].get('pairSymbol'), result['data'].get('newOrderClientId')) if result.get('success') else result
+
+@pytest.mark.parametrize('limited', [False, True], ids = ['unlimited', 'rateLimiter'])
+def test_shared_clients_answer_every_request_with_its_own_response(exchange, limited):
+    binance, btcturk = clients(exchange, limited)
+
+    with ThreadPoolExecutor(max_workers = 32) as executor:
+        pairs = list(executor.map(lambda i: call(binance, btcturk, i), range(CALLS)))
+
+    binance.close()
+    btcturk.close()
+
+    # a signature or url built by another thread shows up as a rejected or mismatched answer
+    mismatches = [(asked, answered) for asked, answered in pairs if asked != answered]
+
+    assert mismatches == []
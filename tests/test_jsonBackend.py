@@ -0,0 +1,27 @@
+import json
+import pytest
+
+from jsonBackend import select
+from mockExchange import btcturkTicker, ticker24
+
+BTCTURK = {'data': [btcturkTicker('S{:04d}_TRY'.format(i)) for i in range(10)], 'success': True, 'message': None, 'code': 0}
+BINANCE = [ticker24('S{:04d}TRY'.format(i)) for i in range(10)]
+
+def resultTypes(payload):
+    return [json.dumps(payload, separators = (',', ':')).encode('utf-8'), json.dumps(payload, indent = 2), payload]
+
+@pytest.mark.parametrize('result', resultTypes(BTCTURK), ids = ['raw', 'str', 'dict'])
+def test_btcturk_pairs_are_matched_in_both_forms(result):
+    items = select(result, ['S0005TRY', 'S0003_TRY'], ['pairNormalized', 'bid'])
+
+    assert items == [{'pairNormalized': 'S0003_TRY', 'bid': 5.4}, {'pairNormalized': 'S0005_TRY', 'bid': 5.4}]
+
+@pytest.mark.parametrize('result', resultTypes(BINANCE), ids = ['raw', 'str', 'dict'])
+def test_binance_symbols_are_selected_in_payload_order(result):
+    assert select(result, ['S0007TRY', 'S0002TRY'], ['symbol']) == [{'symbol': 'S0002TRY'}, {'symbol': 'S0007TRY'}]
+    assert len(select(result)) == 10
+
+@pytest.mark.parametrize('result', resultTypes(BTCTURK) + resultTypes(BINANCE))
+def test_missing_symbols_are_reported(result):
+    with pytest.raises(KeyError, match = 'NOPE_TRY'):
+        select(result, ['S0003_TRY', 'S0003TRY', 'NOPE_TRY'])
@@ -0,0 +1,87 @@
+import time
+import pytest
+
+from binance import Binance
+from btcTurk import BtcTurk
+from rateLimiter import RateLimiter, TokenBucket, binanceCost
+from orderBatch import OrderBatch, orderIntent
+from conftest import BINANCE_SECRET, BTCTURK_SECRET
+
+LATENCY = 0.05
+
+def client(cls, exchange, secret, **kwargs):
+    instance = cls('key', secret, poolSize = 40, **kwargs)
+    instance.urlBase = exchange.url
+
+    return instance
+
+def ladder(levels):
+    cancels = [orderIntent('binance', 'cancelOrder', symbol = 'BTCTRY', orderId = i) for i in range(1, levels + 1)]
+    orders = [orderIntent('binance', 'newOrder', symbol = 'BTCTRY', side = 'BUY', oType = 'LIMIT', timeInForce = 'GTC', quantity = 1, price = 100 + i) for i in range(levels)]
+    orders += [orderIntent('btcturk', 'submitOrder', quantity = 1, price = 100 + i, orderMethod = 'limit', orderType = 'buy', pairSymbol = 'BTC_TRY') for i in range(levels)]
+
+    return cancels, orders
+
+def test_requote_sends_the_ladder_concurrently(exchange):
+    cancels, orders = ladder(20)
+
+    with OrderBatch(client(Binance, exchange, BINANCE_SECRET), client(BtcTurk, exchange, BTCTURK_SECRET), maxWorkers = 40) as batch:
+        start = time.perf_counter()
+        cancelResults, orderResults = batch.requote(cancels, orders)
+        elapsed = time.perf_counter() - start
+
+    # 60 round trips one after the other would take 60 * LATENCY
+    assert elapsed < 20 * LATENCY
+
+    assert [result['error'] for result in cancelResults + orderResults] == [None] * 60
+    assert [result['result']['orderId'] for result in cancelResults] == list(range(1, 21))
+    assert [result['result']['status'] for result in cancelResults] == ['CANCELED'] * 20
+    assert [result['result']['price'] for result in orderResults[:20]] == [str(100 + i) for i in range(20)]
+    assert [result['result']['data']['price'] for result in orderResults[20:]] == [100 + i for i in range(20)]
+    assert all(result['latency'] >= LATENCY * 1000 and result['sent'] > 0 for result in cancelResults + orderResults)
+
+def test_failed_intents_do_not_stop_the_others(exchange):
+    binance = client(Binance, exchange, 'wrong-secret')
+    closed = client(BtcTurk, exchange, BTCTURK_SECRET, retries = 0)
+    closed.urlBase = 'http://127.0.0.1:1'
+    cancels, orders = ladder(3)
+
+    with OrderBatch(binance, closed) as batch:
+        results = batch.execute(orders)
+
+    assert [result['error'] for result in results[:3]] == ['-1022: Signature for this request is not valid.'] * 3
+    assert all(result['result'] is None and 'ConnectionError' in result['error'] for result in results[3:])
+
+def test_orders_are_paced_within_the_order_budget(exchange):
+    # 5 orders at once, then 10 orders per second
+    limiter = RateLimiter({'weight': TokenBucket(10**6, 60), 'orders': TokenBucket(5, 0.5)}, binanceCost)
+    cancels, orders = ladder(15)
+
+    with OrderBatch(client(Binance, exchange, BINANCE_SECRET, rateLimiter = limiter)) as batch:
+        start = time.perf_counter()
+        results = batch.execute(orders[:15])
+        elapsed = time.perf_counter() - start
+
+    assert [result['error'] for result in results] == [None] * 15
+    assert elapsed >= 0.9
+    assert limiter.throttled > 0
+
+def test_btcturk_orders_are_cancelled_by_integer_id(exchange):
+    with OrderBatch(btcturk = client(BtcTurk, exchange, BTCTURK_SECRET)) as batch:
+        result, = batch.execute([orderIntent('btcturk', 'cancelOrder', orderID = 123)])
+
+    assert result['error'] is None
+    assert result['result']['data']['id'] == '123' and result['result']['data']['method'] == 'DELETE'
+
+def test_intents_need_a_client_of_their_exchange(exchange):
+    cancels, orders = ladder(1)
+
+    with OrderBatch(client(Binance, exchange, BINANCE_SECRET)) as batch:
+        with pytest.raises(ValueError):
+            batch.execute(orders)
+
+def test_order_intents_are_validated():
+    with pytest.raises(ValueError):
+        orderIntent('kraken', 'newOrder')
+    with pytest.raises(ValueError):
+        orderIntent('binance', 'submitOrder')
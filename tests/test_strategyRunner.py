@@ -0,0 +1,38 @@
+from strategyRunner import StrategyRunner, ThresholdStrategy
+
+class Exchange:
+    '''
+    Binance stand-in answering with fixed prices and balances and recording the orders.
+    '''
+
+    def __init__(self, prices, balances):
+        self.tickers = [{'symbol': symbol, 'price': str(price)} for symbol, price in prices.items()]
+        self.account = {'balances': [{'asset': asset, 'free': str(free), 'locked': '0'} for asset, free in balances.items()]}
+        self.orders = []
+
+    def symbolPriceTicker(self, symbol=''):
+        return [ticker for ticker in self.tickers if ticker['symbol'] == symbol][0] if symbol else self.tickers
+
+    def accountInfo(self):
+        return self.account
+
+    def newOrder(self, **order):
+        self.orders.append(order)
+        return {'symbol': order['symbol'], 'orderId': len(self.orders), 'status': 'NEW'}
+
+def test_strategies_spending_the_same_asset_share_the_balance():
+    exchange = Exchange({'DOGETRY': 0.3, 'XRPTRY': 5.0}, {'TRY': 1000, 'DOGE': 0, 'XRP': 0})
+    strategies = [ThresholdStrategy('DOGETRY', 'DOGE', 'TRY', 0.4, 0.5, keep = 0), ThresholdStrategy('XRPTRY', 'XRP', 'TRY', 6.0, 7.0, keep = 0)]
+    runner = StrategyRunner(exchange, strategies)
+
+    results = runner.tick()
+    runner.batch.close()
+
+    assert [result['error'] for result in results] == [None, None]
+    assert [order['symbol'] for order in exchange.orders] == ['DOGETRY', 'XRPTRY']
+
+    # DOGETRY commits 2500 * 0.3 = 750 TRY, XRPTRY only gets the 250 TRY left instead of the whole 1000
+    spent = [order['quantity'] * order['price'] for order in exchange.orders]
+    assert abs(spent[0] - 750) < 1e-6
+    assert abs(spent[1] - 250 / 6.0 * 5.0) < 1e-6
+    assert sum(spent) <= 1000
@@ -0,0 +1,199 @@
+import os, json, time, struct, csv
+try:
+    from .timeUtils import unixToDate
+except ImportError:
+    from timeUtils import unixToDate
+
+SCHEMA_FILE = 'schema.json'
+SEGMENT_FORMAT = 'segment-{:06d}.bin'
+XLS_MAX_ROWS = 65536
+
+class TickRecorder:
+    '''
+    Append-only binary tick log. Every tick is a fixed size record (int64 time in ms + float64 values)
+    appended to the current segment file, so writing a tick costs the same however long the history is.
+    Segments are rotated at segmentSize bytes, flushed every flushEvery ticks and fsynced every fsyncInterval seconds.
+    The history can be exported to csv or xls on demand.
+
+    Directory layout
+    ---------------
+    schema.json: Field names of the records\n
+    segment-000001.bin, segment-000002.bin, ...: Records in insertion order
+    '''
+
+    def __init__(self, directory, fields, segmentSize=64*1024*1024, flushEvery=100, fsyncInterval=5.0):
+        '''
+        Parameters
+        ---------------
+        (m)directory(str): Directory of the log. Created if it does not exist, appended to if it does\n
+        (m)fields(list): Field names, the first one is the time in ms, e.g. ['time', 'btcTurk_bid', 'btcTurk_ask']\n
+        segmentSize(int): Segment file size in bytes before a new segment is started\n
+        flushEvery(int): Number of ticks buffered before they are written to the file\n
+        fsyncInterval(float): Maximum seconds between two fsync calls
+        '''
+
+        self.directory = directory
+        self.fields = list(fields)
+        self.struct = struct.Struct('<q' + 'd' * (len(self.fields) - 1))
+        self.segmentSize = segmentSize - segmentSize % self.struct.size
+        self.flushEvery = flushEvery
+        self.fsyncInterval = fsyncInterval
+        self.buffer = []
+        self.lastSync = time.monotonic()
+
+        os.makedirs(directory, exist_ok=True)
+        schemaPath = os.path.join(directory, SCHEMA_FILE)
+
+        if os.path.exists(schemaPath):
+            with open(schemaPath) as f:
+                schema = json.load(f)
+
+            if schema['fields'] != self.fields:
+                raise ValueError('{} was recorded with fields {}'.format(directory, schema['fields']))
+        else:
+            with open(schemaPath, 'w') as f:
+                json.dump({'fields': self.fields}, f)
+
+        # continue the newest segment, older ones may have been pruned so the count is not its number
+        segments = self.segments()
+        self.segmentNumber = int(segments[-1][len('segment-'):-len('.bin')]) if segments else 1
+        self.file = open(self.segmentPath(self.segmentNumber), 'ab')
+
+        # drop a partially written record left by a crash
+        size = self.file.tell()
+        if size % self.struct.size:
+            self.file.truncate(size - size % self.struct.size)
+
+        self.segmentBytes = self.file.tell()
+
+    def record(self, values):
+        '''
+        Appends one tick. values must be in the order of fields, the first value is the time in ms.
+        '''
+
+        self.buffer.append(self.struct.pack(int(values[0]), *map(float, values[1:])))
+
+        if len(self.buffer) >= self.flushEvery:
+            self.flush()
+
+    def flush(self, fsync=False):
+        for record in self.buffer:
+            if self.segmentBytes >= self.segmentSize:
+                self.rotate()
+
+            self.file.write(record)
+            self.segmentBytes += len(record)
+
+        self.buffer = []
+        self.file.flush()
+
+        if fsync or time.monotonic() - self.lastSync >= self.fsyncInterval:
+            os.fsync(self.file.fileno())
+            self.lastSync = time.monotonic()
+
+    def rotate(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+
+        self.segmentNumber += 1
+        self.file = open(self.segmentPath(self.segmentNumber), 'ab')
+        self.segmentBytes = 0
+
+    def close(self):
+        self.flush(fsync=True)
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def segmentPath(self, number):
+        return os.path.join(self.directory, SEGMENT_FORMAT.format(number))
+
+    def segments(self):
+        return sorted(name for name in os.listdir(self.directory) if name.startswith('segment-') and name.endswith('.bin'))
+
+    def read(self):
+        '''
+        Yields every recorded tick as a tuple in the order of fields.
+        Buffered ticks are flushed first, so the result includes everything recorded so far.
+        '''
+
+        self.flush()
+
+        for name in self.segments():
+            with open(os.path.join(self.directory, name), 'rb') as f:
+                data = f.read()
+
+            yield from self.struct.iter_unpack(data[:len(data) - len(data) % self.struct.size])
+
+    def toColumns(self):
+        '''
+        Returns the whole history as NumPy arrays keyed by field name.
+        '''
+
+        import numpy as np
+
+        self.flush()
+
+        dtype = np.dtype([(self.fields[0], '<i8')] + [(field, '<f8') for field in self.fields[1:]])
+        records = [np.fromfile(os.path.join(self.directory, name), dtype=dtype) for name in self.segments()]
+        records = np.concatenate(records) if records else np.empty(0, dtype=dtype)
+
+        return {field: records[field] for field in self.fields}
+
+    def toCsv(self, path, formatTime=True):
+        '''
+        Exports the history to a csv file. If formatTime is True the time is written as a local date string.
+        '''
+
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.fields)
+
+            for tick in self.read():
+                if formatTime:
+                    tick = (unixToDate(tick[0]),) + tick[1:]
+
+                writer.writerow(tick)
+
+    def toXls(self, path, sheetName='ticks', formatTime=True):
+        '''
+        Exports the history to an xls file. A new sheet is started every 65535 ticks because of the xls row limit.
+        '''
+
+        import xlwt
+
+        wb = xlwt.Workbook()
+        sheet = None
+        sheets = 0
+        row = XLS_MAX_ROWS
+
+        for tick in self.read():
+            if row == XLS_MAX_ROWS:
+                sheets += 1
+                sheet = wb.add_sheet('{}_{}'.format(sheetName, sheets))
+
+                for i, field in enumerate(self.fields):
+                    sheet.write(0, i, field)
+
+                row = 1
+
+            if formatTime:
+                tick = (unixToDate(tick[0]),) + tick[1:]
+
+            for i, value in enumerate(tick):
+                sheet.write(row, i, value)
+
+            row += 1
+
+        if sheet is None:
+            sheet = wb.add_sheet('{}_1'.format(sheetName))
+
+            for i, field in enumerate(self.fields):
+                sheet.write(0, i, field)
+
+        wb.save(path)
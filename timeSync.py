@@ -0,0 +1,136 @@
+import time, threading, asyncio
+from collections import deque
+
+class TimeSync:
+    '''
+    Estimates the offset between the local clock and the server clock of an exchange.
+    Every sample asks the server time and takes the middle of the request as the local time of the answer,
+    so the error of a sample is at most half of its round trip. The clients time only the HTTP exchange of a sample,
+    the rate limiter queue and the decoding of the answer are not part of the round trip. The offset of the sample with the
+    smallest round trip among the last samples is used.
+
+    Use syncClock() to attach it to a client:\n
+    syncClock(binance)\n
+    binance.createSignature() then signs with binance.timestamp() = local time + offset in ms
+    '''
+
+    def __init__(self, fetch, samples=8):
+        '''
+        Parameters
+        ---------------
+        (m)fetch(function): Returns (local time before the request, server time, local time after the answer) in ms, e.g. binance.timeSample. Sent through the client so it runs on the pooled connections\n
+        samples(int): Number of recent samples the offset is chosen from
+        '''
+
+        self.fetch = fetch
+        self.samples = deque(maxlen=samples)
+        self.offset = 0.0
+        self.rtt = None
+        self.synced = None
+        self.lock = threading.Lock()
+        self.stopEvent = threading.Event()
+        self.thread = None
+        self.task = None
+
+    def timestamp(self):
+        '''
+        Corrected current time in ms.
+        '''
+
+        return int(time.time() * 1000 + self.offset)
+
+    def addSample(self, start, serverTime, end):
+        rtt = end - start
+        offset = serverTime - (start + end) / 2
+
+        with self.lock:
+            self.samples.append((rtt, offset))
+            self.rtt, self.offset = min(self.samples)
+            self.synced = time.monotonic()
+
+    def sync(self, count=3):
+        '''
+        Takes count samples and updates the offset. Returns the offset in ms.
+        '''
+
+        for _ in range(count):
+            self.addSample(*self.fetch())
+
+        return self.offset
+
+    async def syncAsync(self, count=3):
+        '''
+        sync() for the asyncio clients, fetch is a coroutine function.
+        '''
+
+        for _ in range(count):
+            self.addSample(*await self.fetch())
+
+        return self.offset
+
+    def start(self, interval = 60):
+        '''
+        Syncs now and then in a background thread every interval seconds.
+        '''
+
+        def run():
+            while not self.stopEvent.wait(interval):
+                try:
+                    self.sync()
+                except Exception:
+                    # keep the previous offset, try again at the next interval
+                    pass
+
+        self.sync()
+        self.stopEvent.clear()
+        self.thread = threading.Thread(target = run, daemon = True)
+        self.thread.start()
+
+    async def startAsync(self, interval = 60):
+        '''
+        start() for the asyncio clients. The periodic sync runs as a task of the running loop.
+        '''
+
+        async def run():
+            while True:
+                await asyncio.sleep(interval)
+
+                try:
+                    await self.syncAsync()
+                except Exception:
+                    pass
+
+        await self.syncAsync()
+        self.task = asyncio.get_running_loop().create_task(run())
+
+    def stop(self):
+        self.stopEvent.set()
+
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+def syncClock(client, interval=60, samples=8):
+    '''
+    Creates a TimeSync for a blocking client (Binance or BtcTurk), syncs it, keeps it synced
+    every interval seconds and attaches it to the client. Returns the TimeSync.
+    '''
+
+    client.timeSync = TimeSync(client.timeSample, samples)
+    client.timeSync.start(interval)
+
+    return client.timeSync
+
+async def syncClockAsync(client, interval=60, samples=8):
+    '''
+    syncClock() for AsyncBinance and AsyncBtcTurk.
+    '''
+
+    client.timeSync = TimeSync(client.timeSample, samples)
+    await client.timeSync.startAsync(interval)
+
+    return client.timeSync
@@ -0,0 +1,91 @@
+import time
+import numpy as np
+
+# epochs at or above this value are in milliseconds (1e11 s is in year 5138, 1e11 ms is in 1973)
+MS_THRESHOLD = 10 ** 11
+
+def epochUnit(values):
+    '''
+    Guesses the unit of unix epochs: 'ms' or 's'
+    '''
+
+    values = np.asarray(values)
+
+    if values.size and np.nanmax(np.abs(values.astype(np.float64))) >= MS_THRESHOLD:
+        return 'ms'
+
+    return 's'
+
+# local UTC offsets change on 15 minute boundaries of UTC time (DST switches happen on the hour or half hour)
+OFFSET_BUCKET = 900000
+
+def localOffsets(values):
+    '''
+    Difference between local time and UTC in ms at every epoch (ms), including the DST switches of the local time zone.
+    The offset is looked up once per 15 minutes of the range, not once per row.
+    '''
+
+    buckets, index = np.unique(values // OFFSET_BUCKET, return_inverse=True)
+    offsets = np.array([time.localtime(bucket * (OFFSET_BUCKET // 1000)).tm_gmtoff * 1000 for bucket in buckets.tolist()], dtype=np.int64)
+
+    return offsets[index.reshape(-1)]
+
+def toDatetime64(values, unit=None, localTime=True):
+    '''
+    Converts a column of unix epochs to a datetime64[ms] array in one vectorized operation.
+
+    Parameters
+    ---------------
+    (m)values(array/list/Series): Epochs as numbers or numeric strings\n
+    unit(str): 'ms' or 's'. Guessed from the values if not sent\n
+    localTime(bool): Convert the result to local time (the UTC offset of every row, DST included) instead of UTC
+    '''
+
+    values = np.asarray(values)
+
+    if values.dtype.kind not in 'iu':
+        values = values.astype(np.float64).astype(np.int64)
+
+    if unit is None:
+        unit = epochUnit(values)
+
+    if unit == 's':
+        values = values * 1000
+
+    if localTime and values.size:
+        values = values + localOffsets(values)
+
+    return values.astype('datetime64[ms]')
+
+def formatDates(values, fmt='%d-%m-%Y %H:%M:%S'):
+    '''
+    Formats a datetime64 array as strings. Only needed when the output must be text, e.g. while exporting.
+    '''
+
+    try:
+        import pandas as pd
+    except ImportError:
+        return np.datetime_as_string(values, unit='s')
+
+    return pd.DatetimeIndex(values).strftime(fmt).to_numpy()
+
+def unixToDate(unixDate):
+    '''
+    Converts a single unix epoch (ms or s) to a local time string: 'day-month-year hour:minute:second'
+    '''
+
+    unixDate = int(float(unixDate))
+
+    if unixDate >= MS_THRESHOLD:
+        unixDate = unixDate / 1000
+
+    t = time.localtime(unixDate)
+
+    return '{}-{}-{} {}:{}:{}'.format(t.tm_mday, t.tm_mon, t.tm_year, t.tm_hour, t.tm_min, t.tm_sec)
+
+def dateToUnix(date, fmt='%d-%m-%Y %H:%M:%S'):
+    '''
+    Converts a local time string written by unixToDate back to a unix epoch in ms
+    '''
+
+    return int(time.mktime(time.strptime(date, fmt)) * 1000)
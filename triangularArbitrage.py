@@ -0,0 +1,175 @@
+import time
+import numpy as np
+try:
+    from .response import loadResult
+except ImportError:
+    from response import loadResult
+
+class TriangularArbitrage:
+    '''
+    Triangular arbitrage detector over every Binance symbol, e.g. TRY -> USDT -> DOGE -> TRY.
+
+    The asset graph (assets are nodes, symbols are edges) is built once and every triangle is stored as
+    three edge indices in NumPy arrays. On each refresh of the book tickers the return of every cycle
+    is computed in one vectorized operation:\n
+    return = rate1 * rate2 * rate3 * (1 - fee)^3 - 1\n
+    where the rate of a step is the bid when the base asset of the symbol is sold and 1/ask when it is bought.
+
+    Cycles
+    ---------------
+    {\n
+        "assets": ["TRY", "USDT", "DOGE", "TRY"],
+        "symbols": ["USDTTRY", "DOGEUSDT", "DOGETRY"],
+        "sides": ["BUY", "BUY", "SELL"],
+        "prices": [27.1, 0.0712, 1.94],     // Ask for BUY, bid for SELL
+        "profit": 0.0012                    // Fee-adjusted return of the cycle
+    }
+    '''
+
+    def __init__(self, symbols, fee=0.001, startAssets=None):
+        '''
+        Parameters
+        ---------------
+        (m)symbols(list): (symbol, baseAsset, quoteAsset) of every tradable symbol, e.g. [('DOGETRY', 'DOGE', 'TRY'), ...]\n
+        fee(float): Taker fee rate of every step\n
+        startAssets(list): Only cycles through these assets are kept and they start from the first one found, e.g. ['TRY', 'USDT']
+        '''
+
+        self.fee = fee
+        self.symbols = [symbol for symbol, base, quote in symbols]
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.size = len(self.symbols)
+
+        # edge a -> b: (symbol index, True if a is the base asset, i.e. the step sells on the symbol)
+        edges = {}
+
+        for i, (symbol, base, quote) in enumerate(symbols):
+            edges.setdefault(base, {})[quote] = (i, True)
+            edges.setdefault(quote, {})[base] = (i, False)
+
+        cycles = []
+        startAssets = list(startAssets) if startAssets else None
+
+        for a in edges:
+            for b in edges[a]:
+                if b <= a:
+                    continue
+
+                for c in edges[b]:
+                    if c <= b or a not in edges[c]:
+                        continue
+
+                    for cycle in ((a, b, c), (a, c, b)):
+                        if startAssets is not None:
+                            start = next((asset for asset in startAssets if asset in cycle), None)
+
+                            if start is None:
+                                continue
+
+                            shift = cycle.index(start)
+                            cycle = cycle[shift:] + cycle[:shift]
+
+                        cycles.append(cycle)
+
+        self.cycles = cycles
+
+        # rates are kept in one array: [0, size) sell rates (bid), [size, 2*size) buy rates (1/ask)
+        steps = np.empty((len(cycles), 3), dtype=np.int64)
+
+        for row, cycle in enumerate(cycles):
+            for step in range(3):
+                i, sell = edges[cycle[step]][cycle[(step + 1) % 3]]
+                steps[row, step] = i if sell else i + self.size
+
+        self.steps = steps
+        self.rates = np.zeros(2 * self.size)
+        self.bid = np.zeros(self.size)
+        self.ask = np.zeros(self.size)
+        self.lastLatency = None
+
+    @classmethod
+    def fromExchangeInfo(cls, exchangeInfo, fee=0.001, startAssets=None):
+        '''
+        Creates the detector from the trading symbols of an ExchangeInfo index or an exchangeInfo response.
+        '''
+
+        if hasattr(exchangeInfo, 'index'):
+            if not exchangeInfo.index:
+                exchangeInfo.refresh()
+
+            symbols = [(f.symbol, f.baseAsset, f.quoteAsset) for f in exchangeInfo.index.values() if f.status == 'TRADING']
+        else:
+            exchangeInfo = loadResult(exchangeInfo)
+            symbols = [(s['symbol'], s['baseAsset'], s['quoteAsset']) for s in exchangeInfo['symbols'] if s.get('status', 'TRADING') == 'TRADING']
+
+        return cls(symbols, fee, startAssets)
+
+    def update(self, tickers):
+        '''
+        Loads the result of Binance.symbolOrderBookTicker() without a symbol. Unknown symbols are ignored,
+        symbols missing from the tickers keep their previous prices.
+        '''
+
+        tickers = loadResult(tickers)
+        index = self.index
+        rows = [(index[t['symbol']], t['bidPrice'], t['askPrice']) for t in tickers if t['symbol'] in index]
+
+        if rows:
+            rows = np.array(rows, dtype=object)
+            positions = rows[:, 0].astype(np.int64)
+            self.bid[positions] = rows[:, 1].astype(np.float64)
+            self.ask[positions] = rows[:, 2].astype(np.float64)
+
+        self.updateArrays(self.bid, self.ask)
+
+    def updateArrays(self, bid, ask):
+        '''
+        Sets the prices from arrays in the order of the symbols. A price of 0 disables the symbol.
+        '''
+
+        self.bid = np.asarray(bid, dtype=np.float64)
+        self.ask = np.asarray(ask, dtype=np.float64)
+        self.rates[:self.size] = self.bid
+
+        with np.errstate(divide='ignore'):
+            self.rates[self.size:] = np.where(self.ask > 0, 1 / self.ask, 0.0)
+
+    def returns(self):
+        '''
+        Fee-adjusted return of every cycle, in the order of self.cycles.
+        '''
+
+        return self.rates[self.steps].prod(axis=1) * (1 - self.fee) ** 3 - 1
+
+    def detect(self, minProfit=0.0, limit=None):
+        '''
+        Returns the cycles with a return above minProfit, best first. At most limit cycles are returned.
+        The time the evaluation took is kept in lastLatency (ms).
+        '''
+
+        start = time.perf_counter()
+
+        profits = self.returns()
+        found = np.flatnonzero(profits > minProfit)
+        found = found[np.argsort(-profits[found])]
+
+        if limit is not None:
+            found = found[:limit]
+
+        self.lastLatency = (time.perf_counter() - start) * 1000
+
+        return [self.cycle(i, profits[i]) for i in found]
+
+    def cycle(self, row, profit):
+        assets = list(self.cycles[row])
+        symbols, sides, prices = [], [], []
+
+        for step in self.steps[row]:
+            sell = step < self.size
+            i = step if sell else step - self.size
+
+            symbols.append(self.symbols[i])
+            sides.append('SELL' if sell else 'BUY')
+            prices.append(float(self.bid[i] if sell else self.ask[i]))
+
+        return {'assets': assets + assets[:1], 'symbols': symbols, 'sides': sides, 'prices': prices, 'profit': float(profit)}
@@ -0,0 +1,292 @@
+import threading
+from collections import OrderedDict
+try:
+    from . import jsonBackend
+    from .response import loadResult
+    from .binanceStream import STREAM_URL, websocket
+except ImportError:
+    import jsonBackend
+    from response import loadResult
+    from binanceStream import STREAM_URL, websocket
+
+CLOSED_STATUSES = ('FILLED', 'CANCELED', 'REJECTED', 'EXPIRED', 'EXPIRED_IN_MATCH')
+
+class UserDataStream:
+    '''
+    Local order and balance state of a Binance account kept up to date by the user data stream,
+    so balance and order lookups are memory reads instead of signed, rate limited requests.
+
+    On every (re)connection the state is reconciled once with REST (accountInfo and openOrders), then
+    executionReport, outboundAccountPosition and balanceUpdate events are applied as they arrive.
+    The listenKey is kept alive in the background and a new one is created when it expires.
+
+    Orders are kept in the format of Binance.queryOrder. Open orders and the last maxClosed closed orders are kept.
+
+    account = UserDataStream(binance, onFill = lambda order: runner.markFilled())\n
+    account.start()\n
+    account.balance('TRY'), account.openOrders('DOGETRY')
+    '''
+
+    def __init__(self, binance, url=STREAM_URL, keepAliveInterval=1800, onEvent=None, onFill=None, maxClosed=1000, reconnectDelay=1, maxReconnectDelay=30):
+        '''
+        Parameters
+        ---------------
+        (m)binance(Binance): Client of the account, used for the listenKey and the reconciliation\n
+        url(str): Base URL of the stream API\n
+        keepAliveInterval(float): Seconds between two listenKey keepalive requests\n
+        onEvent(function): Called with every event after it is applied, from the stream thread\n
+        onFill(function): Called with the order after every fill (executionReport with execution type TRADE)\n
+        maxClosed(int): Number of closed orders kept for lookups\n
+        reconnectDelay(float): First delay before reconnecting in seconds, doubled after every failed attempt\n
+        maxReconnectDelay(float): Maximum delay before reconnecting in seconds
+        '''
+
+        if websocket is None:
+            raise ImportError('websocket-client is required for UserDataStream')
+
+        self.binance = binance
+        self.url = url
+        self.keepAliveInterval = keepAliveInterval
+        self.onEvent = onEvent
+        self.onFill = onFill
+        self.maxClosed = maxClosed
+        self.reconnectDelay = reconnectDelay
+        self.maxReconnectDelay = maxReconnectDelay
+
+        self.balancesByAsset = {}
+        self.balanceTime = 0
+        self.open = {}
+        self.closed = OrderedDict()
+        self.lock = threading.RLock()
+        self.listenKey = None
+        self.connection = None
+        self.connected = threading.Event()
+        self.stopEvent = threading.Event()
+        self.threads = []
+        self.reconnects = 0
+        self.reconciliations = 0
+        self.lastError = None
+
+    def start(self, wait=10):
+        '''
+        Connects in a background thread and waits up to wait seconds for the first reconciliation.
+        '''
+
+        self.stopEvent.clear()
+        self.threads = [threading.Thread(target = self.run, daemon = True), threading.Thread(target = self.keepAlive, daemon = True)]
+
+        for thread in self.threads:
+            thread.start()
+
+        return self.connected.wait(wait)
+
+    def stop(self):
+        self.stopEvent.set()
+        connection = self.connection
+
+        if connection is not None:
+            try:
+                # shuts the socket down so the blocked recv() of the stream thread returns at once
+                connection.abort()
+            except Exception:
+                pass
+
+        for thread in self.threads:
+            thread.join()
+
+        self.threads = []
+
+        if self.listenKey is not None:
+            try:
+                self.binance.closeListenKey(self.listenKey)
+            except Exception:
+                pass
+
+            self.listenKey = None
+
+    def run(self):
+        delay = self.reconnectDelay
+
+        while not self.stopEvent.is_set():
+            try:
+                if self.listenKey is None:
+                    self.listenKey = loadResult(self.binance.createListenKey())['listenKey']
+
+                self.connection = websocket.create_connection('{}/ws/{}'.format(self.url, self.listenKey), timeout = self.keepAliveInterval)
+
+                # the stream is open before the reconciliation, so no event is lost in between
+                self.reconcile()
+                self.connected.set()
+                delay = self.reconnectDelay
+
+                while not self.stopEvent.is_set():
+                    try:
+                        message = self.connection.recv()
+                    except websocket.WebSocketTimeoutException:
+                        # an idle account sends no events, the connection is still open
+                        continue
+
+                    if not message:
+                        break
+
+                    if not self.handle(jsonBackend.loads(message)):
+                        break
+            except Exception as e:
+                self.lastError = e
+            finally:
+                self.connected.clear()
+
+                if self.connection is not None:
+                    try:
+                        self.connection.close()
+                    except Exception:
+                        pass
+
+                    self.connection = None
+
+            if self.stopEvent.wait(delay):
+                break
+
+            self.reconnects += 1
+            delay = min(delay * 2, self.maxReconnectDelay)
+
+    def keepAlive(self):
+        while not self.stopEvent.wait(self.keepAliveInterval):
+            if self.listenKey is None:
+                continue
+
+            try:
+                self.binance.keepAliveListenKey(self.listenKey)
+            except Exception as e:
+                self.lastError = e
+
+    def reconcile(self):
+        '''
+        Replaces the balances and open orders with the REST state of the account.
+        '''
+
+        account = loadResult(self.binance.accountInfo())
+        openOrders = loadResult(self.binance.openOrders())
+
+        with self.lock:
+            self.balancesByAsset = {b['asset']: {'free': float(b['free']), 'locked': float(b['locked'])} for b in account['balances']}
+            self.balanceTime = account.get('updateTime', 0)
+
+            for orderId in list(self.open):
+                if not any(order['orderId'] == orderId for order in openOrders):
+                    # closed while the stream was down, the final state is requested on lookup
+                    self.open.pop(orderId)
+
+            for order in openOrders:
+                self.open[order['orderId']] = order
+
+            self.reconciliations += 1
+
+    def handle(self, event):
+        '''
+        Applies one event. Returns False if the stream must be reconnected.
+        '''
+
+        eventType = event.get('e')
+
+        if eventType == 'executionReport':
+            self.applyExecution(event)
+        elif eventType == 'outboundAccountPosition':
+            with self.lock:
+                # positions older than the reconciled balances are ignored
+                if event['u'] >= self.balanceTime:
+                    for b in event['B']:
+                        self.balancesByAsset[b['a']] = {'free': float(b['f']), 'locked': float(b['l'])}
+
+                    self.balanceTime = event['u']
+        elif eventType == 'balanceUpdate':
+            with self.lock:
+                if event['T'] >= self.balanceTime:
+                    balance = self.balancesByAsset.setdefault(event['a'], {'free': 0.0, 'locked': 0.0})
+                    balance['free'] += float(event['d'])
+        elif eventType == 'listenKeyExpired':
+            self.listenKey = None
+            return False
+
+        if self.onEvent is not None:
+            self.onEvent(event)
+
+        return True
+
+    def applyExecution(self, event):
+        with self.lock:
+            orderId = event['i']
+            order = self.open.get(orderId) or self.closed.get(orderId)
+
+            # events older than the stored state (e.g. from before a reconciliation) are ignored
+            if order is not None and order.get('updateTime', 0) > event['T']:
+                return
+
+            order = {
+                'symbol': event['s'],
+                'orderId': orderId,
+                'clientOrderId': event['C'] if event['X'] == 'CANCELED' and event.get('C') else event['c'],
+                'price': event['p'],
+                'origQty': event['q'],
+                'executedQty': event['z'],
+                'cummulativeQuoteQty': event['Z'],
+                'status': event['X'],
+                'timeInForce': event['f'],
+                'type': event['o'],
+                'side': event['S'],
+                'stopPrice': event['P'],
+                'icebergQty': event['F'],
+                'time': event['O'],
+                'updateTime': event['T'],
+                'isWorking': event['w']
+            }
+
+            if order['status'] in CLOSED_STATUSES:
+                self.open.pop(orderId, None)
+                self.closed[orderId] = order
+                self.closed.move_to_end(orderId)
+
+                while len(self.closed) > self.maxClosed:
+                    self.closed.popitem(last=False)
+            else:
+                self.open[orderId] = order
+
+        if event['x'] == 'TRADE' and self.onFill is not None:
+            self.onFill(order)
+
+    def balance(self, asset):
+        '''
+        {'free': float, 'locked': float} of asset, zero if the account never had it.
+        '''
+
+        with self.lock:
+            return dict(self.balancesByAsset.get(asset, {'free': 0.0, 'locked': 0.0}))
+
+    def balances(self):
+        '''
+        Free balance of every asset.
+        '''
+
+        with self.lock:
+            return {asset: balance['free'] for asset, balance in self.balancesByAsset.items()}
+
+    def openOrders(self, symbol=None):
+        '''
+        Open orders in the format of Binance.openOrders, of one symbol or of every symbol.
+        '''
+
+        with self.lock:
+            return [dict(order) for order in self.open.values() if symbol is None or order['symbol'] == symbol]
+
+    def order(self, orderId, symbol=None):
+        '''
+        Order in the format of Binance.queryOrder. Orders which are not in the local state are requested with REST if symbol is sent.
+        '''
+
+        with self.lock:
+            order = self.open.get(orderId) or self.closed.get(orderId)
+
+        if order is None and symbol is not None:
+            return loadResult(self.binance.queryOrder(symbol, orderId=orderId))
+
+        return dict(order) if order is not None else None